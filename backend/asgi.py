@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_asgi_application()
+
+# Resolve attachable-model ContentTypes once per process instead of per request.
+from media.registry import attachable_models  # noqa: E402
+
+attachable_models.warm()
@@ -0,0 +1,76 @@
+# backend/bootstrap.py
+"""
+Everything the app needs on startup, in one response.
+
+The client used to open with /api/me/ and then fetch workspaces, units,
+apartments, conversations and unread state one after another. Each of
+those calls paid again for authentication and permission queries.
+``bootstrap_data`` builds the same information from a fixed number of
+queries, however many workspaces, apartments or conversations the user
+has:
+- the user, with the memberships prefetched;
+- the workspaces, with role and counts annotated;
+- the apartments;
+- the recent conversations, with unread counts annotated;
+- the total unread count.
+
+``backend.views.bootstrap`` serves the result and caches it per user for
+BOOTSTRAP_CACHE_SECONDS.
+"""
+
+from django.db.models import Count, Q, prefetch_related_objects
+
+from chat.models import ChatMessage, Conversation
+from chat.serializers import ConversationSerializer
+from users.serializers import UserSerializer
+from users.views import memberships_prefetch
+from workspaces.models import UserApartment
+from workspaces.serializers import UserApartmentSerializer, WorkspaceSerializer
+from workspaces.views import workspaces_for_user
+
+CONVERSATION_LIMIT = 50
+
+
+def bootstrap_data(user, conversation_limit=CONVERSATION_LIMIT):
+    # No request in the context, so ?fields / ?omit do not cut into the
+    # sections of this aggregate.
+    context = {}
+    prefetch_related_objects([user], "profile_image", memberships_prefetch())
+
+    apartments = UserApartment.objects.filter(user=user).select_related(
+        "user", "unit__workspace"
+    )
+    conversations = (
+        Conversation.objects.filter(Q(user1=user) | Q(user2=user))
+        .select_related("user1", "user2")
+        .annotate(
+            unread_count=Count(
+                "messages",
+                filter=Q(messages__is_read=False) & ~Q(messages__sender=user),
+            )
+        )
+        .order_by("-last_message_at", "-pk")[:conversation_limit]
+    )
+    # Conversations past the limit still count towards the total.
+    unread_messages = (
+        ChatMessage.objects.filter(
+            Q(conversation__user1=user) | Q(conversation__user2=user),
+            is_read=False,
+        )
+        .exclude(sender=user)
+        .count()
+    )
+
+    return {
+        "user": UserSerializer(user, context=context).data,
+        "workspaces": WorkspaceSerializer(
+            workspaces_for_user(user), many=True, context=context
+        ).data,
+        "apartments": UserApartmentSerializer(
+            apartments, many=True, context=context
+        ).data,
+        "conversations": ConversationSerializer(
+            conversations, many=True, context=context
+        ).data,
+        "unread": {"messages": unread_messages},
+    }
@@ -0,0 +1,160 @@
+# backend/fast_read.py
+"""
+values()-based read path for hot list endpoints.
+
+``ValuesReader`` compiles a serializer's readable fields into one
+``queryset.values(...)`` call, following ``source`` through forward foreign
+keys as ``__`` lookups (``workspace.name`` -> ``workspace__name``), and builds
+the response dicts directly. Each value still goes through the field's own
+``to_representation`` and DRF's null/default rules, so the output is
+identical to ``serializer.data`` while skipping model instantiation and
+per-row attribute traversal.
+
+Serializers with fields that cannot be expressed as a column lookup
+(SerializerMethodFields, nested serializers, properties, reverse relations)
+raise ``UnsupportedField``; ``ValuesListMixin`` then falls back to the
+regular serializer.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+from rest_framework.fields import SkipField, empty
+from rest_framework.relations import PKOnlyObject
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from .tracing import span
+
+_SKIP = object()
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+class _FieldPlan:
+    __slots__ = ("name", "field", "lookup", "null_hops", "pk_only")
+
+    def __init__(self, name, field, lookup, null_hops, pk_only):
+        self.name = name
+        self.field = field
+        self.lookup = lookup
+        self.null_hops = null_hops
+        self.pk_only = pk_only
+
+    def missing(self):
+        """What Field.get_attribute does when a hop on the source path is None."""
+        field = self.field
+        if field.default is not empty:
+            try:
+                return field.get_default()
+            except SkipField:
+                return _SKIP
+        if field.allow_null:
+            return None
+        if not field.required:
+            return _SKIP
+        raise AttributeError(f"{self.lookup} is None for field {self.name!r}")
+
+
+class ValuesReader:
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.plans = [self._plan(model, field) for field in serializer._readable_fields]
+        self.lookups = list(
+            dict.fromkeys(
+                lookup
+                for plan in self.plans
+                for lookup in (plan.lookup, *plan.null_hops)
+            )
+        )
+
+    @staticmethod
+    def _plan(model, field):
+        if (
+            isinstance(
+                field,
+                (
+                    serializers.SerializerMethodField,
+                    serializers.BaseSerializer,
+                    serializers.HiddenField,
+                    relations.ManyRelatedField,
+                ),
+            )
+            or field.source == "*"
+        ):
+            raise UnsupportedField(field.field_name)
+
+        pk_only = isinstance(field, relations.RelatedField)
+        if pk_only and not field.use_pk_only_optimization():
+            raise UnsupportedField(field.field_name)
+
+        path, null_hops = [], []
+        attrs = field.source_attrs
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise UnsupportedField(field.field_name)
+            if not model_field.concrete:
+                raise UnsupportedField(field.field_name)
+            path.append(model_field.name)
+            if index == len(attrs) - 1:
+                if model_field.is_relation and not pk_only:
+                    raise UnsupportedField(field.field_name)
+                break
+            if not (model_field.many_to_one or model_field.one_to_one):
+                raise UnsupportedField(field.field_name)
+            if model_field.null:
+                # values() gives None both for a null FK and a null column;
+                # fetch the FK itself to tell them apart.
+                null_hops.append("__".join(path))
+            model = model_field.related_model
+
+        return _FieldPlan(
+            field.field_name, field, "__".join(path), tuple(null_hops), pk_only
+        )
+
+    def _row(self, values):
+        ret = {}
+        for plan in self.plans:
+            if plan.null_hops and any(values[hop] is None for hop in plan.null_hops):
+                value = plan.missing()
+                if value is _SKIP:
+                    continue
+                if value is None:
+                    ret[plan.name] = None
+                    continue
+            else:
+                value = values[plan.lookup]
+                if value is None:
+                    ret[plan.name] = None
+                    continue
+                if plan.pk_only:
+                    value = PKOnlyObject(pk=value)
+            ret[plan.name] = plan.field.to_representation(value)
+        return ret
+
+    def read(self, queryset):
+        return [self._row(values) for values in queryset.values(*self.lookups)]
+
+
+class ValuesListMixin:
+    """
+    Adds ``list_data(queryset)``: ``serializer.data`` for a list response,
+    built through ValuesReader whenever the serializer allows it.
+    """
+
+    def list_data(self, queryset):
+        serializer = self.get_serializer(queryset, many=True)
+        try:
+            reader = ValuesReader(serializer.child)
+        except UnsupportedField:
+            return serializer.data
+        with span(
+            f"serialize {type(serializer.child).__name__}",
+            attributes={"serializer.values_path": True},
+        ) as current:
+            rows = reader.read(queryset)
+            if current is not None:
+                current.set("serializer.items", len(rows))
+        return ReturnList(rows, serializer=serializer)
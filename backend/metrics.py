@@ -0,0 +1,246 @@
+# backend/metrics.py
+"""
+In-process request metrics, exported in the Prometheus text format.
+
+``MetricsMiddleware`` (backend/middleware.py) opens a ``RequestMetrics`` for
+every request. SQL is timed through ``connection.execute_wrapper`` and
+storage calls through ``record_s3()`` in S3Helper, which finds the current
+request's metrics through a context variable. When the response is done,
+the totals are folded into histograms labelled by view, action and method.
+``backend.views.metrics`` serves them.
+
+Each worker process keeps its own registry, so scrape every worker (or use
+one worker per scrape target).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+CALL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+SIZE_BUCKETS = (256, 1024, 10240, 102400, 1048576, 10485760)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = ("sql_count", "sql_time", "s3_count", "s3_time")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.s3_count = 0
+        self.s3_time = 0.0
+
+    def record_sql(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` callback."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_time += time.perf_counter() - start
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """Make a fresh RequestMetrics current for the duration of the block."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def record_s3(calls=1):
+    """Time a storage operation covering ``calls`` S3 calls."""
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.s3_count += calls
+            metrics.s3_time += time.perf_counter() - start
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {labels: list(state) for labels, state in self._values.items()}
+        for labels, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), state):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(
+                        self.labelnames, labels, [("le", _format_number(bound))]
+                    ),
+                    cumulative,
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum", label_text, state[-1]
+            yield f"{self.name}_count", label_text, cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REQUEST_LABELS = ("view", "action", "method")
+
+REGISTRY = Registry()
+REQUESTS = REGISTRY.register(
+    Counter(
+        "http_requests_total",
+        "Requests by view, action, method and status code.",
+        (*REQUEST_LABELS, "status"),
+    )
+)
+REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Wall time spent producing the response.",
+        REQUEST_LABELS,
+        DURATION_BUCKETS,
+    )
+)
+SQL_QUERIES = REGISTRY.register(
+    Histogram(
+        "http_request_sql_queries",
+        "SQL queries executed per request.",
+        REQUEST_LABELS,
+        QUERY_COUNT_BUCKETS,
+    )
+)
+SQL_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_sql_duration_seconds",
+        "Time spent in SQL per request.",
+        REQUEST_LABELS,
+        DURATION_BUCKETS,
+    )
+)
+S3_CALLS = REGISTRY.register(
+    Histogram(
+        "http_request_s3_calls",
+        "S3Helper storage calls per request.",
+        REQUEST_LABELS,
+        CALL_COUNT_BUCKETS,
+    )
+)
+S3_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_s3_duration_seconds",
+        "Time spent in S3Helper storage calls per request.",
+        REQUEST_LABELS,
+        DURATION_BUCKETS,
+    )
+)
+RESPONSE_SIZE = REGISTRY.register(
+    Histogram(
+        "http_response_size_bytes",
+        "Response body size.",
+        REQUEST_LABELS,
+        SIZE_BUCKETS,
+    )
+)
+
+
+def observe_request(labels, status_code, duration, metrics):
+    REQUESTS.inc((*labels, str(status_code)))
+    REQUEST_DURATION.observe(labels, duration)
+    SQL_QUERIES.observe(labels, metrics.sql_count)
+    SQL_DURATION.observe(labels, metrics.sql_time)
+    S3_CALLS.observe(labels, metrics.s3_count)
+    S3_DURATION.observe(labels, metrics.s3_time)
+
+
+def observe_response_size(labels, size):
+    RESPONSE_SIZE.observe(labels, size)
@@ -0,0 +1,371 @@
+# backend/middleware.py
+import time
+from contextlib import ExitStack, asynccontextmanager, nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from .metrics import collect, observe_request, observe_response_size
+from .profiling import ProfiledRequest, should_profile
+from .slow_queries import SlowQueryRecorder, reporter, should_sample
+from .tracing import finish_request, sql_wrapper, start_request, use_span
+
+
+def view_labels(request):
+    """(view, action, method) for the resolved view, e.g. a ViewSet action."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return ("unresolved", "", request.method)
+    func = match.func
+    view = getattr(func, "cls", None) or getattr(func, "view_class", None) or func
+    actions = getattr(func, "actions", None) or {}
+    return (
+        f"{view.__module__}.{view.__qualname__}",
+        actions.get(request.method.lower(), ""),
+        request.method,
+    )
+
+
+@asynccontextmanager
+async def on_request_thread(install):
+    """
+    Run ``install(stack)`` on the thread that runs the request's synchronous
+    code, and close the stack there afterwards. Under ASGI, Django gives each
+    request a thread of its own for sync views and sync_to_async calls, and
+    database connections (with their execute wrappers) are per thread, so
+    wrappers installed on the event loop's connections would see nothing.
+    """
+    stack = ExitStack()
+    await sync_to_async(install)(stack)
+    try:
+        yield
+    finally:
+        await sync_to_async(stack.close)()
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that runs natively in both modes, so an async stack
+    is not forced through sync adapters (and one thread) on its account.
+    Subclasses implement ``call`` and ``acall``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.acall(request)
+        return self.call(request)
+
+
+def _execute_wrappers(stack, metrics):
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(metrics.record_sql))
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Records wall time, SQL and S3Helper activity and response size of every
+    request into backend.metrics. Streaming responses are measured until the
+    last chunk has been sent, including the queries that produce it.
+    """
+
+    def call(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with collect() as metrics, ExitStack() as stack:
+            _execute_wrappers(stack, metrics)
+            response = self.get_response(request)
+        return self._measure(request, response, metrics, start)
+
+    async def acall(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        start = time.perf_counter()
+        with collect() as metrics:
+            async with on_request_thread(
+                lambda stack: _execute_wrappers(stack, metrics)
+            ):
+                response = await self.get_response(request)
+        return self._measure(request, response, metrics, start)
+
+    def _measure(self, request, response, metrics, start):
+        labels = view_labels(request)
+
+        def finish(size):
+            observe_request(
+                labels, response.status_code, time.perf_counter() - start, metrics
+            )
+            observe_response_size(labels, size)
+
+        if response.streaming:
+            measure = (
+                self._ameasure_stream if response.is_async else self._measure_stream
+            )
+            response.streaming_content = measure(
+                response.streaming_content, metrics, finish
+            )
+        else:
+            finish(len(response.content))
+        return response
+
+    @staticmethod
+    def _measure_stream(content, metrics, finish):
+        size = 0
+        try:
+            with ExitStack() as stack:
+                _execute_wrappers(stack, metrics)
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            finish(size)
+
+    @staticmethod
+    async def _ameasure_stream(content, metrics, finish):
+        size = 0
+        try:
+            async with on_request_thread(
+                lambda stack: _execute_wrappers(stack, metrics)
+            ):
+                async for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            finish(size)
+
+
+class SlowQueryMiddleware(AsyncCapableMiddleware):
+    """
+    Logs slow SQL with its query plan for a sample of requests; see
+    backend/slow_queries.py. The EXPLAIN and the log write happen on a
+    background thread, off the request path.
+    """
+
+    def call(self, request):
+        if not should_sample():
+            return self.get_response(request)
+
+        recorder = self._recorder()
+        with ExitStack() as stack:
+            self._install(stack, recorder)
+            response = self.get_response(request)
+        return self._report(request, response, recorder)
+
+    async def acall(self, request):
+        if not should_sample():
+            return await self.get_response(request)
+
+        recorder = self._recorder()
+        async with on_request_thread(lambda stack: self._install(stack, recorder)):
+            response = await self.get_response(request)
+        return self._report(request, response, recorder)
+
+    @staticmethod
+    def _recorder():
+        return SlowQueryRecorder(
+            settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_MAX_PER_REQUEST
+        )
+
+    def _report(self, request, response, recorder):
+        if response.streaming:
+            watch = self._awatch_stream if response.is_async else self._watch_stream
+            response.streaming_content = watch(
+                response.streaming_content, recorder, request
+            )
+        else:
+            reporter().report(recorder, view_labels(request))
+        return response
+
+    @staticmethod
+    def _install(stack, recorder):
+        for connection in connections.all():
+            stack.enter_context(
+                connection.execute_wrapper(recorder.wrapper(connection.alias))
+            )
+
+    def _watch_stream(self, content, recorder, request):
+        try:
+            with ExitStack() as stack:
+                self._install(stack, recorder)
+                yield from content
+        finally:
+            reporter().report(recorder, view_labels(request))
+
+    async def _awatch_stream(self, content, recorder, request):
+        try:
+            async with on_request_thread(lambda stack: self._install(stack, recorder)):
+                async for chunk in content:
+                    yield chunk
+        finally:
+            reporter().report(recorder, view_labels(request))
+
+
+def _start_profile(request):
+    return ProfiledRequest(request) if should_profile(request) else None
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    """
+    Samples the call stacks of staff-requested or randomly sampled requests;
+    see backend/profiling.py. The profile id is returned in X-Profile-Id.
+    """
+
+    def call(self, request):
+        profile = _start_profile(request)
+        if profile is None:
+            return self.get_response(request)
+
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            profile.sampler.stop()
+            raise
+        response["X-Profile-Id"] = profile.id
+
+        if response.streaming:
+            response.streaming_content = self._profile_stream(
+                response.streaming_content, profile, request, response.status_code
+            )
+        else:
+            profile.finish(view_labels(request), response.status_code)
+        return response
+
+    async def acall(self, request):
+        if not settings.PROFILING_ENABLED:
+            return await self.get_response(request)
+        # Started on the request's sync thread, which is the one sampled. The
+        # staff check authenticates, so it has to run there too.
+        profile = await sync_to_async(_start_profile)(request)
+        if profile is None:
+            return await self.get_response(request)
+
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            await sync_to_async(profile.sampler.stop, thread_sensitive=False)()
+            raise
+        response["X-Profile-Id"] = profile.id
+
+        if response.streaming:
+            stream = (
+                self._aprofile_stream if response.is_async else self._profile_stream
+            )
+            response.streaming_content = stream(
+                response.streaming_content, profile, request, response.status_code
+            )
+        else:
+            # Stopping the sampler and saving the profile both block.
+            await sync_to_async(profile.finish, thread_sensitive=False)(
+                view_labels(request), response.status_code
+            )
+        return response
+
+    @staticmethod
+    def _profile_stream(content, profile, request, status_code):
+        try:
+            yield from content
+        finally:
+            profile.finish(view_labels(request), status_code)
+
+    @staticmethod
+    async def _aprofile_stream(content, profile, request, status_code):
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            await sync_to_async(profile.finish, thread_sensitive=False)(
+                view_labels(request), status_code
+            )
+
+
+class TracingMiddleware(AsyncCapableMiddleware):
+    """
+    Opens the server span of a request and SQL child spans under it; see
+    backend/tracing.py. Adds traceparent and X-Trace-Id to every response.
+    """
+
+    def call(self, request):
+        if not settings.TRACING_ENABLED:
+            return self.get_response(request)
+
+        root = start_request(request)
+        with use_span(root), ExitStack() as stack:
+            if root.trace.sampled:
+                self._install(stack)
+            try:
+                response = self.get_response(request)
+            except BaseException as exc:
+                root.error = exc
+                finish_request(root)
+                raise
+        return self._finish(request, response, root)
+
+    async def acall(self, request):
+        if not settings.TRACING_ENABLED:
+            return await self.get_response(request)
+
+        root = start_request(request)
+        installed = (
+            on_request_thread(self._install) if root.trace.sampled else nullcontext()
+        )
+        with use_span(root):
+            async with installed:
+                try:
+                    response = await self.get_response(request)
+                except BaseException as exc:
+                    root.error = exc
+                    finish_request(root)
+                    raise
+        return self._finish(request, response, root)
+
+    def _finish(self, request, response, root):
+        view, action, method = view_labels(request)
+        root.name = f"{method} {view}.{action}" if action else f"{method} {view}"
+        root.set("code.namespace", view)
+        root.set("http.response.status_code", response.status_code)
+        response["traceparent"] = root.traceparent
+        response["X-Trace-Id"] = root.trace.trace_id
+
+        if response.streaming and root.trace.sampled:
+            trace = self._atrace_stream if response.is_async else self._trace_stream
+            response.streaming_content = trace(response.streaming_content, root)
+        else:
+            finish_request(root)
+        return response
+
+    @staticmethod
+    def _install(stack):
+        for connection in connections.all():
+            stack.enter_context(
+                connection.execute_wrapper(
+                    sql_wrapper(connection.vendor, connection.alias)
+                )
+            )
+
+    def _trace_stream(self, content, root):
+        try:
+            with use_span(root), ExitStack() as stack:
+                self._install(stack)
+                yield from content
+        finally:
+            finish_request(root)
+
+    async def _atrace_stream(self, content, root):
+        try:
+            with use_span(root):
+                async with on_request_thread(self._install):
+                    async for chunk in content:
+                        yield chunk
+        finally:
+            finish_request(root)
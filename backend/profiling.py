@@ -0,0 +1,187 @@
+# backend/profiling.py
+"""
+On-demand profiles of real requests, as flame-graph input.
+
+``ProfilingMiddleware`` (backend/middleware.py) profiles a request when
+PROFILING_ENABLED is set and either:
+- a staff user sends the PROFILING_HEADER header, or
+- the request falls in the PROFILING_SAMPLE_RATE sample.
+
+While the request runs, a sampler thread reads the request thread's stack
+every PROFILING_INTERVAL_MS. The result is stored under PROFILING_DIR in
+the "folded stacks" format (``frame;frame;frame count`` per line). That
+format loads directly into speedscope, flamegraph.pl and inferno. A JSON
+sidecar holds the request details. The newest PROFILING_KEEP profiles are
+kept.
+
+The profile id is returned in the ``X-Profile-Id`` response header. Staff
+fetch profiles from /internal/profiles/ (backend/views.py).
+
+Only the request's own thread is sampled. Under WSGI that thread runs the
+whole request. Under ASGI it is the thread Django gives the request's
+synchronous code: sync middleware and views, and whatever an async view
+hands to sync_to_async (ORM work, authentication). Code an async view runs
+on the event loop itself is not sampled, because that thread is shared by
+every request in flight; while it runs, the request thread shows up
+waiting for work.
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+
+PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def fold(frame):
+    """Root-first ``;``-joined names of ``frame`` and its callers."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Collects folded stacks of one thread from a background thread."""
+
+    def __init__(self, thread_id, interval_ms):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[fold(frame)] += 1
+
+    def render(self):
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+def _is_staff(request):
+    """Authenticates the request the way the API does (JWT) and checks staff."""
+    for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authenticator_class().authenticate(request)
+        except APIException:
+            return False
+        if result is not None:
+            return result[0].is_staff
+    return False
+
+
+def should_profile(request):
+    if not settings.PROFILING_ENABLED:
+        return False
+    if settings.PROFILING_HEADER in request.headers and _is_staff(request):
+        return True
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def profile_dir():
+    return Path(settings.PROFILING_DIR)
+
+
+def profile_path(profile_id):
+    return profile_dir() / f"{profile_id}.folded"
+
+
+def new_profile_id():
+    return uuid.uuid4().hex
+
+
+def save(profile_id, sampler, request, labels, status_code, duration):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_path(profile_id).write_text(sampler.render(), encoding="utf-8")
+    view, action, method = labels
+    meta = {
+        "id": profile_id,
+        "created": timezone.now().isoformat(),
+        "path": request.path,
+        "view": view,
+        "action": action,
+        "method": method,
+        "status": status_code,
+        "duration_ms": round(duration * 1000, 3),
+        "samples": sum(sampler.stacks.values()),
+        "interval_ms": settings.PROFILING_INTERVAL_MS,
+    }
+    (directory / f"{profile_id}.json").write_text(json.dumps(meta), encoding="utf-8")
+    _prune(directory)
+
+
+def _prune(directory):
+    profiles = sorted(
+        directory.glob("*.folded"), key=lambda path: path.stat().st_mtime, reverse=True
+    )
+    for path in profiles[settings.PROFILING_KEEP :]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+
+
+def list_profiles():
+    """Metadata of the stored profiles, newest first."""
+    profiles = []
+    for path in profile_dir().glob("*.json"):
+        try:
+            profiles.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):  # pruned or half-written meanwhile
+            continue
+    return sorted(profiles, key=lambda meta: meta["created"], reverse=True)
+
+
+class ProfiledRequest:
+    """Runs the sampler around a request; used by ProfilingMiddleware."""
+
+    def __init__(self, request):
+        self.request = request
+        self.id = new_profile_id()
+        self.start = time.perf_counter()
+        self.sampler = StackSampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL_MS
+        ).start()
+
+    def finish(self, labels, status_code):
+        self.sampler.stop()
+        save(
+            self.id,
+            self.sampler,
+            self.request,
+            labels,
+            status_code,
+            time.perf_counter() - self.start,
+        )
@@ -0,0 +1,82 @@
+# backend/renderers.py
+"""
+orjson-backed JSON renderer, a drop-in replacement for DRF's JSONRenderer.
+
+Output matches DRF's compact JSON: datetimes in ISO 8601 with a ``Z`` suffix
+for UTC, UUIDs as strings, raw Decimals (e.g. from ``.values()`` querysets)
+as numbers, U+2028/U+2029 escaped. Anything orjson cannot encode (ints over
+64 bits, custom iterables, ...) and indented output fall back to DRF's
+encoder, so correctness never depends on the fast path.
+
+orjson writes NaN and Infinity as null, which would hide bad data. When the
+output contains a null, the data is checked for non-finite numbers and, if
+it has any, handed to DRF's encoder instead, which raises ValueError under
+STRICT_JSON (the default), as it always did.
+"""
+
+import decimal
+import math
+
+import orjson
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+def orjson_default(obj):
+    """Types orjson does not handle natively, encoded like DRF's JSONEncoder."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    return JSONEncoder().default(obj)
+
+
+def _has_non_finite(data):
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, float):
+            if not math.isfinite(obj):
+                return True
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, decimal.Decimal):
+            if not obj.is_finite():
+                return True
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"null" in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same as DRF: keep the output a strict JavaScript subset.
+        if _LINE_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b"\\u2028")
+        if _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_PARAGRAPH_SEPARATOR, b"\\u2029")
+        return ret
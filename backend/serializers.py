@@ -0,0 +1,59 @@
+# backend/serializers.py
+"""
+Sparse fieldsets shared by the API serializers.
+
+``?fields=id,email`` limits a response to the listed fields and
+``?omit=workspace`` drops fields from it. Fields that are left out are never
+evaluated, so expensive SerializerMethodFields (presigned S3 URLs, extra
+queries) cost nothing unless a client asks for them. Only the top-level
+serializer of a response is filtered; writes are not affected.
+
+Serializers that set ``Meta.list_serializer_class = TracedListSerializer``
+(or a subclass) show their list serialization as a span in request traces
+(backend/tracing.py).
+"""
+
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+from .tracing import span
+
+
+def _names(query_params, key):
+    names = set()
+    for value in query_params.getlist(key):
+        names.update(name.strip() for name in value.split(",") if name.strip())
+    return names
+
+
+class TracedListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        with span(f"serialize {type(self.child).__name__}") as current:
+            ret = super().to_representation(data)
+            if current is not None:
+                current.set("serializer.items", len(ret))
+            return ret
+
+
+class SparseFieldsetMixin:
+    @cached_property
+    def _sparse_fieldset(self):
+        """(fields to keep or None for all, fields to drop) for this response."""
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        request = self.context.get("request")
+        if parent is not None or request is None:
+            return None, set()
+        query_params = getattr(request, "query_params", request.GET)
+        return _names(query_params, "fields") or None, _names(query_params, "omit")
+
+    def wants_field(self, name):
+        fields, omit = self._sparse_fieldset
+        return name not in omit and (fields is None or name in fields)
+
+    @property
+    def _readable_fields(self):
+        for field in super()._readable_fields:
+            if self.wants_field(field.field_name):
+                yield field
@@ -50,6 +50,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.middleware.MetricsMiddleware',  # Request metrics, first so it times everything, the opt-in hooks below included
+    'backend.middleware.SlowQueryMiddleware',  # Opt-in, see SLOW_QUERY_LOG_ENABLED
+    'backend.middleware.ProfilingMiddleware',  # Opt-in, see PROFILING_ENABLED
+    'backend.middleware.TracingMiddleware',  # Opt-in, see TRACING_ENABLED
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -164,6 +168,16 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    # orjson-backed drop-ins for DRF's JSONRenderer/JSONParser
+    'DEFAULT_RENDERER_CLASSES': [
+        'backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'backend.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 SIMPLE_JWT = {
@@ -172,10 +186,58 @@ SIMPLE_JWT = {
     "TOKEN_OBTAIN_SERIALIZER": "users.serializers.CustomTokenObtainPairSerializer",
 }
 
-# AWS S3 Configuration
-AWS_ACCESS_KEY_ID = config('AWS_ACCESS_KEY_ID')  # Your AWS access key
-AWS_SECRET_ACCESS_KEY = config('AWS_SECRET_ACCESS_KEY')  # Your AWS secret key
-AWS_STORAGE_BUCKET_NAME = config("AWS_STORAGE_BUCKET_NAME")  # Your S3 bucket name
+# Media storage backend used by media.helpers.S3Helper: "s3" or "local"
+# ("local" keeps files under MEDIA_ROOT, for on-prem installs and CI)
+MEDIA_STORAGE_BACKEND = config("MEDIA_STORAGE_BACKEND", default="s3")
+MEDIA_ROOT = config("MEDIA_ROOT", default=str(BASE_DIR / "uploads"))
+MEDIA_LOCAL_BASE_URL = config("MEDIA_LOCAL_BASE_URL", default="")  # e.g. https://api.example.com
+# Optional: hand local downloads to the web server, e.g. "X-Accel-Redirect" (nginx)
+MEDIA_SENDFILE_HEADER = config("MEDIA_SENDFILE_HEADER", default="")
+MEDIA_SENDFILE_PREFIX = config("MEDIA_SENDFILE_PREFIX", default="/protected-media/")
+# Threads used by the async media views for blocking storage I/O
+MEDIA_IO_MAX_WORKERS = config("MEDIA_IO_MAX_WORKERS", default=32, cast=int)
+
+# Per-user cache lifetime of /api/v1/bootstrap/ (backend/bootstrap.py); 0 disables it
+BOOTSTRAP_CACHE_SECONDS = config("BOOTSTRAP_CACHE_SECONDS", default=5, cast=int)
+
+# Request metrics (backend/metrics.py), scraped from /internal/metrics/
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")  # endpoint is disabled when empty
+
+# Slow-query capture with EXPLAIN plans (backend/slow_queries.py)
+SLOW_QUERY_LOG_ENABLED = config("SLOW_QUERY_LOG_ENABLED", default=False, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config("SLOW_QUERY_THRESHOLD_MS", default=100, cast=float)
+SLOW_QUERY_SAMPLE_RATE = config("SLOW_QUERY_SAMPLE_RATE", default=0.05, cast=float)  # share of requests watched
+SLOW_QUERY_MAX_PER_REQUEST = config("SLOW_QUERY_MAX_PER_REQUEST", default=5, cast=int)
+SLOW_QUERY_LOG_FILE = config("SLOW_QUERY_LOG_FILE", default=str(BASE_DIR / "logs" / "slow_queries.log"))
+SLOW_QUERY_LOG_MAX_BYTES = config("SLOW_QUERY_LOG_MAX_BYTES", default=10 * 1024 * 1024, cast=int)
+SLOW_QUERY_LOG_BACKUP_COUNT = config("SLOW_QUERY_LOG_BACKUP_COUNT", default=5, cast=int)
+SLOW_QUERY_QUEUE_SIZE = config("SLOW_QUERY_QUEUE_SIZE", default=100, cast=int)  # reports awaiting EXPLAIN
+
+# On-demand request profiling (backend/profiling.py), downloaded from /internal/profiles/
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=False, cast=bool)
+PROFILING_HEADER = config("PROFILING_HEADER", default="X-Profile")  # honoured for staff users only
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+PROFILING_INTERVAL_MS = config("PROFILING_INTERVAL_MS", default=5, cast=float)
+PROFILING_DIR = config("PROFILING_DIR", default=str(BASE_DIR / "logs" / "profiles"))
+PROFILING_KEEP = config("PROFILING_KEEP", default=200, cast=int)
+
+# Request tracing (backend/tracing.py), exported as OTLP/JSON
+TRACING_ENABLED = config("TRACING_ENABLED", default=False, cast=bool)
+TRACING_SAMPLE_RATE = config("TRACING_SAMPLE_RATE", default=1.0, cast=float)  # unless a traceparent decides
+TRACING_SERVICE_NAME = config("TRACING_SERVICE_NAME", default="backend")
+TRACING_EXPORTER = config("TRACING_EXPORTER", default="file")  # "file" or "otlp"
+TRACING_FILE = config("TRACING_FILE", default=str(BASE_DIR / "logs" / "traces.jsonl"))
+TRACING_FILE_MAX_BYTES = config("TRACING_FILE_MAX_BYTES", default=50 * 1024 * 1024, cast=int)
+TRACING_FILE_BACKUP_COUNT = config("TRACING_FILE_BACKUP_COUNT", default=5, cast=int)
+TRACING_OTLP_ENDPOINT = config("TRACING_OTLP_ENDPOINT", default="http://localhost:4318/v1/traces")
+TRACING_MAX_SPANS = config("TRACING_MAX_SPANS", default=1000, cast=int)  # per trace
+TRACING_QUEUE_SIZE = config("TRACING_QUEUE_SIZE", default=1000, cast=int)  # traces awaiting export
+
+# AWS S3 Configuration (only required when MEDIA_STORAGE_BACKEND = "s3")
+AWS_ACCESS_KEY_ID = config('AWS_ACCESS_KEY_ID', default='')  # Your AWS access key
+AWS_SECRET_ACCESS_KEY = config('AWS_SECRET_ACCESS_KEY', default='')  # Your AWS secret key
+AWS_STORAGE_BUCKET_NAME = config("AWS_STORAGE_BUCKET_NAME", default="")  # Your S3 bucket name
 AWS_S3_REGION_NAME = config('AWS_S3_REGION_NAME', default='eu-north-1')  # Your bucket region
 # AWS_S3_CUSTOM_DOMAIN = f'{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com'  # Optional: Custom domain for files
 
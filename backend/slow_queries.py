@@ -0,0 +1,191 @@
+# backend/slow_queries.py
+"""
+Opt-in capture of slow SQL with its query plan.
+
+When SLOW_QUERY_LOG_ENABLED is set, ``SlowQueryMiddleware``
+(backend/middleware.py) watches a sample of requests
+(SLOW_QUERY_SAMPLE_RATE). It keeps every statement slower than
+SLOW_QUERY_THRESHOLD_MS. After the response has been produced, those
+statements are handed to a background thread, which explains them on a
+separate database connection and writes one JSON line per statement to the
+rotating SLOW_QUERY_LOG_FILE. The explain runs without ANALYZE, so the
+statement is never executed a second time. If the thread falls behind
+(more than SLOW_QUERY_QUEUE_SIZE requests waiting), reports are dropped
+rather than slowing requests down.
+
+Parameter values are not logged, only their shape (type and length), so
+the log holds no user data beyond what is in the SQL text itself.
+"""
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger("backend.slow_queries")
+_configure_lock = threading.Lock()
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    with _configure_lock:
+        if logger.handlers:
+            return
+        path = Path(settings.SLOW_QUERY_LOG_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def should_sample():
+    if not settings.SLOW_QUERY_LOG_ENABLED:
+        return False
+    return random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+
+
+def params_shape(params):
+    """Type (and length, for sized values) of each parameter, never the value."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: params_shape([value])[0] for key, value in params.items()}
+    shape = []
+    for value in params:
+        name = type(value).__name__
+        if isinstance(value, (str, bytes, list, tuple)):
+            name = f"{name}[{len(value)}]"
+        shape.append(name)
+    return shape
+
+
+class SlowQueryRecorder:
+    """``connection.execute_wrapper`` callback keeping statements over budget."""
+
+    def __init__(self, threshold_ms, limit):
+        self.threshold = threshold_ms / 1000
+        self.limit = limit
+        self.captured = []  # (alias, sql, params, seconds)
+
+    def wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = time.perf_counter() - start
+                # executemany() batches have no single plan worth explaining.
+                if (
+                    not many
+                    and duration >= self.threshold
+                    and len(self.captured) < self.limit
+                ):
+                    self.captured.append((alias, sql, params, duration))
+
+        return record
+
+
+def explain(alias, sql, params):
+    """Query plan of ``sql`` from a fresh connection to the ``alias`` database."""
+    connection = connections.create_connection(alias)
+    try:
+        # ANALYZE would run the statement again; MySQL and PostgreSQL accept
+        # an explicit "off", the other backends never analyze.
+        options = (
+            {"analyze": False} if connection.vendor in ("postgresql", "mysql") else {}
+        )
+        prefix = connection.ops.explain_query_prefix(**options)
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            rows = cursor.fetchall()
+    finally:
+        connection.close()
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+def write_report(captured, labels):
+    """EXPLAIN and log ``captured`` statements; runs on the reporter thread."""
+    _configure_logger()
+    view, action, method = labels
+    for alias, sql, params, duration in captured:
+        try:
+            plan = explain(alias, sql, params)
+        except Exception as exc:  # the log entry is still useful without a plan
+            plan = f"EXPLAIN failed: {type(exc).__name__}: {exc}"
+        logger.info(
+            json.dumps(
+                {
+                    "time": timezone.now().isoformat(),
+                    "view": view,
+                    "action": action,
+                    "method": method,
+                    "database": alias,
+                    "duration_ms": round(duration * 1000, 3),
+                    "sql": sql,
+                    "params": params_shape(params),
+                    "plan": plan,
+                }
+            )
+        )
+
+
+class Reporter:
+    """Explains and logs captured statements from a daemon thread."""
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=settings.SLOW_QUERY_QUEUE_SIZE)
+        self.dropped_reports = 0
+        threading.Thread(
+            target=self._run, name="slow-query-reporter", daemon=True
+        ).start()
+
+    def report(self, recorder, labels):
+        if not recorder.captured:
+            return
+        try:
+            self.queue.put_nowait((recorder.captured, labels))
+        except queue.Full:
+            self.dropped_reports += 1
+
+    def flush(self):
+        """Block until every queued report has been written."""
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            captured, labels = self.queue.get()
+            try:
+                write_report(captured, labels)
+            except Exception:  # a broken log must not take requests down
+                self.dropped_reports += 1
+            finally:
+                self.queue.task_done()
+
+
+_reporter = None
+_reporter_lock = threading.Lock()
+
+
+def reporter():
+    global _reporter
+    if _reporter is None:
+        with _reporter_lock:
+            if _reporter is None:
+                _reporter = Reporter()
+    return _reporter
@@ -0,0 +1,64 @@
+# backend/streaming.py
+"""
+Opt-in streaming mode for large list endpoints (``?stream=1``).
+
+Instead of building the whole ``serializer.data`` list and one JSON string,
+the queryset is read with ``.iterator(chunk_size=...)``, each chunk is
+serialized and rendered on its own, and the JSON array is written out
+incrementally. Peak memory is bounded by one chunk instead of the full list.
+The response body is byte-identical to the non-streaming one.
+"""
+
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+
+from .renderers import ORJSONRenderer
+
+STREAM_CHUNK_SIZE = 500
+
+
+def wants_streaming(request):
+    return request.query_params.get("stream", "").lower() in ("1", "true", "yes")
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def stream_json_array(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE, renderer=None):
+    """
+    Yield a JSON array of ``serialize(chunk)`` results piece by piece.
+    ``serialize`` takes a list of model instances and returns a list.
+    """
+    renderer = renderer or ORJSONRenderer()
+    yield b"["
+    separator = b""
+    for chunk in _chunks(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        body = renderer.render(serialize(chunk))
+        # Drop the enclosing brackets and splice the items into the array.
+        yield separator + body[1:-1]
+        separator = b","
+    yield b"]"
+
+
+class StreamingListMixin:
+    """
+    Adds ``streaming_list_response``; list views call it when
+    ``wants_streaming(request)`` is true.
+    """
+
+    stream_chunk_size = STREAM_CHUNK_SIZE
+
+    def streaming_list_response(self, queryset, serialize=None):
+        if serialize is None:
+
+            def serialize(chunk):
+                return self.get_serializer(chunk, many=True).data
+
+        return StreamingHttpResponse(
+            stream_json_array(queryset, serialize, self.stream_chunk_size),
+            content_type="application/json",
+        )
@@ -0,0 +1,525 @@
+# backend/synthetic.py
+"""
+Synthetic data for scale testing, used by ``manage.py generate_synthetic_data``.
+
+Sizes follow the shapes seen in production rather than uniform noise:
+workspace sizes and conversation activity are Zipf-distributed (a few very
+large workspaces and very hot conversations, a long tail of small ones), and
+complaint threads have exponentially distributed lengths.
+
+Everything is written with batched ``bulk_create`` and every user shares one
+password hash computed up front, so a run costs little more than the
+INSERTs. Only some backends (PostgreSQL, SQLite) set primary keys on the
+objects bulk_create returns, so rows that later steps point at are read back
+by a natural key instead: users by username, workspaces by owner, units by
+workspace and unit number, complaints by workspace, conversations by user
+pair. The two message tables dominate large runs; with ``workers > 1``
+their batches are spread over a process pool, each worker with its own
+database connection. Tables that model save() hooks normally maintain are
+rebuilt at the end (complaint stats, the search index, conversation
+``last_message_at``); unit occupancy is kept current by
+``UserApartment.objects.bulk_create``.
+"""
+
+import datetime
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+DEFAULT_BATCH_SIZE = 5000
+# Messages handed to one pool task; tasks are split within a conversation
+# or complaint list, so one hot conversation still spreads over workers.
+TASK_SIZE = 200_000
+PASSWORD = "synthetic-password"
+
+FIRST_NAMES = ("Ada", "Ben", "Chloe", "Dev", "Elif", "Femi", "Grace", "Hiro")
+LAST_NAMES = ("Smith", "Garcia", "Khan", "Okafor", "Ivanova", "Chen", "Silva")
+WORDS = (
+    "leak water pipe noise door lock heating window mold elevator parking "
+    "trash light stairs neighbor music smell broken repair urgent ceiling "
+    "thanks tomorrow morning please check again fixed still waiting"
+).split()
+CATEGORY_WEIGHTS = {
+    "maintenance": 50,
+    "noise": 20,
+    "neighbor": 10,
+    "security": 8,
+    "other": 12,
+}
+STATUS_WEIGHTS = {"open": 25, "in_progress": 15, "resolved": 45, "closed": 15}
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    users: int = 10_000
+    workspaces: int = 100
+    units_per_member: float = 0.8
+    occupancy: float = 0.85
+    complaints: int = 20_000
+    messages_per_complaint: float = 4.0
+    conversations: int = 5_000
+    chat_messages: int = 200_000
+    skew: float = 1.1
+    seed: int = 0
+    prefix: str = "synthetic"
+    batch_size: int = DEFAULT_BATCH_SIZE
+    workers: int = 1
+
+
+def zipf_weights(n, skew):
+    """Weights proportional to 1 / rank**skew for ranks 1..n, summing to 1."""
+    raw = [1 / (rank**skew) for rank in range(1, n + 1)]
+    total = sum(raw)
+    return [weight / total for weight in raw]
+
+
+def split_total(total, weights):
+    """Split ``total`` into integer parts proportional to ``weights``."""
+    parts = [int(total * weight) for weight in weights]
+    for index in range(total - sum(parts)):
+        parts[index % len(parts)] += 1
+    return parts
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choices(WORDS, k=words)).capitalize() + "."
+
+
+def _batches(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+def _weighted(mapping):
+    return list(mapping), list(accumulate(mapping.values()))
+
+
+def _read_back(queryset, field, keys, fields, batch_size):
+    """
+    Rows of ``queryset`` whose ``field`` is one of ``keys``, as sorted
+    ``fields`` tuples, read ``batch_size`` keys at a time.
+    """
+    keys = list(keys)
+    rows = []
+    for start in range(0, len(keys), batch_size):
+        rows += queryset.filter(
+            **{f"{field}__in": keys[start : start + batch_size]}
+        ).values_list(*fields)
+    return sorted(rows)
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _create_complaint_messages(task):
+    """Pool task: ``rows`` is a list of (complaint id, author id, staff id, count)."""
+    from complaints.models import ComplaintMessage
+
+    seed, rows, batch_size = task
+    rng = random.Random(seed)
+    pending = []
+    created = 0
+    for complaint_id, author_id, staff_id, count in rows:
+        for _ in range(count):
+            pending.append(
+                ComplaintMessage(
+                    complaint_id=complaint_id,
+                    sender_id=rng.choice((author_id, author_id, staff_id)),
+                    content=_sentence(rng, rng.randint(4, 30)),
+                )
+            )
+            if len(pending) >= batch_size:
+                created += len(ComplaintMessage.objects.bulk_create(pending))
+                pending = []
+    if pending:
+        created += len(ComplaintMessage.objects.bulk_create(pending))
+    return created
+
+
+def _create_chat_messages(task):
+    """Pool task: ``rows`` is a list of (conversation id, user1, user2, count)."""
+    from chat.models import ChatMessage
+
+    seed, rows, batch_size = task
+    rng = random.Random(seed)
+    pending = []
+    created = 0
+    for conversation_id, user1_id, user2_id, count in rows:
+        for _ in range(count):
+            pending.append(
+                ChatMessage(
+                    conversation_id=conversation_id,
+                    sender_id=user1_id if rng.random() < 0.5 else user2_id,
+                    content=_sentence(rng, rng.randint(1, 20)),
+                    is_read=rng.random() < 0.9,
+                )
+            )
+            if len(pending) >= batch_size:
+                created += len(ChatMessage.objects.bulk_create(pending))
+                pending = []
+    if pending:
+        created += len(ChatMessage.objects.bulk_create(pending))
+    return created
+
+
+def _tasks(rng, rows, batch_size):
+    """
+    Cut (key..., count) rows into tasks of about TASK_SIZE messages, splitting
+    rows whose count straddles a task boundary.
+    """
+    task, size = [], 0
+    for *key, count in rows:
+        while count:
+            take = min(count, TASK_SIZE - size)
+            task.append((*key, take))
+            size += take
+            count -= take
+            if size == TASK_SIZE:
+                yield rng.getrandbits(64), task, batch_size
+                task, size = [], 0
+    if task:
+        yield rng.getrandbits(64), task, batch_size
+
+
+def _run(func, tasks, workers):
+    if workers <= 1:
+        return sum(map(func, tasks))
+    # Forked workers must not share the parent's database sockets.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return sum(pool.map(func, tasks))
+
+
+class Generator:
+    def __init__(self, config, log=print):
+        self.config = config
+        self.log = log
+        self.rng = random.Random(config.seed)
+        self.counts = {}
+
+    def _timed(self, name, func):
+        start = time.perf_counter()
+        created = func()
+        elapsed = time.perf_counter() - start
+        self.counts[name] = created
+        rate = created / elapsed if elapsed else 0
+        self.log(f"{name}: {created} row(s) in {elapsed:.1f}s ({rate:,.0f}/s)")
+
+    def run(self):
+        self._timed("User", self.create_users)
+        self._timed("Workspace", self.create_workspaces)
+        self._timed("UserWorkspace", self.create_memberships)
+        self._timed("ApartmentUnit", self.create_units)
+        self._timed("UserApartment", self.create_residents)
+        self._timed("Complaint", self.create_complaints)
+        self._timed("ComplaintMessage", self.create_complaint_messages)
+        self._timed("Conversation", self.create_conversations)
+        self._timed("ChatMessage", self.create_chat_messages)
+        self.rebuild_derived()
+        return self.counts
+
+    def create_users(self):
+        from users.models import User
+
+        config, rng = self.config, self.rng
+        password = make_password(PASSWORD)
+        usernames = [f"{config.prefix}{n}" for n in range(config.users)]
+        created = self._bulk_create(
+            User,
+            (
+                User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password=password,
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    role="owner" if n < config.workspaces else "resident",
+                )
+                for n, username in enumerate(usernames)
+            ),
+        )
+        ids = {
+            username: pk
+            for pk, username in _read_back(
+                User.objects,
+                "username",
+                usernames,
+                ("pk", "username"),
+                config.batch_size,
+            )
+        }
+        self.user_ids = [ids[username] for username in usernames]
+        return created
+
+    def create_workspaces(self):
+        from workspaces.models import Workspace
+
+        config = self.config
+        self.owner_ids = self.user_ids[: config.workspaces]
+        created = self._bulk_create(
+            Workspace,
+            (
+                Workspace(
+                    name=f"{config.prefix.title()} Residences {n}",
+                    address=f"{n} Synthetic Ave",
+                    owner_id=owner_id,
+                )
+                for n, owner_id in enumerate(self.owner_ids)
+            ),
+        )
+        # Every owner is a new user with exactly one workspace.
+        ids = {
+            owner_id: pk
+            for pk, owner_id in _read_back(
+                Workspace.objects,
+                "owner_id",
+                self.owner_ids,
+                ("pk", "owner_id"),
+                config.batch_size,
+            )
+        }
+        self.workspace_ids = [ids[owner_id] for owner_id in self.owner_ids]
+        self.workspace_index = {pk: n for n, pk in enumerate(self.workspace_ids)}
+        return created
+
+    def create_memberships(self):
+        from workspaces.models import UserWorkspace
+
+        config, rng = self.config, self.rng
+        residents = self.user_ids[config.workspaces :]
+        cum_weights = list(accumulate(zipf_weights(config.workspaces, config.skew)))
+        self.members = [[] for _ in self.workspace_ids]
+        for user_id, index in zip(
+            residents,
+            rng.choices(
+                range(config.workspaces), cum_weights=cum_weights, k=len(residents)
+            ),
+        ):
+            self.members[index].append(user_id)
+
+        def rows():
+            for index, workspace_id in enumerate(self.workspace_ids):
+                yield UserWorkspace(
+                    user_id=self.owner_ids[index],
+                    workspace_id=workspace_id,
+                    role="admin",
+                )
+                for user_id in self.members[index]:
+                    role = "admin" if rng.random() < 0.02 else "resident"
+                    yield UserWorkspace(
+                        user_id=user_id, workspace_id=workspace_id, role=role
+                    )
+
+        return self._bulk_create(UserWorkspace, rows())
+
+    def create_units(self):
+        from workspaces.models import ApartmentUnit
+
+        config, rng = self.config, self.rng
+        today = timezone.localdate()
+
+        def rows():
+            for index, workspace_id in enumerate(self.workspace_ids):
+                members = len(self.members[index])
+                for n in range(max(1, round(members * config.units_per_member))):
+                    lease_start = today - datetime.timedelta(days=rng.randrange(365))
+                    yield ApartmentUnit(
+                        workspace_id=workspace_id,
+                        unit_number=f"{n + 1:05d}",
+                        rent_amount=rng.randrange(600, 4000),
+                        square_footage=rng.randrange(350, 2000),
+                        number_of_bedrooms=rng.choices(
+                            (0, 1, 2, 3, 4), (1, 5, 4, 2, 1)
+                        )[0],
+                        number_of_bathrooms=rng.choice((1.0, 1.0, 1.5, 2.0, 2.5)),
+                        lease_start_date=lease_start,
+                        lease_end_date=lease_start
+                        + datetime.timedelta(days=rng.choice((182, 365, 730))),
+                    )
+
+        created = self._bulk_create(ApartmentUnit, rows())
+        # Units per workspace in unit_number order: (id, lease start, lease end).
+        self.units = [[] for _ in self.workspace_ids]
+        for workspace_id, _, *unit in _read_back(
+            ApartmentUnit.objects,
+            "workspace_id",
+            self.workspace_ids,
+            ("workspace_id", "unit_number", "pk", "lease_start_date", "lease_end_date"),
+            config.batch_size,
+        ):
+            self.units[self.workspace_index[workspace_id]].append(tuple(unit))
+        return created
+
+    def create_residents(self):
+        from workspaces.models import UserApartment
+
+        config, rng = self.config, self.rng
+
+        def rows():
+            for units, member_ids in zip(self.units, self.members):
+                occupied = min(len(member_ids), round(len(units) * config.occupancy))
+                for (unit_id, lease_start, lease_end), user_id in zip(
+                    rng.sample(units, occupied), rng.sample(member_ids, occupied)
+                ):
+                    yield UserApartment(
+                        user_id=user_id,
+                        unit_id=unit_id,
+                        lease_start_date=lease_start,
+                        lease_end_date=lease_end,
+                    )
+
+        # The queryset's bulk_create also flags the units as occupied.
+        return self._bulk_create(UserApartment, rows())
+
+    def create_complaints(self):
+        from complaints.models import Complaint
+
+        config, rng = self.config, self.rng
+        cum_weights = list(accumulate(zipf_weights(config.workspaces, config.skew)))
+        categories, category_weights = _weighted(CATEGORY_WEIGHTS)
+        statuses, status_weights = _weighted(STATUS_WEIGHTS)
+
+        def rows():
+            for _, size in _batches(config.complaints, config.batch_size):
+                for index in rng.choices(
+                    range(config.workspaces), cum_weights=cum_weights, k=size
+                ):
+                    members, units = self.members[index], self.units[index]
+                    yield Complaint(
+                        workspace_id=self.workspace_ids[index],
+                        user_id=(
+                            rng.choice(members) if members else self.owner_ids[index]
+                        ),
+                        unit_id=rng.choice(units)[0] if rng.random() < 0.8 else None,
+                        title=_sentence(rng, rng.randint(2, 6)),
+                        description=_sentence(rng, rng.randint(10, 60)),
+                        category=rng.choices(categories, cum_weights=category_weights)[
+                            0
+                        ],
+                        status=rng.choices(statuses, cum_weights=status_weights)[0],
+                    )
+
+        created = self._bulk_create(Complaint, rows())
+        # The workspaces are new, so all of their complaints are ours.
+        self.complaints = [  # (id, author id, staff id)
+            (pk, user_id, self.owner_ids[self.workspace_index[workspace_id]])
+            for pk, user_id, workspace_id in _read_back(
+                Complaint.objects.order_by(),
+                "workspace_id",
+                self.workspace_ids,
+                ("pk", "user_id", "workspace_id"),
+                config.batch_size,
+            )
+        ]
+        return created
+
+    def create_complaint_messages(self):
+        config, rng = self.config, self.rng
+        if config.messages_per_complaint <= 0:
+            return 0
+        rate = 1 / config.messages_per_complaint
+        rows = (
+            (complaint_id, author_id, staff_id, int(rng.expovariate(rate)))
+            for complaint_id, author_id, staff_id in self.complaints
+        )
+        tasks = list(_tasks(rng, rows, config.batch_size))
+        return _run(_create_complaint_messages, tasks, config.workers)
+
+    def create_conversations(self):
+        from chat.models import Conversation
+
+        config, rng = self.config, self.rng
+        cum_weights = list(accumulate(zipf_weights(config.workspaces, config.skew)))
+        pairs = set()
+        attempts = config.conversations * 10
+        while len(pairs) < config.conversations and attempts:
+            attempts -= 1
+            index = rng.choices(range(config.workspaces), cum_weights=cum_weights)[0]
+            people = self.members[index] + [self.owner_ids[index]]
+            if len(people) < 2:
+                continue
+            # Conversation forbids the same pair in either order.
+            pairs.add(tuple(sorted(rng.sample(people, 2))))
+
+        created = self._bulk_create(
+            Conversation,
+            (Conversation(user1_id=a, user2_id=b) for a, b in sorted(pairs)),
+        )
+        # (id, user1 id, user2 id); the users are new, so every pair is ours.
+        self.conversations = _read_back(
+            Conversation.objects.order_by(),
+            "user1_id",
+            {a for a, _ in pairs},
+            ("pk", "user1_id", "user2_id"),
+            config.batch_size,
+        )
+        return created
+
+    def create_chat_messages(self):
+        config, rng = self.config, self.rng
+        if not self.conversations:
+            return 0
+        # Rank conversations at random, then give them Zipf-shaped traffic.
+        ranked = rng.sample(self.conversations, len(self.conversations))
+        counts = split_total(
+            config.chat_messages, zipf_weights(len(ranked), config.skew)
+        )
+        rows = (
+            (*conversation, count)
+            for conversation, count in zip(ranked, counts)
+            if count
+        )
+        tasks = list(_tasks(rng, rows, config.batch_size))
+        return _run(_create_chat_messages, tasks, config.workers)
+
+    def rebuild_derived(self):
+        from chat.models import ChatMessage, Conversation
+        from complaints.search import rebuild_search_index
+        from complaints.stats import rebuild_complaint_stats
+
+        start = time.perf_counter()
+        rebuild_complaint_stats(workspace_ids=self.workspace_ids)
+        rebuild_search_index()
+        batch_size = self.config.batch_size
+        conversation_ids = [pk for pk, _, _ in self.conversations]
+        for offset in range(0, len(conversation_ids), batch_size):
+            Conversation.objects.filter(
+                pk__in=conversation_ids[offset : offset + batch_size]
+            ).update(
+                last_message_at=Subquery(
+                    ChatMessage.objects.filter(conversation=OuterRef("pk"))
+                    .order_by("-timestamp")
+                    .values("timestamp")[:1]
+                )
+            )
+        self.log(
+            "Rebuilt complaint stats, search index and conversation "
+            f"timestamps in {time.perf_counter() - start:.1f}s"
+        )
+
+    def _bulk_create(self, model, rows):
+        created = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.config.batch_size:
+                created += len(model.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            created += len(model.objects.bulk_create(batch))
+        return created
+
+
+def generate(config, log=print):
+    """Seed the database as described by ``config``; returns rows per model."""
+    return Generator(config, log).run()
@@ -0,0 +1,136 @@
+# backend/testing.py
+"""
+Test helpers that keep list endpoints free of N+1 queries.
+
+``QueryCountMixin.assertQueryCountStable`` requests an endpoint with a small
+dataset, adds rows, and requests it again. The number of SQL queries must
+not grow with the number of rows. When it does, the failure lists the SQL
+templates (the statement with its parameters left as placeholders) that ran
+more often. That usually points straight at the serializer field with a
+``source="x.y"`` that crosses a relation nobody select_related().
+"""
+
+import json
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_sequence = count()
+
+
+def sql_template(sql):
+    """Whitespace-normalized SQL with ``IN (%s, %s, ...)`` lists collapsed."""
+    return _IN_LIST.sub("IN (...)", " ".join(sql.split()))
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` callback that keeps every statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def templates(self):
+        return Counter(sql_template(sql) for sql in self.queries)
+
+
+@contextmanager
+def record_queries():
+    """Record the SQL run on every database connection inside the block."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def json_rows(content):
+    """Row count of a JSON list response."""
+    return len(json.loads(content))
+
+
+def unique_name(prefix="user"):
+    return f"{prefix}{next(_sequence)}"
+
+
+def make_user(**kwargs):
+    name = unique_name()
+    return get_user_model().objects.create(
+        username=name, email=f"{name}@example.com", password="!", **kwargs
+    )
+
+
+class QueryCountMixin:
+    """For TestCase subclasses; see the module docstring."""
+
+    small_size = 2
+    large_size = 6
+
+    def _fetch(self, fetch):
+        with record_queries() as recorder:
+            response = fetch()
+            # Streaming bodies run their queries while being consumed.
+            content = (
+                b"".join(response.streaming_content)
+                if response.streaming
+                else response.content
+            )
+        self.assertEqual(
+            response.status_code,
+            200,
+            f"Unexpected status {response.status_code}: {content[:500]!r}",
+        )
+        return recorder, content
+
+    def assertQueryCountStable(self, fetch, grow, rows=json_rows):
+        """
+        Call ``grow(small_size)``, ``fetch()``, ``grow(large_size -
+        small_size)``, ``fetch()`` and fail if the second response ran more
+        queries than the first. ``grow(n)`` adds n rows the endpoint lists;
+        ``rows(content)`` counts rows in a response body and is used to check
+        that the endpoint really listed the new rows.
+        """
+        grow(self.small_size)
+        small, small_content = self._fetch(fetch)
+        grow(self.large_size - self.small_size)
+        large, large_content = self._fetch(fetch)
+
+        small_rows, large_rows = rows(small_content), rows(large_content)
+        self.assertGreater(
+            large_rows,
+            small_rows,
+            f"The response did not grow with the data ({small_rows} rows "
+            f"before adding rows, {large_rows} after); it may be cached.",
+        )
+        if len(large) <= len(small):
+            return
+
+        before, after = small.templates(), large.templates()
+        grown = sorted(
+            (
+                (after[template] - before[template], template)
+                for template in after
+                if after[template] > before[template]
+            ),
+            reverse=True,
+        )
+        report = "\n".join(
+            f"  {before[template]} -> {after[template]}  {template}"
+            for _, template in grown
+        )
+        self.fail(
+            f"Query count grew with the data: {len(small)} queries for "
+            f"{small_rows} rows, {len(large)} for {large_rows} rows.\n"
+            f"Statements that ran more often:\n{report}"
+        )
@@ -0,0 +1,424 @@
+import decimal
+import json
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from backend.fast_read import ValuesReader
+from backend.metrics import SQL_QUERIES
+from backend.middleware import (
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    SlowQueryMiddleware,
+    TracingMiddleware,
+)
+from backend.profiling import profile_path
+from backend.renderers import ORJSONRenderer
+from backend.slow_queries import reporter
+from backend.streaming import StreamingListMixin
+from backend.testing import QueryCountMixin, make_user, unique_name
+from backend.tracing import exporter
+from chat.models import ChatMessage, Conversation
+from complaints.models import Complaint
+from chat.views import MessageViewSet
+from users.models import User
+from workspaces.models import ApartmentUnit, UserApartment, UserWorkspace, Workspace
+from workspaces.views import ApartmentUnitViewSet, UserWorkspaceViewSet
+
+
+def bootstrap_rows(content):
+    data = json.loads(content)
+    return sum(
+        len(data[section]) for section in ("workspaces", "apartments", "conversations")
+    )
+
+
+@override_settings(BOOTSTRAP_CACHE_SECONDS=0)
+class BootstrapTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_everything(self, n):
+        # A workspace with a unit the user rents, and a conversation with an
+        # unread message, per step.
+        for _ in range(n):
+            owner = make_user(role="owner")
+            workspace = Workspace.objects.create(
+                name=unique_name("Tower"), address="1 Main St", owner=owner
+            )
+            UserWorkspace.objects.create(
+                user=self.user, workspace=workspace, role="resident"
+            )
+            unit = ApartmentUnit.objects.create(
+                workspace=workspace, unit_number=unique_name("U"), rent_amount=1000
+            )
+            UserApartment.objects.create(user=self.user, unit=unit)
+            conversation = Conversation.objects.create(user1=owner, user2=self.user)
+            ChatMessage.objects.create(
+                conversation=conversation, sender=owner, content="Welcome"
+            )
+
+    def test_query_count(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get("/api/v1/bootstrap/"),
+            self.add_everything,
+            rows=bootstrap_rows,
+        )
+
+    def test_unread_counts(self):
+        self.add_everything(2)
+        conversation = Conversation.objects.filter(user2=self.user).first()
+        ChatMessage.objects.create(
+            conversation=conversation, sender=self.user, content="Thanks"
+        )
+
+        data = self.client.get("/api/v1/bootstrap/").json()
+
+        self.assertEqual(data["unread"], {"messages": 2})
+        self.assertEqual([c["unread_count"] for c in data["conversations"]], [1, 1])
+        self.assertEqual({w["role"] for w in data["workspaces"]}, {"resident"})
+
+    @override_settings(BOOTSTRAP_CACHE_SECONDS=5)
+    def test_cached_per_user(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        first = self.client.get("/api/v1/bootstrap/")
+        self.add_everything(1)
+
+        self.assertEqual(self.client.get("/api/v1/bootstrap/").json(), first.json())
+        self.assertEqual(first["Cache-Control"], "private, max-age=5")
+
+        other = APIClient()
+        other.force_authenticate(make_user())
+        self.assertEqual(other.get("/api/v1/bootstrap/").json()["workspaces"], [])
+
+
+class ValuesListTests(TestCase):
+    """list_data() must render byte-for-byte like serializer.data."""
+
+    def setUp(self):
+        self.user = make_user(role="owner")
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.user
+        )
+        for role in ("admin", "resident"):
+            UserWorkspace.objects.create(
+                user=make_user(), workspace=self.workspace, role=role
+            )
+        ApartmentUnit.objects.create(
+            workspace=self.workspace, unit_number="101", rent_amount="1250.50"
+        )
+        ApartmentUnit.objects.create(
+            workspace=self.workspace,
+            unit_number="102",
+            rent_amount=900,
+            square_footage=640,
+            number_of_bathrooms=1.5,
+        )
+        other = make_user()
+        conversation = Conversation.objects.create(user1=self.user, user2=other)
+        first = ChatMessage.objects.create(
+            conversation=conversation, sender=other, content="Hello"
+        )
+        ChatMessage.objects.create(
+            conversation=conversation, sender=self.user, content="Hi", reply_to=first
+        )
+        # The sender's account is gone: a null FK in the middle of a source.
+        ChatMessage.objects.create(conversation=conversation, content="Bye")
+
+    def view(self, viewset_class, action, query=None, **kwargs):
+        request = APIRequestFactory().get("/", query)
+        force_authenticate(request, self.user)
+        view = viewset_class(
+            action_map={"get": action}, kwargs=kwargs, format_kwarg=None
+        )
+        view.request = view.initialize_request(request)
+        return view
+
+    def assertSameOutput(self, view):
+        queryset = view.get_queryset().order_by("pk")
+        ValuesReader(view.get_serializer())  # would raise on a fallback
+        renderer = ORJSONRenderer()
+        expected = view.get_serializer(queryset, many=True).data
+        self.assertGreater(len(expected), 1)
+        self.assertEqual(
+            renderer.render(view.list_data(queryset)), renderer.render(expected)
+        )
+
+    def test_user_workspaces(self):
+        self.assertSameOutput(
+            self.view(
+                UserWorkspaceViewSet,
+                "list_user_workspaces",
+                workspace_id=self.workspace.pk,
+            )
+        )
+
+    def test_apartment_units(self):
+        self.assertSameOutput(
+            self.view(
+                ApartmentUnitViewSet,
+                "list_apartment_units",
+                workspace_id=self.workspace.pk,
+            )
+        )
+
+    def test_chat_messages(self):
+        view = self.view(MessageViewSet, "list")
+        self.assertSameOutput(view)
+        rows = view.list_data(view.get_queryset().order_by("pk"))
+        self.assertEqual(
+            [row["reply_to_content"] for row in rows], [None, "Hello", None]
+        )
+        self.assertNotIn("sender_username", rows[2])
+
+    def test_fields(self):
+        view = self.view(
+            MessageViewSet, "list", {"fields": "id,reply_to_content,sender_username"}
+        )
+        self.assertSameOutput(view)
+        [row, *_] = view.list_data(view.get_queryset().order_by("pk"))
+        self.assertEqual(set(row), {"id", "reply_to_content", "sender_username"})
+
+    def test_omit(self):
+        view = self.view(
+            MessageViewSet, "list", {"omit": "content,reply_to,conversation_id"}
+        )
+        self.assertSameOutput(view)
+        [row, *_] = view.list_data(view.get_queryset())
+        self.assertFalse({"content", "reply_to", "conversation_id"} & set(row))
+
+
+class StreamingListTests(TestCase):
+    def setUp(self):
+        self.user = make_user(role="owner")
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.user
+        )
+        UserWorkspace.objects.create(
+            user=self.user, workspace=self.workspace, role="admin"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Several chunks per response.
+        chunk_size = mock.patch.object(StreamingListMixin, "stream_chunk_size", 2)
+        chunk_size.start()
+        self.addCleanup(chunk_size.stop)
+
+    def add_rows(self, n):
+        for _ in range(n):
+            member = make_user()
+            UserWorkspace.objects.create(
+                user=member, workspace=self.workspace, role="resident"
+            )
+            Complaint.objects.create(
+                workspace=self.workspace,
+                user=member,
+                title="Water leak",
+                description="Under the sink",
+                category="maintenance",
+            )
+
+    def assertStreamsSameBody(self, url):
+        for rows in (0, 5):
+            self.add_rows(rows)
+            with self.subTest(rows=rows):
+                expected = self.client.get(url)
+                streamed = self.client.get(url, {"stream": "1"})
+                self.assertEqual(expected.status_code, 200)
+                self.assertIsInstance(streamed, StreamingHttpResponse)
+                self.assertEqual(streamed["Content-Type"], "application/json")
+                self.assertEqual(b"".join(streamed.streaming_content), expected.content)
+
+    def test_users(self):
+        self.assertStreamsSameBody("/api/v1/users/")
+
+    def test_user_workspaces(self):
+        self.assertStreamsSameBody(f"/api/v1/workspaces/{self.workspace.pk}/users/")
+
+    def test_complaints(self):
+        self.assertStreamsSameBody(
+            f"/api/v1/complaints/workspaces/{self.workspace.pk}/complaints/"
+        )
+
+
+class ORJSONRendererTests(TestCase):
+    def test_non_finite_numbers_are_rejected(self):
+        renderer = ORJSONRenderer()
+        for value in (
+            float("nan"),
+            float("inf"),
+            decimal.Decimal("NaN"),
+            decimal.Decimal("-Infinity"),
+        ):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    renderer.render([{"id": 1, "score": None, "rent": [value]}])
+
+    def test_null_and_finite_numbers(self):
+        data = {"score": None, "rent": decimal.Decimal("12.50"), "ratio": 0.5}
+        self.assertEqual(
+            ORJSONRenderer().render(data),
+            b'{"score":null,"rent":12.5,"ratio":0.5}',
+        )
+
+
+def sql_queries_sum(labels='{view="unresolved",action="",method="GET"}'):
+    for name, sample_labels, value in SQL_QUERIES.samples():
+        if name.endswith("_sum") and sample_labels == labels:
+            return value
+    return 0
+
+
+class MetricsMiddlewareTests(TestCase):
+    def test_sync(self):
+        def get_response(request):
+            User.objects.count()
+            return HttpResponse("ok")
+
+        middleware = MetricsMiddleware(get_response)
+        self.assertFalse(iscoroutinefunction(middleware))
+        before = sql_queries_sum()
+        middleware(RequestFactory().get("/"))
+        self.assertEqual(sql_queries_sum() - before, 1)
+
+    async def test_async(self):
+        async def get_response(request):
+            await sync_to_async(User.objects.count)()
+            return HttpResponse("ok")
+
+        middleware = MetricsMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        before = sql_queries_sum()
+        await middleware(RequestFactory().get("/"))
+        self.assertEqual(sql_queries_sum() - before, 1)
+
+
+class SlowQueryMiddlewareTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log = Path(directory.name) / "slow.log"
+        settings = override_settings(
+            SLOW_QUERY_LOG_ENABLED=True,
+            SLOW_QUERY_SAMPLE_RATE=1,
+            SLOW_QUERY_THRESHOLD_MS=0,
+            SLOW_QUERY_LOG_FILE=str(self.log),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # The logger keeps its handler; point it at this test's file.
+        self.addCleanup(self.reset_logger)
+        self.reset_logger()
+
+    @staticmethod
+    def reset_logger():
+        from backend.slow_queries import logger
+
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+    def logged(self):
+        reporter().flush()
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+    def test_sync(self):
+        def get_response(request):
+            User.objects.count()
+            return HttpResponse("ok")
+
+        SlowQueryMiddleware(get_response)(RequestFactory().get("/"))
+        [entry] = self.logged()
+        self.assertIn("COUNT(*)", entry["sql"])
+        self.assertNotIn("EXPLAIN failed", entry["plan"])
+
+    async def test_async(self):
+        async def get_response(request):
+            await sync_to_async(User.objects.count)()
+            return HttpResponse("ok")
+
+        middleware = SlowQueryMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(RequestFactory().get("/"))
+        [entry] = await sync_to_async(self.logged)()
+        self.assertIn("COUNT(*)", entry["sql"])
+
+
+def busy(seconds=0.05):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+    return HttpResponse("ok")
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            PROFILING_ENABLED=True,
+            PROFILING_SAMPLE_RATE=1,
+            PROFILING_INTERVAL_MS=1,
+            PROFILING_DIR=directory.name,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def assertSampled(self, response):
+        stacks = profile_path(response["X-Profile-Id"]).read_text()
+        self.assertIn("backend.tests:busy", stacks)
+
+    def test_sync(self):
+        response = ProfilingMiddleware(lambda request: busy())(
+            RequestFactory().get("/")
+        )
+        self.assertSampled(response)
+
+    async def test_async_samples_the_request_thread(self):
+        async def get_response(request):
+            return await sync_to_async(busy)()
+
+        middleware = ProfilingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertSampled(await middleware(RequestFactory().get("/")))
+
+
+@override_settings(TRACING_ENABLED=True, TRACING_SAMPLE_RATE=1)
+class TracingMiddlewareTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(exporter(), "export")
+        self.export = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertTraced(self, response):
+        [(trace,), _] = self.export.call_args
+        self.assertEqual(response["X-Trace-Id"], trace.trace_id)
+        root, query = trace.spans
+        self.assertEqual(query.parent_id, root.span_id)
+        self.assertIn("COUNT(*)", query.attributes["db.statement"])
+
+    def test_sync(self):
+        def get_response(request):
+            User.objects.count()
+            return HttpResponse("ok")
+
+        self.assertTraced(TracingMiddleware(get_response)(RequestFactory().get("/")))
+
+    async def test_async_traces_queries_on_the_request_thread(self):
+        async def get_response(request):
+            await sync_to_async(User.objects.count)()
+            return HttpResponse("ok")
+
+        middleware = TracingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertTraced(await middleware(RequestFactory().get("/")))
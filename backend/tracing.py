@@ -0,0 +1,317 @@
+# backend/tracing.py
+"""
+Lightweight request tracing in the OpenTelemetry data model.
+
+With TRACING_ENABLED, ``TracingMiddleware`` (backend/middleware.py) opens a
+server span for each request and makes it current through a context
+variable. ``span()`` opens a child of whatever span is current. Children
+are recorded for:
+- every SQL statement (execute_wrapper, like backend.metrics);
+- every S3Helper upload and presign;
+- every list serialization (backend/serializers.py).
+``span()`` is a no-op outside a sampled request.
+
+Trace context follows W3C Trace Context. An incoming ``traceparent``
+header continues the caller's trace and sampling decision. Otherwise
+TRACING_SAMPLE_RATE decides. Every response gets ``traceparent`` and
+``X-Trace-Id`` headers, sampled or not, so log lines and client reports can
+be matched to a trace.
+
+Finished traces are handed to a background thread and exported as OTLP/JSON
+``resourceSpans`` payloads:
+- TRACING_EXPORTER="file" appends one payload per line to the rotating
+  TRACING_FILE;
+- TRACING_EXPORTER="otlp" POSTs it to TRACING_OTLP_ENDPOINT, i.e. an
+  OpenTelemetry collector's /v1/traces.
+If the exporter falls behind, whole traces are dropped rather than slowing
+requests down.
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+
+# OTLP SpanKind values
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+MAX_STATEMENT_LENGTH = 2000
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current = ContextVar("trace_span", default=None)
+
+
+def _new_id(size):
+    return os.urandom(size).hex()
+
+
+class Trace:
+    def __init__(self, trace_id, sampled):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans = []
+        self.dropped_spans = 0
+
+    def start_span(self, name, kind, parent_id, attributes):
+        """A new recorded span, or None once TRACING_MAX_SPANS is reached."""
+        if len(self.spans) >= settings.TRACING_MAX_SPANS:
+            self.dropped_spans += 1
+            return None
+        span = Span(self, name, kind, parent_id, attributes)
+        self.spans.append(span)
+        return span
+
+
+class Span:
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "attributes",
+        "start",
+        "end",
+        "error",
+    )
+
+    def __init__(self, trace, name, kind, parent_id, attributes):
+        self.trace = trace
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start = time.time_ns()
+        self.end = None
+        self.error = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def finish(self):
+        self.end = time.time_ns()
+
+    @property
+    def traceparent(self):
+        flags = "01" if self.trace.sampled else "00"
+        return f"00-{self.trace.trace_id}-{self.span_id}-{flags}"
+
+    def to_otlp(self):
+        data = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end or self.start),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": STATUS_OK},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            data["status"] = {
+                "code": STATUS_ERROR,
+                "message": f"{type(self.error).__name__}: {self.error}",
+            }
+        return data
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [
+        {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+def current_span():
+    return _current.get()
+
+
+@contextmanager
+def use_span(span):
+    """Make ``span`` current for the duration of the block."""
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name, kind=INTERNAL, attributes=None):
+    """
+    Child span of the current span, closed (and marked failed on an
+    exception) when the block exits. Yields None when nothing is recorded.
+    """
+    parent = _current.get()
+    if parent is None or not parent.trace.sampled:
+        yield None
+        return
+    child = parent.trace.start_span(name, kind, parent.span_id, attributes)
+    if child is None:
+        yield None
+        return
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = exc
+        raise
+    finally:
+        child.finish()
+        _current.reset(token)
+
+
+def start_request(request):
+    """Root server span for ``request``, continuing an incoming traceparent."""
+    match = TRACEPARENT.match(request.headers.get("traceparent", ""))
+    if match and match.group(1) != "0" * 32:
+        trace_id, parent_id, flags = match.groups()
+        sampled = bool(int(flags, 16) & 1)
+    else:
+        trace_id, parent_id = _new_id(16), None
+        sampled = random.random() < settings.TRACING_SAMPLE_RATE
+    trace = Trace(trace_id, sampled)
+    attributes = {"http.request.method": request.method, "url.path": request.path}
+    if sampled:
+        return trace.start_span(
+            f"{request.method} {request.path}", SERVER, parent_id, attributes
+        )
+    return Span(trace, request.method, SERVER, parent_id, attributes)
+
+
+def finish_request(root):
+    root.finish()
+    if root.trace.sampled:
+        exporter().export(root.trace)
+
+
+def sql_wrapper(vendor, alias):
+    """``connection.execute_wrapper`` callback opening a span per statement."""
+
+    def record(execute, sql, params, many, context):
+        with span(
+            "db.query",
+            CLIENT,
+            {
+                "db.system": vendor,
+                "db.name": alias,
+                "db.statement": sql[:MAX_STATEMENT_LENGTH],
+                "db.executemany": many,
+            },
+        ):
+            return execute(sql, params, many, context)
+
+    return record
+
+
+def otlp_payload(trace):
+    spans = [span.to_otlp() for span in trace.spans]
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes(
+                        {"service.name": settings.TRACING_SERVICE_NAME}
+                    )
+                },
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class Exporter:
+    """Serializes and ships finished traces from a daemon thread."""
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=settings.TRACING_QUEUE_SIZE)
+        self.dropped_traces = 0
+        self._write = (
+            self._post if settings.TRACING_EXPORTER == "otlp" else self._append
+        )
+        self._logger = None
+        threading.Thread(target=self._run, name="trace-exporter", daemon=True).start()
+
+    def export(self, trace):
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped_traces += 1
+
+    def flush(self):
+        """Block until every queued trace has been written."""
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            trace = self.queue.get()
+            try:
+                self._write(json.dumps(otlp_payload(trace)))
+            except Exception:  # a broken exporter must not take requests down
+                self.dropped_traces += 1
+            finally:
+                self.queue.task_done()
+
+    def _append(self, line):
+        if self._logger is None:
+            path = Path(settings.TRACING_FILE)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=settings.TRACING_FILE_MAX_BYTES,
+                backupCount=settings.TRACING_FILE_BACKUP_COUNT,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger = logging.getLogger("backend.tracing")
+            self._logger.addHandler(handler)
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+        self._logger.info(line)
+
+    def _post(self, body):
+        request = urllib.request.Request(
+            settings.TRACING_OTLP_ENDPOINT,
+            data=body.encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def exporter():
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = Exporter()
+    return _exporter
@@ -19,6 +19,7 @@ from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from users.views import UserViewSet
+from . import views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -30,4 +31,12 @@ urlpatterns = [
     path("api/v1/workspaces/", include("workspaces.urls")),
     path("api/v1/complaints/", include("complaints.urls")),
     path("api/v1/chat/", include("chat.urls")),
+    path("api/v1/bootstrap/", views.bootstrap, name="bootstrap"),
+    path("internal/metrics/", views.metrics, name="metrics"),
+    path("internal/profiles/", views.profiles, name="profiles"),
+    path(
+        "internal/profiles/<str:profile_id>/",
+        views.profile_download,
+        name="profile-download",
+    ),
 ]
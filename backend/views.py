@@ -0,0 +1,76 @@
+# backend/views.py
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+
+from . import profiling
+from .bootstrap import bootstrap_data
+from .metrics import REGISTRY
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint. Disabled (404) unless METRICS_TOKEN is set;
+    scrapers authenticate with ``Authorization: Bearer <METRICS_TOKEN>``.
+    """
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    if not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        return HttpResponse(status=403)
+    return HttpResponse(
+        REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profiles(request):
+    """Stored request profiles, newest first (staff only)."""
+    return Response(profiling.list_profiles())
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profile_download(request, profile_id):
+    """
+    One profile in the folded-stacks format, for speedscope, flamegraph.pl
+    or inferno (staff only).
+    """
+    if not profiling.PROFILE_ID.match(profile_id):
+        raise Http404
+    try:
+        handle = profiling.profile_path(profile_id).open("rb")
+    except FileNotFoundError:
+        raise Http404
+    return FileResponse(
+        handle,
+        as_attachment=True,
+        filename=f"{profile_id}.folded",
+        content_type="text/plain; charset=utf-8",
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def bootstrap(request):
+    """
+    The app's startup data in one response; see backend/bootstrap.py. Cached
+    per user for BOOTSTRAP_CACHE_SECONDS, so changes can take that long to
+    show up here.
+    """
+    seconds = settings.BOOTSTRAP_CACHE_SECONDS
+    key = f"bootstrap:{request.user.pk}"
+    data = cache.get(key) if seconds else None
+    if data is None:
+        data = bootstrap_data(request.user)
+        if seconds:
+            cache.set(key, data, seconds)
+    response = Response(data)
+    response["Cache-Control"] = f"private, max-age={seconds}"
+    return response
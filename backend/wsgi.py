@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Resolve attachable-model ContentTypes once per process instead of per request.
+from media.registry import attachable_models  # noqa: E402
+
+attachable_models.warm()
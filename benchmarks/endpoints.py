@@ -0,0 +1,856 @@
+# benchmarks/endpoints.py
+"""
+Latency, throughput and query counts for every API route in the users,
+workspaces, complaints, chat and media apps, against a seeded synthetic
+world at one or more scales.
+
+    python -m benchmarks.endpoints [--scale small --scale medium]
+        [--repeat 20] [--seed 0] [--output report.json]
+        [--compare previous-report.json]
+
+Worlds are seeded by benchmarks/world.py into a throwaway test database
+(created and destroyed like ``manage.py test`` does, and flushed between
+scales), so the configured database is never touched. Storage goes through benchmarks.fakes, so the
+media routes run the real S3Helper code without network access. Requests are
+issued in-process through DRF's APIClient with a real JWT, so
+authentication, middleware and rendering are all included.
+
+For every route the report records the status code, the SQL query count and
+S3 call count of one request, the response size, and latency statistics
+over ``--repeat`` requests after one warm-up request. Objects consumed by
+write routes (e.g. the row a DELETE removes) are created before the timer
+starts. The JSON report has sorted keys and one entry per route so two
+reports diff cleanly; ``--compare`` prints query-count and p50 changes
+against an earlier report. Routes found in the URLconf with no benchmark
+entry are listed under "uncovered".
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from itertools import count
+from urllib.parse import urlsplit
+
+APPS = ("users", "workspaces", "complaints", "chat", "media")
+PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06"
+    b"\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01"
+    b"\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+@dataclass
+class Route:
+    """
+    One benchmarked request. ``prepare(ctx)`` runs untimed before every
+    request and returns ``(path, data)``; it may create the rows the request
+    consumes.
+    """
+
+    name: str
+    method: str
+    prepare: object
+    expect: int = 200
+    format: str = "json"
+    settings: dict = field(default_factory=dict)
+
+
+class Context:
+    """The seeded world plus helpers for building fixtures between requests."""
+
+    def __init__(self, world):
+        self.world = world
+        self.sequence = count()
+
+    @property
+    def w(self):
+        return self.world.workspace_id
+
+    def next(self):
+        return next(self.sequence)
+
+    def user(self):
+        from django.contrib.auth.hashers import make_password
+        from users.models import User
+
+        n = self.next()
+        return User.objects.create(
+            username=f"bench{n}",
+            email=f"bench{n}@example.com",
+            password=make_password(None),
+        )
+
+    def workspace(self):
+        from workspaces.models import Workspace
+
+        return Workspace.objects.create(
+            name=f"Bench {self.next()}", address="0 Side St", owner=self.world.owner
+        )
+
+    def conversation(self):
+        from chat.models import Conversation
+
+        return Conversation.objects.create(user1=self.world.owner, user2=self.user())
+
+    def member(self):
+        from workspaces.models import UserWorkspace
+
+        return UserWorkspace.objects.create(
+            user=self.user(), workspace_id=self.w, role="resident"
+        )
+
+    def unit(self):
+        from workspaces.models import ApartmentUnit
+
+        return ApartmentUnit.objects.create(
+            workspace_id=self.w, unit_number=f"B{self.next()}", rent_amount=1000
+        )
+
+    def complaint(self):
+        from complaints.models import Complaint
+
+        return Complaint.objects.create(
+            workspace_id=self.w,
+            user=self.world.owner,
+            title="Benchmark complaint",
+            description="Created for a write benchmark.",
+            category="other",
+        )
+
+    def complaint_message(self):
+        from complaints.models import ComplaintMessage
+
+        return ComplaintMessage.objects.create(
+            complaint_id=self.world.complaint_ids[0],
+            sender=self.world.owner,
+            content="Benchmark message",
+        )
+
+    def chat_message(self):
+        from chat.models import ChatMessage
+
+        return ChatMessage.objects.create(
+            conversation_id=self.world.conversation_ids[0],
+            sender=self.world.owner,
+            content="Benchmark message",
+        )
+
+    def upload(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        return SimpleUploadedFile(f"photo{self.next()}.png", PNG, "image/png")
+
+
+def _routes():
+    def ws(path=""):
+        return lambda ctx: (f"/api/v1/workspaces/{ctx.w}/{path}", None)
+
+    def complaints(path=""):
+        return f"/api/v1/complaints/workspaces/{{w}}/complaints/{path}"
+
+    def messages(ctx, pk=""):
+        base = complaints(f"{ctx.world.complaint_ids[0]}/messages/").format(w=ctx.w)
+        return f"{base}{pk}/" if pk else base
+
+    def upload(ctx):
+        return {
+            "file": ctx.upload(),
+            "modelName": "complaints.complaint",
+            "objectId": str(ctx.world.complaint_ids[0]),
+        }
+
+    def presign(ctx):
+        return {
+            "modelName": "complaints.complaint",
+            "objectIds": ctx.world.complaint_ids[:50],
+        }
+
+    def download(ctx):
+        from media.storage import get_storage
+
+        storage = get_storage()
+        key = "benchmark/download.png"
+        storage.upload(key, io.BytesIO(PNG))
+        url = urlsplit(storage.url(key))
+        return url.path, None
+
+    return [
+        # users
+        Route("users.list", "GET", lambda ctx: ("/api/v1/users/", None)),
+        Route(
+            "users.create",
+            "POST",
+            lambda ctx: ("/api/v1/users/", {"users": [_new_user_data(ctx)]}),
+            expect=201,
+        ),
+        Route(
+            "users.bulk_update",
+            "PATCH",
+            lambda ctx: (
+                "/api/v1/users/",
+                [{"id": ctx.world.resident.pk, "first_name": "Bulk"}],
+            ),
+        ),
+        Route(
+            "users.bulk_delete",
+            "DELETE",
+            lambda ctx: ("/api/v1/users/", {"ids": [ctx.user().pk]}),
+            expect=204,
+        ),
+        Route(
+            "users.retrieve",
+            "GET",
+            lambda ctx: (f"/api/v1/users/{ctx.world.resident.email}/", None),
+        ),
+        Route(
+            "users.update",
+            "PATCH",
+            lambda ctx: (
+                f"/api/v1/users/{ctx.world.resident.email}/",
+                {"first_name": "Patched"},
+            ),
+        ),
+        Route(
+            "users.delete",
+            "DELETE",
+            lambda ctx: (f"/api/v1/users/{ctx.user().email}/", None),
+            expect=204,
+        ),
+        Route(
+            "users.profile_upload",
+            "POST",
+            lambda ctx: (
+                "/api/v1/users/profile/",
+                {
+                    "file": ctx.upload(),
+                    "modelName": "users.user",
+                    "objectId": str(ctx.world.owner.pk),
+                    "isProfile": "true",
+                },
+            ),
+            expect=201,
+            format="multipart",
+        ),
+        Route("me", "GET", lambda ctx: ("/api/me/", None)),
+        Route(
+            "bootstrap",
+            "GET",
+            lambda ctx: ("/api/v1/bootstrap/", None),
+            # Measure the assembly, not the per-user cache.
+            settings={"BOOTSTRAP_CACHE_SECONDS": 0},
+        ),
+        # workspaces
+        Route("workspaces.list", "GET", lambda ctx: ("/api/v1/workspaces/list/", None)),
+        Route(
+            "workspaces.create",
+            "POST",
+            lambda ctx: (
+                "/api/v1/workspaces/list/",
+                {"name": f"Created {ctx.next()}", "address": "2 Side St"},
+            ),
+            expect=201,
+        ),
+        Route("workspaces.retrieve", "GET", ws()),
+        Route(
+            "workspaces.update",
+            "PATCH",
+            lambda ctx: (f"/api/v1/workspaces/{ctx.w}/", {"contact_phone": "555"}),
+        ),
+        Route(
+            "workspaces.delete",
+            "DELETE",
+            lambda ctx: (f"/api/v1/workspaces/{ctx.workspace().pk}/", None),
+            expect=204,
+        ),
+        Route("workspaces.dashboard", "GET", ws("dashboard/")),
+        Route("workspaces.members.list", "GET", ws("users/")),
+        Route(
+            "workspaces.members.create",
+            "POST",
+            lambda ctx: (
+                f"/api/v1/workspaces/{ctx.w}/users/",
+                {"user": ctx.user().pk, "workspace": ctx.w, "role": "resident"},
+            ),
+            expect=201,
+        ),
+        Route(
+            "workspaces.members.retrieve",
+            "GET",
+            lambda ctx: (
+                f"/api/v1/workspaces/{ctx.w}/users/{ctx.world.membership_ids[1]}/",
+                None,
+            ),
+        ),
+        Route(
+            "workspaces.members.update",
+            "PATCH",
+            lambda ctx: (
+                f"/api/v1/workspaces/{ctx.w}/users/{ctx.world.membership_ids[2]}/",
+                {"role": "resident"},
+            ),
+        ),
+        Route(
+            "workspaces.members.delete",
+            "DELETE",
+            lambda ctx: (f"/api/v1/workspaces/{ctx.w}/users/{ctx.member().pk}/", None),
+            expect=204,
+        ),
+        Route("workspaces.units.list", "GET", ws("units/")),
+        Route(
+            "workspaces.units.create",
+            "POST",
+            lambda ctx: (
+                f"/api/v1/workspaces/{ctx.w}/units/",
+                {
+                    "unit_number": f"N{ctx.next()}",
+                    "rent_amount": "1200.00",
+                    "workspace": ctx.w,
+                },
+            ),
+            expect=201,
+        ),
+        Route(
+            "workspaces.units.retrieve",
+            "GET",
+            lambda ctx: (
+                f"/api/v1/workspaces/{ctx.w}/units/{ctx.world.unit_ids[0]}/",
+                None,
+            ),
+        ),
+        Route(
+            "workspaces.units.update",
+            "PATCH",
+            lambda ctx: (
+                f"/api/v1/workspaces/{ctx.w}/units/{ctx.world.unit_ids[0]}/",
+                {"rent_amount": "1500.00"},
+            ),
+        ),
+        Route(
+            "workspaces.units.delete",
+            "DELETE",
+            lambda ctx: (f"/api/v1/workspaces/{ctx.w}/units/{ctx.unit().pk}/", None),
+            expect=204,
+        ),
+        Route("workspaces.units.export", "GET", ws("units/export/")),
+        Route(
+            "workspaces.leases.expiring",
+            "GET",
+            lambda ctx: (f"/api/v1/workspaces/{ctx.w}/leases/expiring/?days=30", None),
+        ),
+        Route(
+            "workspaces.residents.list",
+            "GET",
+            lambda ctx: (
+                f"/api/v1/workspaces/{ctx.w}/units/{ctx.world.unit_ids[0]}/users/",
+                None,
+            ),
+        ),
+        Route(
+            "workspaces.residents.create",
+            "POST",
+            lambda ctx: _new_resident(ctx),
+            expect=201,
+        ),
+        Route(
+            "workspaces.residents.delete",
+            "DELETE",
+            lambda ctx: _resident_to_delete(ctx),
+            expect=204,
+        ),
+        # complaints
+        Route(
+            "complaints.list",
+            "GET",
+            lambda ctx: (complaints().format(w=ctx.w), None),
+        ),
+        Route(
+            "complaints.create",
+            "POST",
+            lambda ctx: (
+                complaints().format(w=ctx.w),
+                {
+                    "title": "Leaking pipe",
+                    "description": "Water under the sink.",
+                    "category": "maintenance",
+                    "user": ctx.world.owner.pk,
+                    "workspace": ctx.w,
+                },
+            ),
+            expect=201,
+        ),
+        Route(
+            "complaints.stats",
+            "GET",
+            lambda ctx: (complaints("stats/").format(w=ctx.w), None),
+        ),
+        Route(
+            "complaints.search",
+            "GET",
+            lambda ctx: (complaints("search/?q=water+leak").format(w=ctx.w), None),
+        ),
+        Route(
+            "complaints.retrieve",
+            "GET",
+            lambda ctx: (
+                complaints(f"{ctx.world.complaint_ids[0]}/").format(w=ctx.w),
+                None,
+            ),
+        ),
+        Route(
+            "complaints.update",
+            "PUT",
+            lambda ctx: (
+                complaints(f"{ctx.world.complaint_ids[0]}/").format(w=ctx.w),
+                {
+                    "title": "Leaking pipe",
+                    "description": "Water under the sink, still.",
+                    "category": "maintenance",
+                    "status": "in_progress",
+                    "user": ctx.world.owner.pk,
+                    "workspace": ctx.w,
+                },
+            ),
+        ),
+        Route(
+            "complaints.partial_update",
+            "PATCH",
+            lambda ctx: (
+                complaints(f"{ctx.world.complaint_ids[0]}/").format(w=ctx.w),
+                # ComplaintSerializer.validate reads user and workspace.
+                {"status": "open", "user": ctx.world.owner.pk, "workspace": ctx.w},
+            ),
+        ),
+        Route(
+            "complaints.delete",
+            "DELETE",
+            lambda ctx: (complaints(f"{ctx.complaint().pk}/").format(w=ctx.w), None),
+            expect=204,
+        ),
+        Route(
+            "complaints.resolve",
+            "POST",
+            lambda ctx: (
+                complaints(f"{ctx.complaint().pk}/resolve/").format(w=ctx.w),
+                None,
+            ),
+        ),
+        Route("complaints.messages.list", "GET", lambda ctx: (messages(ctx), None)),
+        Route(
+            "complaints.messages.create",
+            "POST",
+            lambda ctx: (
+                messages(ctx),
+                {"content": "On it.", "complaint": ctx.world.complaint_ids[0]},
+            ),
+            expect=201,
+        ),
+        Route(
+            "complaints.messages.retrieve",
+            "GET",
+            lambda ctx: (messages(ctx, ctx.world.complaint_message_ids[0]), None),
+        ),
+        Route(
+            "complaints.messages.update",
+            "PUT",
+            lambda ctx: (
+                messages(ctx, ctx.world.complaint_message_ids[1]),
+                {"content": "Edited.", "complaint": ctx.world.complaint_ids[0]},
+            ),
+        ),
+        Route(
+            "complaints.messages.partial_update",
+            "PATCH",
+            lambda ctx: (
+                messages(ctx, ctx.world.complaint_message_ids[1]),
+                {"content": "Edited again."},
+            ),
+        ),
+        Route(
+            "complaints.messages.delete",
+            "DELETE",
+            lambda ctx: (messages(ctx, ctx.complaint_message().pk), None),
+            expect=204,
+        ),
+        # chat
+        Route(
+            "chat.conversations.list",
+            "GET",
+            lambda ctx: ("/api/v1/chat/conversations/", None),
+        ),
+        Route(
+            "chat.conversations.by_recipient",
+            "GET",
+            lambda ctx: (
+                f"/api/v1/chat/conversations/recipient/{ctx.world.resident.pk}/",
+                None,
+            ),
+        ),
+        Route(
+            "chat.conversations.retrieve",
+            "GET",
+            lambda ctx: (
+                f"/api/v1/chat/conversations/{ctx.world.conversation_ids[0]}/",
+                None,
+            ),
+        ),
+        Route(
+            "chat.conversations.delete",
+            "DELETE",
+            lambda ctx: (f"/api/v1/chat/conversations/{ctx.conversation().pk}/", None),
+            expect=204,
+        ),
+        Route(
+            "chat.messages.list", "GET", lambda ctx: ("/api/v1/chat/messages/", None)
+        ),
+        Route(
+            "chat.messages.create",
+            "POST",
+            lambda ctx: (
+                "/api/v1/chat/messages/",
+                {"conversation": ctx.world.conversation_ids[0], "content": "Hi"},
+            ),
+            expect=201,
+        ),
+        Route(
+            "chat.messages.retrieve",
+            "GET",
+            lambda ctx: (
+                f"/api/v1/chat/messages/{ctx.world.chat_message_ids[1]}/",
+                None,
+            ),
+        ),
+        Route(
+            "chat.messages.update",
+            "PUT",
+            lambda ctx: (
+                f"/api/v1/chat/messages/{ctx.world.chat_message_ids[1]}/",
+                {"content": "Edited", "conversation": ctx.world.conversation_ids[0]},
+            ),
+        ),
+        Route(
+            "chat.messages.partial_update",
+            "PATCH",
+            lambda ctx: (
+                f"/api/v1/chat/messages/{ctx.world.chat_message_ids[1]}/",
+                {"content": "Edited again"},
+            ),
+        ),
+        Route(
+            "chat.messages.delete",
+            "DELETE",
+            lambda ctx: (f"/api/v1/chat/messages/{ctx.chat_message().pk}/", None),
+            expect=204,
+        ),
+        # media
+        Route(
+            "media.upload",
+            "POST",
+            lambda ctx: ("/api/v1/upload/", upload(ctx)),
+            expect=201,
+            format="multipart",
+        ),
+        Route(
+            "media.presign",
+            "POST",
+            lambda ctx: ("/api/v1/upload/presigned-urls/", presign(ctx)),
+        ),
+        Route(
+            "media.async.upload",
+            "POST",
+            lambda ctx: ("/api/v1/upload/async/", upload(ctx)),
+            expect=201,
+            format="multipart",
+        ),
+        Route(
+            "media.async.presign",
+            "POST",
+            lambda ctx: ("/api/v1/upload/async/presigned-urls/", presign(ctx)),
+        ),
+        Route(
+            "media.download",
+            "GET",
+            download,
+            settings={"MEDIA_STORAGE_BACKEND": "local"},
+        ),
+    ]
+
+
+def _new_user_data(ctx):
+    n = ctx.next()
+    return {
+        "username": f"created{n}",
+        "email": f"created{n}@example.com",
+        "password": "benchmark-password",
+    }
+
+
+def _new_resident(ctx):
+    unit_id = ctx.unit().pk
+    return (
+        f"/api/v1/workspaces/{ctx.w}/units/{unit_id}/users/",
+        {"user": ctx.member().user_id, "unit": unit_id},
+    )
+
+
+def _resident_to_delete(ctx):
+    from workspaces.models import UserApartment
+
+    unit = ctx.unit()
+    user = ctx.user()
+    UserApartment.objects.create(user=user, unit=unit)
+    return (
+        f"/api/v1/workspaces/{ctx.w}/units/{unit.pk}/users/",
+        {"unit": unit.pk, "user": user.pk},
+    )
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def _request(client, route, ctx):
+    path, data = route.prepare(ctx)
+    send = getattr(client, route.method.lower())
+    start = time.perf_counter()
+    response = send(path, data, format=route.format)
+    body = b"".join(response) if response.streaming else response.content
+    return time.perf_counter() - start, path, response.status_code, len(body)
+
+
+def _measure(client, route, ctx, repeat):
+    from django.db import connection
+
+    from backend.metrics import RequestMetrics
+    from media.storage import get_storage
+
+    _request(client, route, ctx)  # warm-up
+
+    storage = get_storage()
+    calls = getattr(storage, "client", None)
+    calls = getattr(calls, "calls", None)
+    before = sum(calls.values()) if calls is not None else 0
+    # Count through execute_wrapper, like MetricsMiddleware: the debug query
+    # log is capped and may already be full after seeding.
+    metrics = RequestMetrics()
+    with connection.execute_wrapper(metrics.record_sql):
+        _, path, status_code, size = _request(client, route, ctx)
+    s3_calls = (sum(calls.values()) - before) if calls is not None else 0
+
+    timings = []
+    for _ in range(repeat):
+        elapsed = _request(client, route, ctx)[0]
+        timings.append(elapsed)
+
+    return _route_pattern(path), {
+        "method": route.method,
+        "status": status_code,
+        "ok": status_code == route.expect,
+        "queries": metrics.sql_count,
+        "s3_calls": s3_calls,
+        "bytes": size,
+        "latency_ms": {
+            "min": round(min(timings) * 1000, 3),
+            "p50": round(statistics.median(timings) * 1000, 3),
+            "p95": round(_percentile(timings, 0.95) * 1000, 3),
+            "mean": round(statistics.fmean(timings) * 1000, 3),
+        },
+        "throughput_rps": round(len(timings) / sum(timings), 1),
+    }
+
+
+def _url_patterns():
+    """(route pattern, method) for every endpoint of the benchmarked apps."""
+    from django.urls import URLResolver, get_resolver
+
+    found = set()
+    for entry in get_resolver().url_patterns:
+        if not isinstance(entry, URLResolver):
+            if str(entry.pattern) == "api/me/":
+                found.add(("api/me/", "GET"))
+            continue
+        module = getattr(entry.urlconf_module, "__name__", "")
+        if module.split(".")[0] not in APPS:
+            continue
+        for pattern in entry.url_patterns:
+            route = str(entry.pattern) + str(pattern.pattern)
+            actions = getattr(pattern.callback, "actions", None)
+            if actions:
+                methods = actions
+            elif pattern.name == "media_download":
+                methods = ("get",)
+            else:
+                methods = ("post",)
+            # as_view() maps HEAD onto GET by itself; it is not a route of its own.
+            found.update(
+                (route, method.upper()) for method in methods if method != "head"
+            )
+    return found
+
+
+def _route_pattern(path):
+    from django.urls import resolve
+
+    return resolve(urlsplit(path).path).route
+
+
+def _run_scale(scale_name, args):
+    from django.conf import settings as django_settings
+    from django.core.management import call_command
+    from django.test.utils import override_settings
+    from rest_framework.test import APIClient
+
+    from benchmarks.world import SCALES, build_world
+    from media.storage import get_storage
+    from users.serializers import CustomTokenObtainPairSerializer
+
+    call_command("flush", interactive=False, verbosity=0)
+    world = build_world(SCALES[scale_name], seed=args.seed)
+    ctx = Context(world)
+    client = APIClient(raise_request_exception=False)
+    token = CustomTokenObtainPairSerializer.get_token(world.owner).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    results = {}
+    covered = set()
+    with tempfile.TemporaryDirectory(prefix="bench-media-") as media_root:
+        for route in _routes():
+            if args.only and not any(route.name.startswith(p) for p in args.only):
+                continue
+            overrides = {
+                "MEDIA_ROOT": media_root,
+                "MEDIA_STORAGE_BACKEND": django_settings.MEDIA_STORAGE_BACKEND,
+                **route.settings,
+            }
+            with override_settings(**overrides):
+                get_storage.cache_clear()
+                pattern, result = _measure(client, route, ctx, args.repeat)
+            get_storage.cache_clear()
+            results[route.name] = result
+            covered.add((pattern, route.method))
+            print(
+                f"  {route.name:<36} {result['status']:>4} {result['queries']:>5}q "
+                f"{result['latency_ms']['p50']:>9.2f}ms"
+            )
+
+    return {
+        "world": world.counts,
+        "routes": results,
+        "uncovered": sorted(
+            f"{method} {pattern}" for pattern, method in _url_patterns() - covered
+        ),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base, current):
+    """Print query-count and median latency changes between two reports."""
+    for scale, data in sorted(current["scales"].items()):
+        base_routes = base.get("scales", {}).get(scale, {}).get("routes", {})
+        print(f"[{scale}]")
+        for name, result in sorted(data["routes"].items()):
+            before = base_routes.get(name)
+            if before is None:
+                print(f"  {name:<36} new")
+                continue
+            query_delta = result["queries"] - before["queries"]
+            p50, old_p50 = result["latency_ms"]["p50"], before["latency_ms"]["p50"]
+            change = (p50 - old_p50) / old_p50 * 100 if old_p50 else 0.0
+            flag = " QUERIES" if query_delta else ""
+            print(
+                f"  {name:<36} {before['queries']:>5}q -> {result['queries']:>5}q"
+                f"  p50 {old_p50:>9.2f} -> {p50:>9.2f}ms ({change:+6.1f}%){flag}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scale", action="append", choices=("small", "medium", "large")
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only", action="append", help="Route name prefix (repeatable)."
+    )
+    parser.add_argument("--output", help="Write the JSON report here.")
+    parser.add_argument("--compare", help="Earlier JSON report to diff against.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import (
+        override_settings,
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "scales": {},
+    }
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        with override_settings(
+            DEBUG=False,
+            ALLOWED_HOSTS=["testserver"],
+            MEDIA_STORAGE_BACKEND="benchmarks.fakes.FakeS3Storage",
+        ):
+            for scale_name in args.scale or ["small"]:
+                print(f"[{scale_name}]")
+                report["scales"][scale_name] = _run_scale(scale_name, args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    failed = [
+        f"{scale}: {name} ({result['status']})"
+        for scale, data in report["scales"].items()
+        for name, result in data["routes"].items()
+        if not result["ok"]
+    ]
+    if failed:
+        print("Unexpected status codes:\n  " + "\n  ".join(failed))
+
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text)
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(json.load(handle), report)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
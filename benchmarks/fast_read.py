@@ -0,0 +1,146 @@
+# benchmarks/fast_read.py
+"""
+Compare ModelSerializer output with the values()-based ValuesReader on the
+list endpoints that use it (user workspaces, apartment units, chat messages).
+
+    python -m benchmarks.fast_read [--rows 20000] [--repeat 5]
+
+Rows are seeded into a throwaway test database (created and destroyed like
+``manage.py test`` does), so the configured database is never touched. All
+paths include the query and JSON rendering, and their output is checked to
+be byte-identical before timing. "serializer" is the queryset as the views
+ran it (one query per related row); "+select_related" isolates the CPU cost
+of the serializer itself.
+"""
+
+import argparse
+import os
+import time
+
+
+def _best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _seed(rows):
+    from chat.models import ChatMessage, Conversation
+    from users.models import User
+    from workspaces.models import ApartmentUnit, UserWorkspace, Workspace
+
+    users = User.objects.bulk_create(
+        User(username=f"bench{i}", email=f"bench{i}@example.com", password="!")
+        for i in range(rows)
+    )
+    workspace = Workspace.objects.create(
+        name="Benchmark Towers", address="1 Main St", owner=users[0]
+    )
+    UserWorkspace.objects.bulk_create(
+        UserWorkspace(user=user, workspace=workspace, role="resident") for user in users
+    )
+    ApartmentUnit.objects.bulk_create(
+        ApartmentUnit(
+            workspace=workspace,
+            unit_number=str(i),
+            rent_amount=1000 + i % 500,
+            number_of_bedrooms=1 + i % 3,
+            number_of_bathrooms=1.5,
+        )
+        for i in range(rows)
+    )
+    conversation = Conversation.objects.create(user1=users[0], user2=users[1])
+    ChatMessage.objects.bulk_create(
+        ChatMessage(
+            conversation=conversation,
+            sender=users[i % 2],
+            content=f"Message number {i}",
+        )
+        for i in range(rows)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from backend.fast_read import ValuesReader
+    from backend.renderers import ORJSONRenderer
+    from chat.models import ChatMessage
+    from chat.serializers import MessageSerializer
+    from workspaces.models import ApartmentUnit, UserWorkspace
+    from workspaces.serializers import ApartmentUnitSerializer, UserWorkspaceSerializer
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        _seed(args.rows)
+        context = {"request": Request(APIRequestFactory().get("/"))}
+        renderer = ORJSONRenderer()
+        cases = (
+            (
+                "user_workspaces",
+                UserWorkspaceSerializer,
+                UserWorkspace.objects.all(),
+                ("user", "workspace"),
+            ),
+            (
+                "apartment_units",
+                ApartmentUnitSerializer,
+                ApartmentUnit.objects.all(),
+                ("workspace",),
+            ),
+            (
+                "chat_messages",
+                MessageSerializer,
+                ChatMessage.objects.all(),
+                ("sender", "conversation", "reply_to"),
+            ),
+        )
+
+        header = (
+            f"{'endpoint':<16} {'rows':>7} {'serializer':>11} "
+            f"{'+select_related':>16} {'values()':>9} {'x':>6} {'x':>6}"
+        )
+        print(header)
+        print("-" * len(header))
+        for name, serializer_class, queryset, related in cases:
+
+            def serialize(qs):
+                serializer = serializer_class(qs, many=True, context=context)
+                return renderer.render(serializer.data)
+
+            def fast():
+                reader = ValuesReader(serializer_class(context=context))
+                return renderer.render(reader.read(queryset.all()))
+
+            assert serialize(queryset.all()) == fast(), f"{name}: output differs"
+            slow_time = _best_of(lambda: serialize(queryset.all()), args.repeat)
+            joined_time = _best_of(
+                lambda: serialize(queryset.select_related(*related)), args.repeat
+            )
+            fast_time = _best_of(fast, args.repeat)
+            print(
+                f"{name:<16} {args.rows:>7} {slow_time * 1000:>9.1f}ms "
+                f"{joined_time * 1000:>14.1f}ms {fast_time * 1000:>7.1f}ms "
+                f"{slow_time / fast_time:>5.1f}x {joined_time / fast_time:>5.1f}x"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
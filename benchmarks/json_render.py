@@ -0,0 +1,138 @@
+# benchmarks/json_render.py
+"""
+Compare DRF's JSONRenderer/JSONParser with the orjson-backed replacements on
+payloads shaped like our largest list responses.
+
+    python -m benchmarks.json_render [--rows 50000] [--repeat 5]
+
+No database is needed: rows are generated in memory, both as serializer
+output (strings everywhere) and as raw ``.values()`` rows carrying Decimal,
+UUID and datetime objects. Every payload is also checked to render to the
+same bytes with both renderers.
+"""
+
+import argparse
+import datetime
+import decimal
+import io
+import os
+import time
+import uuid
+
+
+def _users(rows):
+    now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            "id": i,
+            "custom_id": str(uuid.UUID(int=i)),
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "role": "resident",
+            "phone": "+15550100",
+            "date_joined": (now + datetime.timedelta(seconds=i)).isoformat(),
+            "profile_image_url": f"https://bucket.s3.amazonaws.com/u/{i}.png?X-Amz=...",
+        }
+        for i in range(rows)
+    ]
+
+
+def _complaints(rows):
+    now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"Leaking pipe in unit {i % 400}",
+            "category": "maintenance",
+            "description": "Water is dripping from the ceiling. " * 4,
+            "status": "open",
+            "user": i % 1000,
+            "workspace": 1,
+            "unit": i % 400,
+            "created_at": (now + datetime.timedelta(minutes=i)).isoformat(),
+            "updated_at": (now + datetime.timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(rows)
+    ]
+
+
+def _unit_values(rows):
+    """Raw values() rows, as returned by the dashboard/lease endpoints."""
+    now = datetime.datetime(
+        2025, 1, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    )
+    return [
+        {
+            "id": i,
+            "unit_number": str(i),
+            "rent_amount": decimal.Decimal("1250.50") + i,
+            "lease_end_date": datetime.date(2025, 1, 1)
+            + datetime.timedelta(days=i % 365),
+            "user__custom_id": uuid.UUID(int=i),
+            "updated_at": now + datetime.timedelta(seconds=i),
+        }
+        for i in range(rows)
+    ]
+
+
+PAYLOADS = {
+    "users": _users,
+    "complaints": _complaints,
+    "unit_values": _unit_values,
+}
+
+
+def _best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    import django
+
+    django.setup()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from backend.parsers import ORJSONParser
+    from backend.renderers import ORJSONRenderer
+
+    drf_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+    drf_parser, fast_parser = JSONParser(), ORJSONParser()
+
+    header = f"{'payload':<12} {'rows':>7} {'bytes':>11} {'encode drf':>11} {'orjson':>9} {'x':>6} {'decode drf':>11} {'orjson':>9} {'x':>6}"
+    print(header)
+    print("-" * len(header))
+    for name, build in PAYLOADS.items():
+        data = build(args.rows)
+        body = drf_renderer.render(data)
+        assert fast_renderer.render(data) == body, f"{name}: output differs"
+
+        encode_drf = _best_of(lambda: drf_renderer.render(data), args.repeat)
+        encode_fast = _best_of(lambda: fast_renderer.render(data), args.repeat)
+        decode_drf = _best_of(lambda: drf_parser.parse(io.BytesIO(body)), args.repeat)
+        decode_fast = _best_of(lambda: fast_parser.parse(io.BytesIO(body)), args.repeat)
+        print(
+            f"{name:<12} {args.rows:>7} {len(body):>11} "
+            f"{encode_drf * 1000:>9.1f}ms {encode_fast * 1000:>7.1f}ms "
+            f"{encode_drf / encode_fast:>5.1f}x "
+            f"{decode_drf * 1000:>9.1f}ms {decode_fast * 1000:>7.1f}ms "
+            f"{decode_drf / decode_fast:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# benchmarks/world.py
+"""
+Deterministic synthetic dataset for the benchmarks.
+
+``build_world(scale)`` seeds workspaces, members, units, residents,
+complaints with messages and chat conversations with backend.synthetic's
+generator (the one behind ``manage.py generate_synthetic_data``), with
+evenly sized workspaces. It then adds what the benchmark routes point at in
+the first workspace: a staff owner, a complaint thread and a conversation
+between the owner and a resident, and one document per complaint. Ids are
+read back from the database, so nothing depends on bulk_create returning
+primary keys.
+"""
+
+from dataclasses import dataclass, field
+
+from django.db.models import Q
+from django.utils import timezone
+
+from backend.synthetic import Generator, SyntheticConfig
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Per-workspace sizes are averages; members are assigned at random."""
+
+    workspaces: int
+    units_per_workspace: int
+    members_per_workspace: int
+    complaints_per_workspace: int
+    messages_per_complaint: int
+    conversations: int
+    messages_per_conversation: int
+
+
+SCALES = {
+    "small": Scale(2, 20, 20, 20, 3, 5, 20),
+    "medium": Scale(5, 200, 200, 200, 5, 20, 50),
+    "large": Scale(10, 1000, 1000, 1000, 5, 50, 200),
+}
+
+
+@dataclass
+class World:
+    """Ids of the seeded rows the benchmark routes point at."""
+
+    scale: Scale
+    owner: object = None
+    resident: object = None
+    workspace_ids: list = field(default_factory=list)
+    unit_ids: list = field(default_factory=list)
+    membership_ids: list = field(default_factory=list)
+    complaint_ids: list = field(default_factory=list)
+    complaint_message_ids: list = field(default_factory=list)
+    conversation_ids: list = field(default_factory=list)
+    chat_message_ids: list = field(default_factory=list)
+    counts: dict = field(default_factory=dict)
+
+    @property
+    def workspace_id(self):
+        return self.workspace_ids[0]
+
+
+def build_world(scale, seed=0):
+    from chat.models import ChatMessage, Conversation
+    from complaints.models import Complaint, ComplaintMessage
+    from django.contrib.contenttypes.models import ContentType
+    from media.models import Document
+    from users.models import User
+    from workspaces.models import (
+        ApartmentUnit,
+        UserApartment,
+        UserWorkspace,
+        Workspace,
+    )
+
+    generator = Generator(
+        SyntheticConfig(
+            users=scale.workspaces * (scale.members_per_workspace + 1),
+            workspaces=scale.workspaces,
+            units_per_member=scale.units_per_workspace / scale.members_per_workspace,
+            complaints=scale.workspaces * scale.complaints_per_workspace,
+            messages_per_complaint=scale.messages_per_complaint,
+            conversations=scale.conversations,
+            chat_messages=scale.conversations * scale.messages_per_conversation,
+            skew=0,
+            seed=seed,
+            prefix="member",
+        ),
+        log=lambda message: None,
+    )
+    generator.run()
+
+    world = World(scale=scale, workspace_ids=generator.workspace_ids)
+    w = world.workspace_id
+    User.objects.filter(pk=generator.owner_ids[0]).update(is_staff=True)
+    owner = world.owner = User.objects.get(pk=generator.owner_ids[0])
+
+    # A resident the generator gave no conversation with the owner, so the
+    # thread below is the only one between them.
+    partners = {
+        user1_id if user2_id == owner.pk else user2_id
+        for _, user1_id, user2_id in generator.conversations
+        if owner.pk in (user1_id, user2_id)
+    }
+    world.resident = User.objects.get(
+        pk=UserWorkspace.objects.filter(workspace_id=w, role="resident")
+        .exclude(user_id__in=partners)
+        .order_by("pk")
+        .values_list("user_id", flat=True)
+        .first()
+    )
+
+    world.membership_ids = list(
+        UserWorkspace.objects.filter(workspace_id=w)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    world.unit_ids = list(
+        ApartmentUnit.objects.filter(workspace_id=w)
+        .order_by("unit_number")
+        .values_list("pk", flat=True)
+    )
+
+    # One complaint and one conversation of the owner's, where every other
+    # message is the owner's own. create() keeps the derived tables current.
+    complaint = Complaint.objects.create(
+        workspace_id=w,
+        user=owner,
+        unit_id=world.unit_ids[0],
+        title="Elevator stuck again",
+        description="Stuck between floors 3 and 4 since this morning.",
+        category="maintenance",
+    )
+    for m in range(max(2, scale.messages_per_complaint)):
+        ComplaintMessage.objects.create(
+            complaint=complaint,
+            sender=owner if m % 2 else world.resident,
+            content="Any update on this?" if m % 2 == 0 else "Technician booked.",
+        )
+    world.complaint_ids = [complaint.pk] + list(
+        Complaint.objects.filter(workspace_id=w)
+        .exclude(pk=complaint.pk)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    world.complaint_message_ids = list(
+        ComplaintMessage.objects.filter(complaint=complaint)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    conversation = Conversation.objects.create(
+        user1=owner, user2=world.resident, last_message_at=timezone.now()
+    )
+    for m in range(max(2, scale.messages_per_conversation)):
+        ChatMessage.objects.create(
+            conversation=conversation,
+            sender=owner if m % 2 else world.resident,
+            content="Is the parking garage open?" if m % 2 == 0 else "Yes.",
+        )
+    world.conversation_ids = [conversation.pk] + list(
+        Conversation.objects.filter(Q(user1=owner) | Q(user2=owner))
+        .exclude(pk=conversation.pk)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    world.chat_message_ids = list(
+        ChatMessage.objects.filter(conversation=conversation)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    # One photo per complaint in the focus workspace, for the presign routes.
+    complaint_type = ContentType.objects.get_for_model(Complaint)
+    Document.objects.bulk_create(
+        Document(
+            object_type=complaint_type,
+            object_id=complaint_id,
+            s3_key=f"complaint/{complaint_id}/photo.jpg",
+            file_name="photo.jpg",
+            uploaded_by=owner,
+        )
+        for complaint_id in world.complaint_ids
+    )
+
+    world.counts = {
+        model.__name__: model.objects.count()
+        for model in (
+            User,
+            Workspace,
+            UserWorkspace,
+            ApartmentUnit,
+            UserApartment,
+            Complaint,
+            ComplaintMessage,
+            Conversation,
+            ChatMessage,
+            Document,
+        )
+    }
+    return world
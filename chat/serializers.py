@@ -3,22 +3,26 @@ from rest_framework import serializers
 from .models import ChatMessage, Conversation
 from django.contrib.auth import get_user_model
 from media.serializers import DocumentSerializer
+from backend.serializers import SparseFieldsetMixin, TracedListSerializer
 
 User = get_user_model()
 
-class ConversationSerializer(serializers.ModelSerializer):
+class ConversationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user1_username = serializers.CharField(source='user1.username', read_only=True)
     user2_username = serializers.CharField(source='user2.username', read_only=True)
     user1_custom_id = serializers.CharField(source='user1.custom_id', read_only=True)
     user2_custom_id = serializers.CharField(source='user2.custom_id', read_only=True)
+    # Annotated by backend/bootstrap.py, left out elsewhere
+    unread_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Conversation
         fields = '__all__'
         read_only_fields = ('created_at', 'last_message_at')
+        list_serializer_class = TracedListSerializer
 
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     sender_username = serializers.CharField(source='sender.username', read_only=True)
     sender_custom_id = serializers.CharField(source='sender.custom_id', read_only=True)
     conversation_id = serializers.IntegerField(source='conversation.id', read_only=True)
@@ -31,4 +35,5 @@ class MessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ChatMessage
         fields = '__all__'
-        read_only_fields = ('timestamp', 'is_edited', 'edited_at')
\ No newline at end of file
+        read_only_fields = ('timestamp', 'is_edited', 'edited_at')
+        list_serializer_class = TracedListSerializer
\ No newline at end of file
@@ -1,3 +1,40 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from backend.testing import QueryCountMixin, make_user
+
+from .models import ChatMessage, Conversation
+
+
+class ChatListQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_conversations(self, n):
+        # A conversation with a different user each time, with a reply.
+        for _ in range(n):
+            other = make_user()
+            conversation = Conversation.objects.create(user1=self.user, user2=other)
+            first = ChatMessage.objects.create(
+                conversation=conversation, sender=other, content="Hi"
+            )
+            ChatMessage.objects.create(
+                conversation=conversation,
+                sender=self.user,
+                content="Hello",
+                reply_to=first,
+            )
+
+    def test_list_conversations(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get("/api/v1/chat/conversations/"),
+            self.add_conversations,
+        )
+
+    def test_list_messages(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get("/api/v1/chat/messages/"),
+            self.add_conversations,
+        )
@@ -13,6 +13,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from media.models import Document
+from backend.fast_read import ValuesListMixin
 
 User = get_user_model()
 
@@ -33,7 +34,11 @@ class ConversationViewSet(
         """
         user = self.request.user
         # Get conversations where the user is either user1 or user2
-        return Conversation.objects.filter(Q(user1=user) | Q(user2=user)).distinct()
+        return (
+            Conversation.objects.filter(Q(user1=user) | Q(user2=user))
+            .select_related("user1", "user2")
+            .distinct()
+        )
 
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
@@ -76,6 +81,7 @@ class ConversationViewSet(
 
 
 class MessageViewSet(
+    ValuesListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -117,7 +123,8 @@ class MessageViewSet(
         return queryset
 
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.list_data(queryset))
 
     def create(self, request, *args, **kwargs):
         # 1. Get the sender (current user) and recipient (from request data).
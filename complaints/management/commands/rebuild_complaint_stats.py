@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from complaints.stats import rebuild_complaint_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the ComplaintStat summary table from the Complaint table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workspace",
+            type=int,
+            action="append",
+            dest="workspace_ids",
+            help="Only rebuild this workspace (can be repeated).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Workspaces recomputed per transaction (default: 100).",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_complaint_stats(
+            workspace_ids=options["workspace_ids"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt complaint stats for {count} workspace(s).")
+        )
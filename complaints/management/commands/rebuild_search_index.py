@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from complaints.search import (
+    REBUILD_CHUNK_SIZE,
+    rebuild_search_index,
+    uses_full_text_search,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every complaint's full-text search document and drop "
+        "documents of deleted complaints (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=REBUILD_CHUNK_SIZE,
+            help=f"Complaint id range indexed per statement (default: {REBUILD_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        if not uses_full_text_search():
+            self.stdout.write("The search index is only kept on PostgreSQL.")
+            return
+        rebuild_search_index(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS("Rebuilt the complaint search index."))
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:06
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# A frozen copy of complaints.search at the time of this migration; the
+# live module may change, this backfill must not.
+CHUNK_SIZE = 1000
+UPSERT_SQL = """
+    INSERT INTO "ComplaintSearchIndex" ("complaint_id", "search_vector")
+    SELECT c."id",
+        setweight(to_tsvector('english', coalesce(c."title", '')), 'A')
+        || setweight(to_tsvector('english', coalesce(c."description", '')), 'B')
+        || setweight(to_tsvector('english', coalesce(string_agg(m."content", ' '), '')), 'C')
+    FROM "Complaint" c
+    LEFT JOIN "ComplaintMessage" m ON m."complaint_id" = c."id"
+    WHERE c."id" BETWEEN %s AND %s
+    GROUP BY c."id"
+    ON CONFLICT ("complaint_id")
+    DO UPDATE SET "search_vector" = EXCLUDED."search_vector"
+"""
+
+
+def build_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return  # the table only exists on PostgreSQL
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT min("id"), max("id") FROM "Complaint"')
+        first_id, last_id = cursor.fetchone()
+        if first_id is None:
+            return
+        for start in range(first_id, last_id + 1, CHUNK_SIZE):
+            cursor.execute(UPSERT_SQL, [start, start + CHUNK_SIZE - 1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplaintSearchIndex',
+            fields=[
+                ('complaint', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='complaints.complaint')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+            ],
+            options={
+                'db_table': 'ComplaintSearchIndex',
+                'required_db_vendor': 'postgresql',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='complaint_search_gin')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
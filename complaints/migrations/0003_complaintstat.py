@@ -0,0 +1,53 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+# A frozen copy of complaints.stats.rebuild_complaint_stats at the time of
+# this migration; the live module may change, this backfill must not. The
+# table was just created, so there is nothing to delete first.
+def build_complaint_stats(apps, schema_editor):
+    Complaint = apps.get_model("complaints", "Complaint")
+    ComplaintStat = apps.get_model("complaints", "ComplaintStat")
+    db_alias = schema_editor.connection.alias
+
+    counts = (
+        Complaint.objects.using(db_alias)
+        .annotate(day=TruncDate("created_at"))
+        .values("workspace_id", "status", "category", "day")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    ComplaintStat.objects.using(db_alias).bulk_create(
+        (ComplaintStat(**row) for row in counts.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0002_complaintsearchindex'),
+        ('workspaces', '0003_userapartment_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplaintStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], max_length=20)),
+                ('category', models.CharField(choices=[('maintenance', 'Maintenance'), ('security', 'Security'), ('neighbor', 'Neighbor Dispute'), ('noise', 'Noise Complaint'), ('other', 'Other')], max_length=20)),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='complaint_stats', to='workspaces.workspace')),
+            ],
+            options={
+                'db_table': 'ComplaintStat',
+                'unique_together': {('workspace', 'status', 'category', 'day')},
+            },
+        ),
+        migrations.RunPython(build_complaint_stats, migrations.RunPython.noop),
+    ]
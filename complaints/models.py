@@ -1,7 +1,13 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from workspaces.models import Workspace, ApartmentUnit
 from django.utils import timezone
+from .search import delete_search_index, update_search_index
 
 
 class Complaint(models.Model):
@@ -46,6 +52,19 @@ class Complaint(models.Model):
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
 
+    def save(self, *args, **kwargs):
+        original = None
+        if self.pk:
+            original = (
+                Complaint.objects.filter(pk=self.pk)
+                .values("workspace_id", "status", "category", "created_at")
+                .first()
+            )
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            ComplaintStat.record_change(original, self)
+        update_search_index(self.pk)
+
 
 class ComplaintMessage(models.Model):
     complaint = models.ForeignKey(
@@ -78,9 +97,119 @@ class ComplaintMessage(models.Model):
         )
 
     def save(self, *args, **kwargs):
+        content_changed = True
         if self.pk:
             original = ComplaintMessage.objects.get(pk=self.pk)
-            if original.content != self.content:
+            content_changed = original.content != self.content
+            if content_changed:
                 self.is_edited = True
                 self.edited_at = timezone.now()
         super().save(*args, **kwargs)
+        if content_changed:
+            update_search_index(self.complaint_id)
+
+    def delete(self, *args, **kwargs):
+        complaint_id = self.complaint_id
+        result = super().delete(*args, **kwargs)
+        update_search_index(complaint_id)
+        return result
+
+
+class ComplaintSearchIndex(models.Model):
+    """
+    PostgreSQL full-text search document for a complaint: title (weight A),
+    description (B) and the contents of its messages (C). Maintained by
+    complaints.search.update_search_index; only created on PostgreSQL.
+    """
+
+    # No FK constraint or ORM cascade: the table does not exist off
+    # PostgreSQL, so the deletion collector must never touch it. Complaint
+    # deletes, cascaded ones included, clean up in complaint_deleted.
+    complaint = models.OneToOneField(
+        Complaint,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name="search_index",
+    )
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        db_table = "ComplaintSearchIndex"
+        required_db_vendor = "postgresql"
+        indexes = [GinIndex(fields=["search_vector"], name="complaint_search_gin")]
+
+
+class ComplaintStat(models.Model):
+    """
+    Number of complaints per (workspace, status, category, day created),
+    kept current by Complaint.save and complaint_deleted with F() increments
+    so the owner dashboard never has to scan complaints. Recompute with
+    ``manage.py rebuild_complaint_stats``.
+    """
+
+    workspace = models.ForeignKey(
+        Workspace, on_delete=models.CASCADE, related_name="complaint_stats"
+    )
+    status = models.CharField(max_length=20, choices=Complaint.STATUS_CHOICES)
+    category = models.CharField(max_length=20, choices=Complaint.CATEGORY_CHOICES)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "ComplaintStat"
+        unique_together = ("workspace", "status", "category", "day")
+
+    def __str__(self):
+        return f"{self.workspace_id} {self.day} {self.status}/{self.category}: {self.count}"
+
+    @classmethod
+    def bump(cls, workspace_id, status, category, day, delta):
+        key = dict(workspace_id=workspace_id, status=status, category=category, day=day)
+        if cls.objects.filter(**key).update(count=F("count") + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(count=delta, **key)
+        except IntegrityError:
+            # Another transaction created the row first.
+            cls.objects.filter(**key).update(count=F("count") + delta)
+
+    @classmethod
+    def record_change(cls, original, complaint):
+        """Move one complaint between buckets; ``original`` is None on create."""
+        new_key = (
+            complaint.workspace_id,
+            complaint.status,
+            complaint.category,
+            timezone.localdate(complaint.created_at),
+        )
+        if original is not None:
+            old_key = (
+                original["workspace_id"],
+                original["status"],
+                original["category"],
+                timezone.localdate(original["created_at"]),
+            )
+            if old_key == new_key:
+                return
+            cls.bump(*old_key, -1)
+        cls.bump(*new_key, 1)
+
+
+@receiver(post_delete, sender=Complaint)
+def complaint_deleted(sender, instance, **kwargs):
+    """
+    Drop the search document and the stats count of a deleted complaint.
+    A receiver rather than Complaint.delete so that complaints removed by a
+    cascade (deleting their reporter or workspace) are counted too.
+    """
+    delete_search_index(instance.pk)
+    # Update only: when the workspace itself is being deleted its stats rows
+    # may already be gone, and there is nothing left to decrement.
+    ComplaintStat.objects.filter(
+        workspace_id=instance.workspace_id,
+        status=instance.status,
+        category=instance.category,
+        day=timezone.localdate(instance.created_at),
+    ).update(count=F("count") - 1)
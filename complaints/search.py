@@ -0,0 +1,121 @@
+# complaints/search.py
+"""
+Full-text search over complaints.
+
+On PostgreSQL each complaint has a ComplaintSearchIndex row holding a
+tsvector built from its title (weight A), description (B) and message
+contents (C). The row is refreshed whenever the complaint or one of its
+messages is saved and is queried through a GIN index. Other databases fall
+back to case-insensitive LIKE matching.
+"""
+from django.db import connection
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Q, Value, When
+
+SEARCH_CONFIG = "english"
+REBUILD_CHUNK_SIZE = 1000
+
+# One statement per refresh: rebuild the vector from the complaint row and
+# all of its messages, then upsert it.
+_UPSERT_SQL = """
+    INSERT INTO "ComplaintSearchIndex" ("complaint_id", "search_vector")
+    SELECT c."id",
+        setweight(to_tsvector(%(config)s::regconfig, coalesce(c."title", '')), 'A')
+        || setweight(to_tsvector(%(config)s::regconfig, coalesce(c."description", '')), 'B')
+        || setweight(to_tsvector(%(config)s::regconfig, coalesce(string_agg(m."content", ' '), '')), 'C')
+    FROM "Complaint" c
+    LEFT JOIN "ComplaintMessage" m ON m."complaint_id" = c."id"
+    WHERE c."id" BETWEEN %(first_id)s AND %(last_id)s
+    GROUP BY c."id"
+    ON CONFLICT ("complaint_id")
+    DO UPDATE SET "search_vector" = EXCLUDED."search_vector"
+"""
+
+
+def uses_full_text_search(using=None):
+    return (using or connection).vendor == "postgresql"
+
+
+def _upsert(cursor, first_id, last_id):
+    cursor.execute(
+        _UPSERT_SQL,
+        {"config": SEARCH_CONFIG, "first_id": first_id, "last_id": last_id},
+    )
+
+
+def update_search_index(complaint_id):
+    """Refresh the search document of one complaint (no-op off PostgreSQL)."""
+    if complaint_id is None or not uses_full_text_search():
+        return
+    with connection.cursor() as cursor:
+        _upsert(cursor, complaint_id, complaint_id)
+
+
+def delete_search_index(complaint_id):
+    """Drop the search document of a deleted complaint."""
+    if complaint_id is None or not uses_full_text_search():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM "ComplaintSearchIndex" WHERE "complaint_id" = %s',
+            [complaint_id],
+        )
+
+
+def rebuild_search_index(using=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Recompute every complaint's search document in id-range chunks and drop
+    documents left behind by deletes that bypassed the ORM. Run it with
+    ``manage.py rebuild_search_index``.
+    """
+    using = using or connection
+    if not uses_full_text_search(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM "ComplaintSearchIndex" WHERE "complaint_id" NOT IN '
+            '(SELECT "id" FROM "Complaint")'
+        )
+        cursor.execute('SELECT min("id"), max("id") FROM "Complaint"')
+        first_id, last_id = cursor.fetchone()
+        if first_id is None:
+            return
+        for start in range(first_id, last_id + 1, chunk_size):
+            _upsert(cursor, start, start + chunk_size - 1)
+
+
+def search_complaints(queryset, text):
+    """
+    Filter ``queryset`` (already scoped to what the caller may see) to
+    complaints matching ``text`` and order them by relevance, best first.
+    Adds a ``rank`` annotation.
+    """
+    if uses_full_text_search():
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.filter(search_index__search_vector=query)
+            .annotate(rank=SearchRank(F("search_index__search_vector"), query))
+            .order_by("-rank", "-created_at")
+        )
+
+    from .models import ComplaintMessage
+
+    rank = Value(0)
+    for term in text.split():
+        message_match = Exists(
+            ComplaintMessage.objects.filter(
+                complaint=OuterRef("pk"), content__icontains=term
+            )
+        )
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(description__icontains=term) | message_match
+        )
+        # Same weighting as the tsvector: title > description > messages.
+        rank = rank + Case(
+            When(title__icontains=term, then=Value(3)),
+            When(description__icontains=term, then=Value(2)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    return queryset.annotate(rank=rank).order_by("-rank", "-created_at")
@@ -1,4 +1,6 @@
 # complaints/serializers.py
+from collections import defaultdict
+
 from rest_framework import serializers
 from .models import Complaint, ComplaintMessage
 from django.contrib.auth import get_user_model
@@ -6,11 +8,12 @@ from django.contrib.contenttypes.models import ContentType
 from workspaces.models import Workspace, ApartmentUnit, UserWorkspace
 from media.helpers import S3Helper
 from media.models import Document
+from backend.serializers import SparseFieldsetMixin, TracedListSerializer
 
 User = get_user_model()
 
 
-class ComplaintSerializer(serializers.ModelSerializer):
+class ComplaintSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_custom_id = serializers.CharField(source="user.custom_id", read_only=True)
     workspace_name = serializers.CharField(source="workspace.name", read_only=True)
     unit_number = serializers.CharField(
@@ -36,6 +39,7 @@ class ComplaintSerializer(serializers.ModelSerializer):
         model = Complaint
         fields = "__all__"
         read_only_fields = ("created_at", "updated_at")
+        list_serializer_class = TracedListSerializer
 
     def validate(self, data):
         user = data["user"]
@@ -55,7 +59,25 @@ class ComplaintSerializer(serializers.ModelSerializer):
         return data
 
 
-class ComplaintMessageSerializer(serializers.ModelSerializer):
+class ComplaintMessageListSerializer(TracedListSerializer):
+    def to_representation(self, data):
+        # Look up the documents of the whole page in one query instead of
+        # one per message in get_presigned_url.
+        messages = list(data.all() if hasattr(data, "all") else data)
+        self.child.document_keys = defaultdict(list)
+        if self.child.wants_field("presigned_url"):
+            rows = Document.objects.filter(
+                object_type=ContentType.objects.get_for_model(ComplaintMessage),
+                object_id__in=[message.pk for message in messages],
+            ).values_list("object_id", "s3_key")
+            for object_id, s3_key in rows:
+                self.child.document_keys[object_id].append(s3_key)
+        return super().to_representation(messages)
+
+
+class ComplaintMessageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    document_keys = None  # object id -> s3 keys, set by the list serializer
+
     sender_custom_id = serializers.CharField(source="sender.custom_id", read_only=True)
     reply_to_content = serializers.CharField(
         source="reply_to.content", read_only=True, allow_null=True
@@ -73,14 +95,14 @@ class ComplaintMessageSerializer(serializers.ModelSerializer):
         model = ComplaintMessage
         fields = "__all__"
         read_only_fields = ("timestamp", "is_edited", "edited_at")
+        list_serializer_class = ComplaintMessageListSerializer
 
     def get_presigned_url(self, obj):
-        contentType = ContentType.objects.get_for_model(obj)
-        media_instance = Document.objects.filter(
-            object_type=contentType, object_id=obj.id
-        )
-        urls = []
-        if media_instance:
-            for instance in media_instance:
-                urls.append(S3Helper().get_presigned_url(instance.s3_key))
-        return urls
+        if self.document_keys is not None:
+            keys = self.document_keys.get(obj.id, [])
+        else:
+            contentType = ContentType.objects.get_for_model(obj)
+            keys = Document.objects.filter(
+                object_type=contentType, object_id=obj.id
+            ).values_list("s3_key", flat=True)
+        return [S3Helper().get_presigned_url(key) for key in keys]
@@ -0,0 +1,93 @@
+# complaints/stats.py
+"""
+Read and rebuild helpers for the ComplaintStat summary table.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+OPEN_STATUSES = ("open", "in_progress")
+
+# (label, max age in days) for open-complaint aging; None means no upper bound.
+AGING_BUCKETS = (
+    ("0-7", 7),
+    ("8-30", 30),
+    ("31-90", 90),
+    ("90+", None),
+)
+
+
+def _aging_bucket(age_days):
+    for label, max_age in AGING_BUCKETS:
+        if max_age is None or age_days <= max_age:
+            return label
+
+
+def summarize(workspace_id, today):
+    """
+    Dashboard numbers for one workspace, from a single indexed query on
+    ComplaintStat: totals by status and category, and the age of complaints
+    that are still open.
+    """
+    from .models import ComplaintStat
+
+    by_status = defaultdict(int)
+    by_category = defaultdict(int)
+    open_aging = {label: 0 for label, _ in AGING_BUCKETS}
+
+    rows = ComplaintStat.objects.filter(
+        workspace_id=workspace_id, count__gt=0
+    ).values_list("status", "category", "day", "count")
+    for status, category, day, count in rows:
+        by_status[status] += count
+        by_category[category] += count
+        if status in OPEN_STATUSES:
+            open_aging[_aging_bucket((today - day).days)] += count
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": dict(by_status),
+        "by_category": dict(by_category),
+        "open_aging": open_aging,
+    }
+
+
+def rebuild_complaint_stats(workspace_ids=None, chunk_size=100):
+    """
+    Recompute ComplaintStat from the Complaint table, ``chunk_size``
+    workspaces per transaction. Returns the number of workspaces processed.
+    """
+    from .models import Complaint, ComplaintStat
+
+    if workspace_ids is None:
+        # Workspaces with complaints, plus any with (possibly stale) stats.
+        workspace_ids = set(
+            Complaint.objects.order_by()
+            .values_list("workspace_id", flat=True)
+            .distinct()
+        ) | set(
+            ComplaintStat.objects.order_by()
+            .values_list("workspace_id", flat=True)
+            .distinct()
+        )
+    workspace_ids = sorted(workspace_ids)
+
+    for start in range(0, len(workspace_ids), chunk_size):
+        chunk = workspace_ids[start : start + chunk_size]
+        counts = (
+            Complaint.objects.filter(workspace_id__in=chunk)
+            .annotate(day=TruncDate("created_at"))
+            .values("workspace_id", "status", "category", "day")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        with transaction.atomic():
+            ComplaintStat.objects.filter(workspace_id__in=chunk).delete()
+            ComplaintStat.objects.bulk_create(
+                [ComplaintStat(**row) for row in counts], batch_size=1000
+            )
+
+    return len(workspace_ids)
@@ -1,3 +1,164 @@
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from backend.testing import QueryCountMixin, make_user, unique_name
+from workspaces.models import ApartmentUnit, UserWorkspace, Workspace
+
+from .models import Complaint, ComplaintMessage
+from .stats import summarize
+
+
+class ComplaintTestCase(TestCase):
+    """An owner/admin with a workspace and one complaint."""
+
+    def setUp(self):
+        self.owner = make_user(role="owner")
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.owner
+        )
+        UserWorkspace.objects.create(
+            user=self.owner, workspace=self.workspace, role="admin"
+        )
+        self.complaint = Complaint.objects.create(
+            workspace=self.workspace,
+            user=self.owner,
+            title="Broken lift",
+            description="Stuck on floor 3",
+            category="maintenance",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.base = f"/api/v1/complaints/workspaces/{self.workspace.pk}/complaints"
+
+
+class ComplaintListQueryCountTests(QueryCountMixin, ComplaintTestCase):
+    def add_complaints(self, n):
+        # Different reporters and units, so every relation varies.
+        for _ in range(n):
+            reporter = make_user()
+            UserWorkspace.objects.create(
+                user=reporter, workspace=self.workspace, role="resident"
+            )
+            Complaint.objects.create(
+                workspace=self.workspace,
+                user=reporter,
+                unit=ApartmentUnit.objects.create(
+                    workspace=self.workspace,
+                    unit_number=unique_name("U"),
+                    rent_amount=1000,
+                ),
+                title="Water leak",
+                description="Leak under the sink",
+                category="maintenance",
+                status="resolved",
+            )
+
+    def test_list(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/"), self.add_complaints
+        )
+
+    def test_search(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/search/?q=leak"),
+            self.add_complaints,
+        )
+
+    def test_list_messages(self):
+        def grow(n):
+            for _ in range(n):
+                sender = make_user()
+                reply_to = ComplaintMessage.objects.create(
+                    complaint=self.complaint, sender=sender, content="Any news?"
+                )
+                ComplaintMessage.objects.create(
+                    complaint=self.complaint,
+                    sender=self.owner,
+                    content="On it.",
+                    reply_to=reply_to,
+                )
+
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/{self.complaint.pk}/messages/"),
+            grow,
+        )
+
+
+class ComplaintSearchTests(ComplaintTestCase):
+    def search(self, query):
+        return self.client.get(f"{self.base}/search/?q=lift{query}")
+
+    def test_limit(self):
+        Complaint.objects.create(
+            workspace=self.workspace,
+            user=self.owner,
+            title="Lift noise",
+            description="Rattles at night",
+            category="noise",
+        )
+        self.assertEqual(len(self.search("").json()), 2)
+        response = self.search("&limit=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_invalid_limit_is_rejected(self):
+        for limit in ("0", "-3", "201", "abc", ""):
+            with self.subTest(limit=limit):
+                response = self.search(f"&limit={limit}")
+                self.assertEqual(response.status_code, 400)
+
+
+class ComplaintStatsTests(ComplaintTestCase):
+    def test_owner_and_admin(self):
+        admin = make_user()
+        UserWorkspace.objects.create(user=admin, workspace=self.workspace, role="admin")
+        for user in (self.owner, admin):
+            with self.subTest(user=user):
+                self.client.force_authenticate(user)
+                response = self.client.get(f"{self.base}/stats/")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["total"], 1)
+
+    def test_resident_and_non_member_are_forbidden(self):
+        resident = make_user()
+        UserWorkspace.objects.create(
+            user=resident, workspace=self.workspace, role="resident"
+        )
+        for user in (resident, make_user()):
+            with self.subTest(user=user):
+                self.client.force_authenticate(user)
+                response = self.client.get(f"{self.base}/stats/")
+                self.assertEqual(response.status_code, 403)
+
+
+class ComplaintDeleteTests(ComplaintTestCase):
+    def total(self):
+        return summarize(self.workspace.pk, timezone.localdate())["total"]
+
+    def test_delete(self):
+        self.complaint.delete()
+        self.assertEqual(self.total(), 0)
+
+    def test_deleting_the_reporter_cascades_to_stats(self):
+        resident = make_user()
+        UserWorkspace.objects.create(
+            user=resident, workspace=self.workspace, role="resident"
+        )
+        Complaint.objects.create(
+            workspace=self.workspace,
+            user=resident,
+            title="Noisy neighbour",
+            description="Drums at midnight",
+            category="noise",
+        )
+        self.assertEqual(self.total(), 2)
+
+        resident.delete()
+
+        self.assertEqual(self.total(), 1)
+        response = self.client.get(f"/api/v1/workspaces/{self.workspace.pk}/dashboard/")
+        self.assertEqual(response.json()["complaints"]["total"], 1)
+        self.assertEqual(
+            response.json()["complaints"]["by_category"], {"maintenance": 1}
+        )
@@ -13,6 +13,8 @@ Complaints:
 
 GET /api/v1/complaints/workspaces/{workspace_id}/complaints/ (List)
 POST /api/v1/complaints/workspaces/{workspace_id}/complaints/ (Create)
+GET /api/v1/complaints/workspaces/{workspace_id}/complaints/search/?q=... (Ranked search)
+GET /api/v1/complaints/workspaces/{workspace_id}/complaints/stats/ (Dashboard counts)
 GET /api/v1/complaints/workspaces/{workspace_id}/complaints/{complaint_id}/ (Retrieve)
 PUT /api/v1/complaints/workspaces/{workspace_id}/complaints/{complaint_id}/ (Update)
 PATCH /api/v1/complaints/workspaces/{workspace_id}/complaints/{complaint_id}/ (Partial Update)
@@ -37,6 +39,14 @@ urlpatterns = [
         "workspaces/<int:workspace_id>/complaints/",
         views.ComplaintViewSet.as_view({"get": "list", "post": "create"}),
     ),
+    path(
+        "workspaces/<int:workspace_id>/complaints/stats/",
+        views.ComplaintViewSet.as_view({"get": "stats"}),
+    ),
+    path(
+        "workspaces/<int:workspace_id>/complaints/search/",
+        views.ComplaintViewSet.as_view({"get": "search"}),
+    ),
     path(
         "workspaces/<int:workspace_id>/complaints/<int:pk>/",
         views.ComplaintViewSet.as_view(
@@ -2,6 +2,10 @@ from rest_framework import viewsets, mixins, status
 from rest_framework.response import Response
 from .models import Complaint, ComplaintMessage
 from .serializers import ComplaintSerializer, ComplaintMessageSerializer
+from .search import search_complaints
+from .stats import summarize
+from backend.streaming import StreamingListMixin, wants_streaming
+from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from workspaces.permissions import (
     IsWorkspaceMember,
@@ -14,8 +18,12 @@ from django.contrib.contenttypes.models import ContentType
 from media.models import Document  # Import
 from media.serializers import DocumentSerializer  # Import
 
+SEARCH_DEFAULT_LIMIT = 50
+SEARCH_MAX_LIMIT = 200
+
 
 class ComplaintViewSet(
+    StreamingListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -29,7 +37,7 @@ class ComplaintViewSet(
     permission_classes = [IsAuthenticated]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve", "create"]:
+        if self.action in ["list", "retrieve", "create", "search"]:
             # All workspace members can create/list/view
             permission_classes = [IsAuthenticated, IsWorkspaceMember]
         elif self.action in ["update", "partial_update", "destroy", "resolve"]:
@@ -37,6 +45,8 @@ class ComplaintViewSet(
                 IsAuthenticated,
                 # IsOwnerOrAdmin,
             ]  # Only admin/owner can update/delete/resolve
+        elif self.action == "stats":
+            permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
@@ -57,7 +67,9 @@ class ComplaintViewSet(
         ):
             return Complaint.objects.none()
 
-        queryset = queryset.filter(workspace=workspace)
+        queryset = queryset.filter(workspace=workspace).select_related(
+            "user", "workspace", "unit"
+        )
 
         # Further restrict based on user role, if not admin/owner.
         if not (
@@ -77,6 +89,38 @@ class ComplaintViewSet(
 
     def list(self, request, workspace_id=None, *args, **kwargs):
         queryset = self.get_queryset()
+        if wants_streaming(request):
+            return self.streaming_list_response(queryset)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def search(self, request, workspace_id=None, *args, **kwargs):
+        """
+        Ranked full-text search over title, description and message contents,
+        limited to the complaints the caller can list.
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"detail": "Query parameter 'q' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            return Response(
+                {"detail": "Query parameter 'limit' must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 1 <= limit <= SEARCH_MAX_LIMIT:
+            return Response(
+                {
+                    "detail": f"Query parameter 'limit' must be between 1 and {SEARCH_MAX_LIMIT}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = search_complaints(self.get_queryset(), text)[:limit]
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -107,6 +151,15 @@ class ComplaintViewSet(
     def destroy(self, request, workspace_id=None, pk=None, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @action(
+        detail=False,
+        methods=["GET"],
+        permission_classes=[IsAuthenticated, IsOwnerOrAdmin],
+    )
+    def stats(self, request, workspace_id=None):
+        """Complaint counts by status/category and open-complaint aging."""
+        return Response(summarize(workspace_id, timezone.localdate()))
+
     @action(
         detail=True,
         methods=["POST"],
@@ -173,7 +226,9 @@ class ComplaintMessageViewSet(
             return ComplaintMessage.objects.none()  # User not in workspace
 
         # Filter by workspace
-        queryset = queryset.filter(complaint__workspace_id=workspace_id)
+        queryset = queryset.filter(complaint__workspace_id=workspace_id).select_related(
+            "sender", "reply_to"
+        )
 
         # Further filter by complaint_id if provided
         if complaint_id:
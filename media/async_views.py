@@ -0,0 +1,107 @@
+# media/async_views.py
+"""
+Async variants of the upload and batch presign endpoints for the ASGI server.
+
+Storage calls go through S3Helper's async methods, which run them on the
+bounded media-io thread pool (see media/storage.py), and ORM work and
+multipart parsing go through sync_to_async, so neither a slow S3 region nor
+a large upload blocks the event loop and one process can keep many uploads
+in flight.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+
+from users.authentication import CustomJWTAuthentication
+from .helpers import S3Helper
+from .views import (
+    attach_presigned_urls,
+    prepare_upload,
+    record_upload,
+    visible_documents,
+)
+
+
+async def _authenticate(request):
+    """Authenticate like the DRF views do; returns (user, error_response)."""
+    try:
+        result = await sync_to_async(CustomJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed as e:
+        body = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+        return None, JsonResponse(body, status=status.HTTP_401_UNAUTHORIZED)
+    if result is None:
+        return None, JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    return result[0], None
+
+
+def _prepare_upload(user, request):
+    # Parsing the multipart body spools large files to disk, so it belongs
+    # off the event loop with the rest of the validation.
+    return prepare_upload(user, {**request.POST.dict(), **request.FILES.dict()})
+
+
+@csrf_exempt
+@require_POST
+async def upload_file(request):
+    user, error_response = await _authenticate(request)
+    if error_response:
+        return error_response
+
+    upload, error = await sync_to_async(_prepare_upload)(user, request)
+    if error:
+        body, error_status = error
+        return JsonResponse(body, status=error_status)
+
+    file_url, message = await S3Helper().aupload_to_s3(upload["key"], upload["file"])
+    if not file_url:
+        return JsonResponse(
+            {"error": message}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    try:
+        await sync_to_async(record_upload)(user, upload)
+    except Exception as e:
+        return JsonResponse(
+            {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    return JsonResponse(
+        {"message": message, "file_url": file_url}, status=status.HTTP_201_CREATED
+    )
+
+
+@csrf_exempt
+@require_POST
+async def batch_presigned_urls(request):
+    user, error_response = await _authenticate(request)
+    if error_response:
+        return error_response
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse(
+            {"error": "Expected a JSON body"}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if not isinstance(data, dict):
+        return JsonResponse(
+            {"error": "Expected a JSON object"}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    documents, error = await sync_to_async(visible_documents)(user, data)
+    if error:
+        body, error_status = error
+        return JsonResponse(body, status=error_status)
+
+    urls = await S3Helper().aget_presigned_urls(
+        [document["s3_key"] for document in documents]
+    )
+    return JsonResponse({"documents": attach_presigned_urls(documents, urls)})
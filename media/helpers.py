@@ -1,22 +1,36 @@
-import boto3
 from botocore.exceptions import NoCredentialsError
-from botocore.config import Config
-from decouple import config
+
+from django.conf import settings
+
+from backend.metrics import record_s3
+from backend.tracing import CLIENT, span
+
+from .storage import get_storage
 
 
 class S3Helper:
+    """
+    Upload/sign helper used across the apps. The actual I/O is done by the
+    storage backend configured in settings.MEDIA_STORAGE_BACKEND (S3 or local
+    disk, see media/storage.py).
+    """
+
     def __init__(self):
-        self.s3 = boto3.client(
-            "s3",
-            aws_access_key_id=config("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=config("AWS_SECRET_ACCESS_KEY"),
-            region_name=config("AWS_S3_REGION_NAME"),
-            config=Config(signature_version="s3v4"),
-        )
-
-    def upload_to_s3(self, file_name, file, bucket_name):
+        self.storage = get_storage()
+
+    @staticmethod
+    def _span(name, key=None, count=1):
+        attributes = {"storage.backend": settings.MEDIA_STORAGE_BACKEND}
+        if key is not None:
+            attributes["s3.key"] = key
+        if count != 1:
+            attributes["s3.count"] = count
+        return span(name, CLIENT, attributes)
+
+    def upload_to_s3(self, file_name, file, bucket_name=None):
         try:
-            self.s3.upload_fileobj(file, bucket_name, file_name)
+            with record_s3(), self._span("s3.upload", file_name):
+                self.storage.upload(file_name, file, bucket_name=bucket_name)
             # file_url = f"https://{bucket_name}.s3.amazonaws.com/{file_name}"
             return file_name, "File uploaded successfully"
         except NoCredentialsError:
@@ -24,13 +38,30 @@ class S3Helper:
         except Exception as e:
             return False, str(e)
 
-    def get_presigned_url(self, file_name):
+    def get_presigned_url(self, file_name, bucket_name=None):
         try:
-            response = self.s3.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": config("AWS_STORAGE_BUCKET_NAME"), "Key": file_name},
-                ExpiresIn=3600,
-            )
-            return response
+            with record_s3(), self._span("s3.presign", file_name):
+                return self.storage.url(file_name, bucket_name=bucket_name)
         except Exception as e:
             return str(e)
+
+    async def aupload_to_s3(self, file_name, file, bucket_name=None):
+        """Async variant of upload_to_s3; the upload runs on the media-io pool."""
+        try:
+            with record_s3(), self._span("s3.upload", file_name):
+                await self.storage.aupload(file_name, file, bucket_name=bucket_name)
+            return file_name, "File uploaded successfully"
+        except NoCredentialsError:
+            return False, "Credentials not available"
+        except Exception as e:
+            return False, str(e)
+
+    async def aget_presigned_urls(self, file_names):
+        """Sign several keys off the event loop, in order."""
+        try:
+            with record_s3(calls=len(file_names)), self._span(
+                "s3.presign", count=len(file_names)
+            ):
+                return await self.storage.aurls(file_names)
+        except Exception as e:
+            return [str(e)] * len(file_names)
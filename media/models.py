@@ -24,6 +24,13 @@ class Document(models.Model):
 
     class Meta:
         db_table = "Document"
+        indexes = [
+            # Attachment lookups: all documents of an object, newest first.
+            models.Index(
+                fields=["object_type", "object_id", "-uploaded_on"],
+                name="document_object_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -0,0 +1,188 @@
+# media/registry.py
+"""
+In-process registry of the models a Document may be attached to.
+
+Each entry maps (app_label, model) to its ContentType id and a scope that
+returns the objects a user may attach to / read documents of.
+The registry is built once (see ``warm()``, called from the WSGI/ASGI entry
+points) and is read-only afterwards, so the upload and document endpoints no
+longer query ``django_content_type`` per request.
+"""
+
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError
+from django.db.models import Q
+
+
+def _own_user(user):
+    """Users may only manage their own documents (e.g. profile images)."""
+    User = apps.get_model("users", "User")
+    if user.is_superuser:
+        return User.objects.all()
+    return User.objects.filter(pk=user.pk)
+
+
+def _workspace_member_scope(app_label, model_name, workspace_path):
+    """
+    Build a scope that allows the owner and members of the workspace reached
+    through ``workspace_path`` from the attached object.
+    """
+    prefix = f"{workspace_path}__" if workspace_path else ""
+
+    def scope(user):
+        model = apps.get_model(app_label, model_name)
+        if user.is_superuser:
+            return model.objects.all()
+        return model.objects.filter(
+            Q(**{f"{prefix}owner": user})
+            | Q(**{f"{prefix}workspace_users__user": user})
+        )
+
+    return scope
+
+
+def _conversation_participant(user):
+    ChatMessage = apps.get_model("chat", "ChatMessage")
+    if user.is_superuser:
+        return ChatMessage.objects.all()
+    return ChatMessage.objects.filter(
+        Q(conversation__user1=user) | Q(conversation__user2=user)
+    )
+
+
+# (app_label, model) -> scope(user) returning the objects the user may access
+ATTACHABLE_MODELS = {
+    ("users", "user"): _own_user,
+    ("workspaces", "workspace"): _workspace_member_scope("workspaces", "Workspace", ""),
+    ("workspaces", "apartmentunit"): _workspace_member_scope(
+        "workspaces", "ApartmentUnit", "workspace"
+    ),
+    ("complaints", "complaint"): _workspace_member_scope(
+        "complaints", "Complaint", "workspace"
+    ),
+    ("complaints", "complaintmessage"): _workspace_member_scope(
+        "complaints", "ComplaintMessage", "complaint__workspace"
+    ),
+    ("chat", "chatmessage"): _conversation_participant,
+}
+
+
+@dataclass(frozen=True)
+class AttachableModel:
+    app_label: str
+    model: str
+    content_type_id: int
+    scope: Callable
+
+    @property
+    def label(self):
+        return f"{self.app_label}.{self.model}"
+
+    @property
+    def content_type(self):
+        # Served from ContentTypeManager's cache, which warm() has populated.
+        return ContentType.objects.get_for_id(self.content_type_id)
+
+    def has_access(self, user, object_id):
+        if object_id is None or not str(object_id).isdigit():
+            return False
+        return self.scope(user).filter(pk=int(object_id)).exists()
+
+    def documents_q(self, user, object_ids=None):
+        """
+        Q matching this model's documents that ``user`` may see, optionally
+        restricted to ``object_ids``. The permission check is a subquery, so
+        it costs no extra round trip.
+        """
+        accessible = self.scope(user)
+        if object_ids is not None:
+            accessible = accessible.filter(pk__in=object_ids)
+        return Q(
+            object_type_id=self.content_type_id,
+            object_id__in=accessible.values("pk"),
+        )
+
+
+class AttachableModelRegistry:
+    def __init__(self, definitions):
+        self._definitions = definitions
+        self._lock = threading.Lock()
+        self._by_label = None
+        self._by_model = None
+        self._by_content_type = None
+
+    def warm(self):
+        """
+        Resolve every ContentType once. Safe to call repeatedly; if the
+        database is not reachable yet the registry is built on first use.
+        """
+        try:
+            self._build()
+        except DatabaseError:
+            pass
+
+    def _build(self):
+        if self._by_label is not None:
+            return
+        with self._lock:
+            if self._by_label is not None:
+                return
+
+            models = [
+                apps.get_model(app_label, model)
+                for app_label, model in self._definitions
+            ]
+            content_types = ContentType.objects.get_for_models(*models)
+
+            by_label, by_model, by_content_type = {}, {}, {}
+            ambiguous = set()
+            for model_class, content_type in content_types.items():
+                key = (content_type.app_label, content_type.model)
+                entry = AttachableModel(
+                    app_label=content_type.app_label,
+                    model=content_type.model,
+                    content_type_id=content_type.id,
+                    scope=self._definitions[key],
+                )
+                by_label[entry.label] = entry
+                by_content_type[entry.content_type_id] = entry
+                if entry.model in by_model:
+                    ambiguous.add(entry.model)
+                by_model[entry.model] = entry
+
+            for model in ambiguous:
+                del by_model[model]
+
+            self._by_model = MappingProxyType(by_model)
+            self._by_content_type = MappingProxyType(by_content_type)
+            self._by_label = MappingProxyType(by_label)
+
+    def get(self, name):
+        """
+        Look up an attachable model by ``"app_label.model"`` or, when it is
+        unambiguous, by the bare model name. Returns None if not allowed.
+        """
+        if not name:
+            return None
+        self._build()
+        name = name.lower()
+        if "." in name:
+            return self._by_label.get(name)
+        return self._by_model.get(name)
+
+    def get_by_content_type_id(self, content_type_id):
+        self._build()
+        return self._by_content_type.get(content_type_id)
+
+    def __iter__(self):
+        self._build()
+        return iter(self._by_label.values())
+
+
+attachable_models = AttachableModelRegistry(ATTACHABLE_MODELS)
@@ -4,9 +4,10 @@ from .models import Document
 from django.contrib.contenttypes.models import ContentType
 from django.apps import apps  # Import apps
 from .helpers import S3Helper  # Import the helper function
+from backend.serializers import SparseFieldsetMixin, TracedListSerializer
 
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     presigned_url = serializers.SerializerMethodField()
     uploaded_by_custom_id = serializers.CharField(
         source="uploaded_by.custom_id", read_only=True
@@ -29,6 +30,7 @@ class DocumentSerializer(serializers.ModelSerializer):
             "uploaded_by_custom_id",
             "content_type_name",
         )
+        list_serializer_class = TracedListSerializer
 
     def get_presigned_url(self, obj):
         return S3Helper().get_presigned_url(obj.s3_key)
@@ -0,0 +1,142 @@
+# media/storage.py
+"""
+Storage backends for uploaded media.
+
+``S3Helper`` (media/helpers.py) delegates to the backend selected by the
+``MEDIA_STORAGE_BACKEND`` setting:
+
+- ``"s3"``: boto3 against ``AWS_STORAGE_BUCKET_NAME`` with presigned URLs.
+- ``"local"``: files under ``MEDIA_ROOT``, served by ``media.views.download_file``
+  through signed, expiring URLs (for on-prem installs and CI).
+
+A dotted path to a ``BaseStorage`` subclass is accepted as well.
+"""
+
+import asyncio
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils._os import safe_join
+from django.utils.module_loading import import_string
+
+URL_EXPIRES_IN = 3600  # seconds, matches the previous presigned URL lifetime
+DOWNLOAD_SALT = "media.storage.download"
+
+
+@lru_cache(maxsize=None)
+def get_io_executor():
+    """
+    Bounded thread pool for blocking storage I/O issued from async views, so
+    slow S3 calls never run on (or starve) the event loop.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.MEDIA_IO_MAX_WORKERS, thread_name_prefix="media-io"
+    )
+
+
+async def run_io(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), partial(func, *args, **kwargs))
+
+
+class BaseStorage:
+    def upload(self, key, fileobj, bucket_name=None):
+        raise NotImplementedError
+
+    def url(self, key, expires_in=URL_EXPIRES_IN, bucket_name=None):
+        raise NotImplementedError
+
+    async def aupload(self, key, fileobj, bucket_name=None):
+        return await run_io(self.upload, key, fileobj, bucket_name=bucket_name)
+
+    async def aurls(self, keys, expires_in=URL_EXPIRES_IN):
+        # One executor hop for the whole batch; signing itself is cheap.
+        return await run_io(lambda: [self.url(key, expires_in) for key in keys])
+
+
+class S3Storage(BaseStorage):
+    def __init__(self):
+        import boto3
+        from botocore.config import Config
+
+        self.bucket_name = settings.AWS_STORAGE_BUCKET_NAME
+        self.client = boto3.client(
+            "s3",
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_S3_REGION_NAME,
+            config=Config(
+                signature_version="s3v4",
+                # Every media-io worker may hold a connection at once.
+                max_pool_connections=settings.MEDIA_IO_MAX_WORKERS,
+            ),
+        )
+
+    def upload(self, key, fileobj, bucket_name=None):
+        self.client.upload_fileobj(fileobj, bucket_name or self.bucket_name, key)
+
+    def url(self, key, expires_in=URL_EXPIRES_IN, bucket_name=None):
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket_name or self.bucket_name, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+
+class LocalStorage(BaseStorage):
+    def __init__(self):
+        self.root = Path(settings.MEDIA_ROOT)
+
+    def path(self, key):
+        # safe_join raises SuspiciousFileOperation for keys escaping the root.
+        return Path(safe_join(self.root, key))
+
+    def upload(self, key, fileobj, bucket_name=None):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        with open(path, "wb") as destination:
+            shutil.copyfileobj(fileobj, destination, length=1024 * 1024)
+
+    def url(self, key, expires_in=URL_EXPIRES_IN, bucket_name=None):
+        # There is a single root on disk; bucket_name is ignored, as in upload.
+        token = signing.dumps(
+            {"key": key, "exp": int(time.time()) + expires_in}, salt=DOWNLOAD_SALT
+        )
+        return settings.MEDIA_LOCAL_BASE_URL + reverse(
+            "media_download", kwargs={"token": token}
+        )
+
+    def resolve_token(self, token):
+        """Return the file path a download token grants access to, or None."""
+        try:
+            payload = signing.loads(token, salt=DOWNLOAD_SALT)
+        except signing.BadSignature:
+            return None
+        if payload.get("exp", 0) < time.time():
+            return None
+        return self.path(payload["key"])
+
+
+STORAGE_BACKENDS = {
+    "s3": S3Storage,
+    "local": LocalStorage,
+}
+
+
+@lru_cache(maxsize=None)
+def get_storage():
+    """
+    Return the process-wide storage instance. boto3 clients are thread-safe,
+    so every request shares one client instead of building its own.
+    """
+    backend = settings.MEDIA_STORAGE_BACKEND
+    storage_class = STORAGE_BACKENDS.get(backend) or import_string(backend)
+    return storage_class()
@@ -1,3 +1,334 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
 
-# Create your tests here.
+from io import BytesIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from backend.testing import QueryCountMixin, make_user, unique_name
+from chat.models import Conversation
+from complaints.models import Complaint
+from users.models import User
+from users.serializers import CustomTokenObtainPairSerializer
+from workspaces.models import UserWorkspace, Workspace
+
+from .helpers import S3Helper
+from .models import Document
+from .registry import attachable_models
+from .storage import get_storage
+
+
+def attach(obj, owner):
+    return Document.objects.create(
+        object_type=ContentType.objects.get_for_model(obj),
+        object_id=obj.pk,
+        s3_key=f"{obj._meta.model_name}/{obj.pk}/file.pdf",
+        uploaded_by=owner,
+    )
+
+
+def use_local_storage(test):
+    """Point the storage backend at a fresh temporary MEDIA_ROOT."""
+    root = tempfile.TemporaryDirectory()
+    test.addCleanup(root.cleanup)
+    override = override_settings(MEDIA_STORAGE_BACKEND="local", MEDIA_ROOT=root.name)
+    override.enable()
+    test.addCleanup(override.disable)
+    get_storage.cache_clear()
+    test.addCleanup(get_storage.cache_clear)
+
+
+@override_settings(MEDIA_STORAGE_BACKEND="local", MEDIA_ROOT=tempfile.gettempdir())
+class PresignQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        get_storage.cache_clear()
+        self.addCleanup(get_storage.cache_clear)
+        name = unique_name()
+        self.user = User.objects.create(
+            username=name, email=f"{name}@example.com", password="!"
+        )
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.user
+        )
+        UserWorkspace.objects.create(
+            user=self.user, workspace=self.workspace, role="admin"
+        )
+        self.complaint_ids = []
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_batch_presigned_urls(self):
+        complaint_type = ContentType.objects.get_for_model(Complaint)
+
+        def grow(n):
+            for _ in range(n):
+                complaint = Complaint.objects.create(
+                    workspace=self.workspace,
+                    user=self.user,
+                    title="Photo",
+                    description="See attached",
+                    category="other",
+                )
+                Document.objects.create(
+                    object_type=complaint_type,
+                    object_id=complaint.pk,
+                    s3_key=f"complaint/{complaint.pk}/photo.jpg",
+                    uploaded_by=self.user,
+                )
+                self.complaint_ids.append(complaint.pk)
+
+        self.assertQueryCountStable(
+            lambda: self.client.post(
+                "/api/v1/upload/presigned-urls/",
+                {"modelName": "complaints.complaint", "objectIds": self.complaint_ids},
+                format="json",
+            ),
+            grow,
+            rows=lambda content: len(json.loads(content)["documents"]),
+        )
+
+
+class BatchPresignAccessTests(TestCase):
+    def setUp(self):
+        use_local_storage(self)
+        self.member = make_user()
+        self.outsider = make_user()
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=make_user()
+        )
+        UserWorkspace.objects.create(
+            user=self.member, workspace=self.workspace, role="resident"
+        )
+        self.complaint = Complaint.objects.create(
+            workspace=self.workspace,
+            user=self.member,
+            title="Leak",
+            description="Kitchen",
+            category="maintenance",
+        )
+        self.complaint_doc = attach(self.complaint, self.member)
+        self.workspace_doc = attach(self.workspace, self.member)
+
+    def presign(self, user, payload):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post("/api/v1/upload/presigned-urls/", payload, format="json")
+
+    def returned_ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return sorted(doc["id"] for doc in response.json()["documents"])
+
+    def test_member_gets_urls(self):
+        response = self.presign(
+            self.member, {"ids": [self.complaint_doc.pk, self.workspace_doc.pk]}
+        )
+        self.assertEqual(
+            self.returned_ids(response),
+            sorted([self.complaint_doc.pk, self.workspace_doc.pk]),
+        )
+        for doc in response.json()["documents"]:
+            self.assertIn("/api/v1/upload/files/", doc["presigned_url"])
+
+    def test_non_member_gets_no_urls_by_document_id(self):
+        response = self.presign(
+            self.outsider, {"ids": [self.complaint_doc.pk, self.workspace_doc.pk]}
+        )
+        self.assertEqual(self.returned_ids(response), [])
+
+    def test_non_member_gets_no_urls_by_object_id(self):
+        response = self.presign(
+            self.outsider,
+            {"modelName": "complaints.complaint", "objectIds": [self.complaint.pk]},
+        )
+        self.assertEqual(self.returned_ids(response), [])
+
+    def test_mixed_content_types_keep_only_visible_documents(self):
+        # The outsider's own profile document is visible to them; the
+        # workspace's documents and another user's profile document are not.
+        own = attach(self.outsider, self.outsider)
+        other_profile = attach(self.member, self.member)
+        response = self.presign(
+            self.outsider,
+            {
+                "ids": [
+                    own.pk,
+                    other_profile.pk,
+                    self.complaint_doc.pk,
+                    self.workspace_doc.pk,
+                ]
+            },
+        )
+        self.assertEqual(self.returned_ids(response), [own.pk])
+        self.assertEqual(response.json()["documents"][0]["model"], "users.user")
+
+    def test_unregistered_content_type_is_never_returned(self):
+        # Conversation is not an attachable model, even for a participant.
+        conversation = Conversation.objects.create(
+            user1=self.member, user2=self.outsider
+        )
+        document = attach(conversation, self.member)
+        response = self.presign(self.member, {"ids": [document.pk]})
+        self.assertEqual(self.returned_ids(response), [])
+
+    def test_unknown_model_name_is_rejected(self):
+        for name in ("chat.conversation", "nosuchapp.thing", "", None):
+            with self.subTest(name=name):
+                response = self.presign(
+                    self.member, {"modelName": name, "objectIds": [1]}
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_registry_lookup(self):
+        self.assertEqual(
+            attachable_models.get("complaints.complaint").label,
+            "complaints.complaint",
+        )
+        self.assertEqual(
+            attachable_models.get("Complaint").label, "complaints.complaint"
+        )
+        self.assertIsNone(attachable_models.get("chat.conversation"))
+        self.assertFalse(
+            attachable_models.get("complaints.complaint").has_access(
+                self.outsider, self.complaint.pk
+            )
+        )
+        self.assertTrue(
+            attachable_models.get("complaints.complaint").has_access(
+                self.member, self.complaint.pk
+            )
+        )
+
+
+class DownloadRangeTests(TestCase):
+    content = b"0123456789"
+
+    def setUp(self):
+        use_local_storage(self)
+        storage = get_storage()
+        storage.upload("docs/file.txt", BytesIO(self.content))
+        self.url = storage.url("docs/file.txt")
+
+    def get(self, range_header=None):
+        headers = {"HTTP_RANGE": range_header} if range_header else {}
+        response = self.client.get(self.url, **headers)
+        body = b"".join(response.streaming_content) if response.streaming else b""
+        return response, body
+
+    def test_whole_file(self):
+        response, body = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_byte_range(self):
+        response, body = self.get("bytes=2-4")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, b"234")
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+        self.assertEqual(response["Content-Length"], "3")
+
+    def test_open_ended_and_clamped_ranges(self):
+        response, body = self.get("bytes=7-")
+        self.assertEqual((response.status_code, body), (206, b"789"))
+        response, body = self.get("bytes=7-100")
+        self.assertEqual((response.status_code, body), (206, b"789"))
+        self.assertEqual(response["Content-Range"], "bytes 7-9/10")
+
+    def test_suffix_ranges(self):
+        response, body = self.get("bytes=-3")
+        self.assertEqual((response.status_code, body), (206, b"789"))
+        self.assertEqual(response["Content-Range"], "bytes 7-9/10")
+        # A suffix longer than the file is the whole file.
+        response, body = self.get("bytes=-50")
+        self.assertEqual((response.status_code, body), (206, self.content))
+        self.assertEqual(response["Content-Range"], "bytes 0-9/10")
+
+    def test_unsatisfiable_ranges(self):
+        for header in ("bytes=10-", "bytes=20-30", "bytes=5-2", "bytes=-0"):
+            with self.subTest(header=header):
+                response, _ = self.get(header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response["Content-Range"], "bytes */10")
+
+    def test_malformed_or_multi_range_serves_whole_file(self):
+        for header in ("bytes=0-1,4-5", "items=0-1", "bytes=-"):
+            with self.subTest(header=header):
+                response, body = self.get(header)
+                self.assertEqual((response.status_code, body), (200, self.content))
+
+    def test_bad_token(self):
+        response = self.client.get("/api/v1/upload/files/not-a-token/")
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(
+    MEDIA_STORAGE_BACKEND="s3",
+    AWS_ACCESS_KEY_ID="key",
+    AWS_SECRET_ACCESS_KEY="secret",
+    AWS_STORAGE_BUCKET_NAME="default-bucket",
+)
+class PresignBucketTests(TestCase):
+    def setUp(self):
+        get_storage.cache_clear()
+        self.addCleanup(get_storage.cache_clear)
+
+    def test_bucket_name_is_passed_to_storage(self):
+        # Signing is local to botocore; no request reaches S3.
+        helper = S3Helper()
+        self.assertIn("default-bucket", helper.get_presigned_url("a/b.pdf"))
+        url = helper.get_presigned_url("a/b.pdf", bucket_name="archive-bucket")
+        self.assertIn("archive-bucket", url)
+        self.assertNotIn("default-bucket", url)
+
+
+class LoopRecordingUploadHandler(TemporaryFileUploadHandler):
+    """Records, per uploaded file, whether it was parsed on an event loop."""
+
+    on_event_loop = []
+
+    def new_file(self, *args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.on_event_loop.append(False)
+        else:
+            self.on_event_loop.append(True)
+        super().new_file(*args, **kwargs)
+
+
+@override_settings(
+    FILE_UPLOAD_HANDLERS=["media.tests.LoopRecordingUploadHandler"],
+)
+class AsyncUploadTests(TestCase):
+    def setUp(self):
+        use_local_storage(self)
+        self.user = make_user()
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.user
+        )
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.headers = {"Authorization": f"Bearer {token}"}
+        LoopRecordingUploadHandler.on_event_loop.clear()
+
+    async def test_upload_parses_the_body_off_the_event_loop(self):
+        response = await self.async_client.post(
+            "/api/v1/upload/async/",
+            {
+                "file": SimpleUploadedFile(
+                    "plan.png", b"\x89PNG", content_type="image/png"
+                ),
+                "modelName": "workspaces.workspace",
+                "objectId": str(self.workspace.pk),
+            },
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(LoopRecordingUploadHandler.on_event_loop, [False])
+        document = await Document.objects.aget(object_id=self.workspace.pk)
+        self.assertEqual(document.file_name, "plan.png")
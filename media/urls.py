@@ -1,7 +1,7 @@
 # media/urls.py
 from django.urls import path
 from rest_framework import routers
-from . import views
+from . import views, async_views
 
 router = routers.SimpleRouter()
 
@@ -11,4 +11,18 @@ urlpatterns = [
         views.FileUploadView.as_view({"post": "upload_file"}),
         name="presigned_url",
     ),
+    path(
+        "presigned-urls/",
+        views.DocumentViewSet.as_view({"post": "batch_presigned_urls"}),
+        name="batch_presigned_urls",
+    ),
+    # Async variants, served without blocking when running under ASGI
+    path("async/", async_views.upload_file, name="async_upload"),
+    path(
+        "async/presigned-urls/",
+        async_views.batch_presigned_urls,
+        name="async_batch_presigned_urls",
+    ),
+    # Local storage downloads (MEDIA_STORAGE_BACKEND = "local")
+    path("files/<str:token>/", views.download_file, name="media_download"),
 ]
@@ -1,4 +1,8 @@
+import re
+
 from django.shortcuts import render
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
 
 from media.models import Document
 from media.serializers import DocumentSerializer
@@ -8,8 +12,180 @@ from rest_framework.response import Response
 from users.authentication import CustomJWTAuthentication
 from django.core.exceptions import ValidationError
 from .helpers import S3Helper  # Import the helper function
-from django.contrib.contenttypes.models import ContentType
-from decouple import config
+from .registry import attachable_models
+from .storage import LocalStorage, get_storage
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+
+User = get_user_model()
+
+# Upper bound on documents signed by a single batch_presigned_urls call.
+MAX_PRESIGN_BATCH_SIZE = 500
+
+
+def _as_id_list(value):
+    """Return value as a list of ints, or None if it is not a list of ids."""
+    if not isinstance(value, list):
+        return None
+    try:
+        return [int(item) for item in value]
+    except (TypeError, ValueError):
+        return None
+
+
+def validate_image(file):
+    valid_mime_types = ["image/jpeg", "image/png", "image/gif"]
+    if file.content_type not in valid_mime_types:
+        raise ValidationError(
+            "Unsupported file type. Only JPEG, PNG, and GIF are allowed."
+        )
+
+
+def prepare_upload(user, data):
+    """
+    Validate an upload request. Returns ``(upload, None)`` where upload holds
+    everything needed to store and record the file, or ``(None, (body,
+    status))`` describing the error response. Shared by the sync and async
+    upload views.
+    """
+    if "file" not in data:
+        return None, ({"error": "No file uploaded"}, status.HTTP_400_BAD_REQUEST)
+
+    # Get the uploaded file from request data
+    file = data.get("file")
+    objectId = data.get("objectId")
+    modelName = data.get("modelName")
+    isProfile = data.get("isProfile") == "true"
+
+    attachable = attachable_models.get(modelName)
+    if attachable is None:
+        return None, (
+            {"error": f"Unsupported modelName: {modelName}"},
+            status.HTTP_400_BAD_REQUEST,
+        )
+    if not attachable.has_access(user, objectId):
+        return None, (
+            {"error": "You do not have permission to attach files to this object"},
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    # Validate the file type
+    try:
+        validate_image(file)
+    except ValidationError as e:
+        return None, ({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    file_extension = file.name.split(".")[-1]
+    file_name = (
+        attachable.model + "/" + objectId + "/" + file.name
+        if not isProfile
+        else "profiles/" + user.username + "_profile." + file_extension
+    )
+    upload = {
+        "file": file,
+        "key": file_name,
+        "object_id": objectId,
+        "attachable": attachable,
+        "is_profile": isProfile,
+    }
+    return upload, None
+
+
+def record_upload(user, upload):
+    """Create the Document for a stored upload and update profile pointers."""
+    contentType = upload["attachable"].content_type
+    objectId = upload["object_id"]
+
+    with transaction.atomic():
+        document = Document.objects.create(
+            object_id=objectId,
+            object_type=contentType,
+            uploaded_by=user,
+            s3_key=upload["key"],
+            file_name=upload["file"].name,
+            is_profile_image=upload["is_profile"],
+        )
+
+        if upload["is_profile"]:
+            ## keep the denormalized avatar pointer current
+            if contentType.model_class() is User:
+                User.objects.filter(pk=objectId).update(profile_image=document)
+
+            ## remove the previous profile image
+            Document.objects.filter(
+                object_id=objectId,
+                object_type=contentType,
+                is_profile_image=True,
+            ).exclude(id=document.id).delete()
+
+    return document
+
+
+def visible_documents(user, data):
+    """
+    Resolve a batch presign request to the documents ``user`` may see, in one
+    query. Accepts either ``{"ids": [...]}`` (Document ids) or
+    ``{"modelName": "...", "objectIds": [...]}``. Returns ``(documents,
+    None)`` or ``(None, (body, status))``.
+    """
+    if "ids" in data:
+        ids = _as_id_list(data.get("ids"))
+        if ids is None:
+            return None, (
+                {"error": "Expected 'ids' to be a list of document ids"},
+                status.HTTP_400_BAD_REQUEST,
+            )
+        requested = ids
+        visible = Q()
+        for attachable in attachable_models:
+            visible |= attachable.documents_q(user)
+        condition = Q(pk__in=ids) & visible
+    else:
+        attachable = attachable_models.get(data.get("modelName"))
+        object_ids = _as_id_list(data.get("objectIds"))
+        if attachable is None or object_ids is None:
+            return None, (
+                {
+                    "error": "Expected 'ids', or a supported 'modelName' with a list of 'objectIds'"
+                },
+                status.HTTP_400_BAD_REQUEST,
+            )
+        requested = object_ids
+        condition = attachable.documents_q(user, object_ids)
+
+    if len(requested) > MAX_PRESIGN_BATCH_SIZE:
+        return None, (
+            {"error": f"At most {MAX_PRESIGN_BATCH_SIZE} ids per request"},
+            status.HTTP_400_BAD_REQUEST,
+        )
+    if not requested:
+        return [], None
+
+    documents = list(
+        Document.objects.filter(condition).values(
+            "id",
+            "object_type_id",
+            "object_id",
+            "file_name",
+            "s3_key",
+            "is_profile_image",
+        )
+    )
+    for document in documents:
+        attachable = attachable_models.get_by_content_type_id(
+            document.pop("object_type_id")
+        )
+        document["model"] = attachable.label
+    return documents, None
+
+
+def attach_presigned_urls(documents, urls):
+    """Replace each document's s3_key with its signed URL, in order."""
+    for document, url in zip(documents, urls):
+        del document["s3_key"]
+        document["presigned_url"] = url
+    return documents
 
 
 # Create your views here.
@@ -21,66 +197,19 @@ class FileUploadView(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def validate_image(self, file):
-        valid_mime_types = ["image/jpeg", "image/png", "image/gif"]
-        if file.content_type not in valid_mime_types:
-            raise ValidationError(
-                "Unsupported file type. Only JPEG, PNG, and GIF are allowed."
-            )
+        validate_image(file)
 
     def upload_file(self, request, *args, **kwargs):
-        if "file" not in request.data:
-            return Response(
-                {"error": "No file uploaded"}, status=status.HTTP_400_BAD_REQUEST
-            )
+        upload, error = prepare_upload(request.user, request.data)
+        if error:
+            body, error_status = error
+            return Response(body, status=error_status)
 
-        # Get the uploaded file from request.data
-        file = request.data.get("file")
-        objectId = request.data.get("objectId")
-        modelName = request.data.get("modelName")
-        isProfile = request.data.get("isProfile") == "true"
-
-        contentType = ContentType.objects.get(model=modelName)
-
-        # Validate the file type
         try:
-            self.validate_image(file)
-        except ValidationError as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        # Ensure the file name is a string
-        try:
-            file_extension = file.name.split(".")[-1]
-            file_name = (
-                contentType.model + "/" + objectId + "/" + file.name
-                if not isProfile
-                else "profiles/" + request.user.username + "_profile." + file_extension
-            )
-
             # Save the file to the server
-            file_url, message = S3Helper().upload_to_s3(
-                file_name, file, config("AWS_STORAGE_BUCKET_NAME")
-            )
+            file_url, message = S3Helper().upload_to_s3(upload["key"], upload["file"])
             if file_url:
-                user = request.user
-                # user.profile_image = file_url
-
-                document = Document.objects.create(
-                    object_id=objectId,
-                    object_type=contentType,
-                    uploaded_by=user,
-                    s3_key=file_name,
-                    file_name=file.name,
-                    is_profile_image=isProfile,
-                )
-                document.save()
-
-                if isProfile:
-                    ## remove the previous profile image
-                    Document.objects.filter(
-                        object_id=objectId,
-                        object_type=contentType,
-                        is_profile_image=True,
-                    ).exclude(id=document.id).delete()
-
+                record_upload(request.user, upload)
                 return Response(
                     {"message": message, "file_url": file_url},
                     status=status.HTTP_201_CREATED,
@@ -102,6 +231,7 @@ class FileUploadView(viewsets.ModelViewSet):
 class DocumentViewSet(viewsets.ModelViewSet):
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
+    authentication_classes = [CustomJWTAuthentication]  # Enforce JWT authentication
     permission_classes = [IsAuthenticated]  # Example permission
 
     def get_queryset(self):
@@ -113,13 +243,126 @@ class DocumentViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         if content_type_str and object_id:
-            try:
-                content_type = ContentType.objects.get(model=content_type_str)
-                queryset = queryset.filter(
-                    content_type=content_type, object_id=object_id
-                )
-            except ContentType.DoesNotExist:
-                return Document.objects.none()  # Or raise an exception
+            attachable = attachable_models.get(content_type_str)
+            if attachable is None or not attachable.has_access(
+                self.request.user, object_id
+            ):
+                return Document.objects.none()
+            queryset = queryset.filter(
+                object_type_id=attachable.content_type_id, object_id=object_id
+            )
 
         # Further filtering based on permissions, etc.
         return queryset
+
+    def batch_presigned_urls(self, request, *args, **kwargs):
+        """
+        Sign many documents in one round trip (see visible_documents for the
+        accepted payloads). Documents the caller may not see are silently
+        left out of the response.
+        """
+        documents, error = visible_documents(request.user, request.data)
+        if error:
+            body, error_status = error
+            return Response(body, status=error_status)
+
+        s3 = S3Helper()  # one client signs the whole batch
+        urls = [s3.get_presigned_url(document["s3_key"]) for document in documents]
+        return Response(
+            {"documents": attach_presigned_urls(documents, urls)},
+            status=status.HTTP_200_OK,
+        )
+
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header, size):
+    """
+    Parse a single-range ``Range`` header. Returns (start, end) inclusive,
+    None when the header should be ignored, or False when unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None  # missing, malformed or multi-range: serve the whole file
+    start, end = match.groups()
+    if start == "":
+        suffix = int(end)
+        if suffix == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+class _FileRange:
+    """File wrapper that stops reading after ``length`` bytes."""
+
+    def __init__(self, fileobj, start, length):
+        fileobj.seek(start)
+        self.fileobj = fileobj
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fileobj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+
+def download_file(request, token):
+    """
+    Serve a file stored by LocalStorage. The signed token stands in for an S3
+    presigned URL, so no session or JWT is required.
+
+    Whole-file responses go through FileResponse, which lets the WSGI server
+    use wsgi.file_wrapper (sendfile); when MEDIA_SENDFILE_HEADER is set the
+    transfer is delegated to the front-end web server instead. Single byte
+    ranges are answered with 206 Partial Content.
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise Http404
+    path = storage.resolve_token(token)
+    if path is None or not path.is_file():
+        raise Http404
+
+    if settings.MEDIA_SENDFILE_HEADER:
+        # e.g. nginx X-Accel-Redirect; the web server handles Range itself.
+        relative = path.relative_to(storage.root).as_posix()
+        response = HttpResponse()
+        response[settings.MEDIA_SENDFILE_HEADER] = (
+            settings.MEDIA_SENDFILE_PREFIX + relative
+        )
+        response["Content-Type"] = ""
+        return response
+
+    size = path.stat().st_size
+    byte_range = _parse_range(request.headers.get("Range", ""), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    fileobj = open(path, "rb")
+    if byte_range is None:
+        response = FileResponse(fileobj, filename=path.name)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            _FileRange(fileobj, start, length), filename=path.name, status=206
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_profile_image(apps, schema_editor):
+    """Point every user at their newest existing profile image Document."""
+    User = apps.get_model("users", "User")
+    Document = apps.get_model("media", "Document")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    try:
+        user_type = ContentType.objects.get(app_label="users", model="user")
+    except ContentType.DoesNotExist:
+        return  # Fresh database, nothing to backfill.
+
+    documents = Document.objects.filter(
+        object_type=user_type, is_profile_image=True
+    ).order_by("object_id", "-uploaded_on")
+    latest = {}
+    for object_id, document_id in documents.values_list("object_id", "id"):
+        latest.setdefault(object_id, document_id)
+
+    for user_id, document_id in latest.items():
+        User.objects.filter(pk=user_id).update(profile_image_id=document_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('media', '0002_document_indexes'),
+        ('users', '0003_remove_user_profile_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_image',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='media.document', verbose_name='Profile Image'),
+        ),
+        migrations.RunPython(backfill_profile_image, migrations.RunPython.noop),
+    ]
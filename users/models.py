@@ -39,6 +39,16 @@ class User(AbstractUser):
         unique=True,
         verbose_name=_('Email Address')
     )
+    # Denormalized pointer to the current profile image Document, kept in sync
+    # by media.views.FileUploadView.upload_file so avatars resolve by PK.
+    profile_image = models.ForeignKey(
+        'media.Document',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('Profile Image')
+    )
     groups = models.ManyToManyField(
         'auth.Group',
         related_name='custom_user_set',  # Add related_name here
@@ -4,11 +4,9 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.contrib.auth.hashers import make_password
-from media.models import Document
-from django.contrib.contenttypes.models import ContentType
-from workspaces.models import UserWorkspace
 
 from media.helpers import S3Helper
+from backend.serializers import SparseFieldsetMixin, TracedListSerializer
 from decouple import config
 
 User = get_user_model()
@@ -63,7 +61,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 # So we need to override the default token serializer to use id instead of id
 # we now mentioned this class in the settings.py file
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -86,6 +84,7 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'password': {'write_only': True}  # Ensure password is write-only
         }
+        list_serializer_class = TracedListSerializer
 
     full_name = serializers.SerializerMethodField()
     profile_image_url = serializers.SerializerMethodField()
@@ -105,21 +104,16 @@ class UserSerializer(serializers.ModelSerializer):
         return f"{obj.first_name} {obj.last_name}"
 
     def get_workspace(self, obj):
-        return UserWorkspace.objects.filter(user=obj).values_list(
-            "workspace_id", flat=True
-        )
+        # UserViewSet prefetches user_workspaces; elsewhere this is one query.
+        return [
+            {"workspace_id": membership.workspace_id, "role": membership.role}
+            for membership in obj.user_workspaces.all()
+        ]
 
     def get_profile_image_url(self, obj):
-        contentType = ContentType.objects.get_for_model(obj)
-        document = (
-            Document.objects.filter(
-                object_type=contentType, object_id=obj.id, is_profile_image=True
-            )
-            .order_by("-uploaded_on")
-            .first()
-        )
-
-        if document:
-            return S3Helper().get_presigned_url(document.s3_key)
+        # profile_image is maintained by FileUploadView.upload_file, so this is
+        # a PK fetch (or free when the queryset uses select_related).
+        if obj.profile_image_id:
+            return S3Helper().get_presigned_url(obj.profile_image.s3_key)
 
         return None
@@ -1,3 +1,88 @@
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from backend.testing import QueryCountMixin, make_user, record_queries
+from media.helpers import S3Helper
+from media.models import Document
+from workspaces.models import UserWorkspace, Workspace
+
+from .models import User
+
+
+class UserListQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = make_user(role="owner")
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.user
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        def grow(n):
+            for _ in range(n):
+                UserWorkspace.objects.create(
+                    user=make_user(), workspace=self.workspace, role="resident"
+                )
+
+        self.assertQueryCountStable(lambda: self.client.get("/api/v1/users/"), grow)
+
+    def test_current_user_lists_workspace_roles(self):
+        UserWorkspace.objects.create(
+            user=self.user, workspace=self.workspace, role="admin"
+        )
+        response = self.client.get("/api/me/")
+        self.assertEqual(
+            response.json()["workspace"],
+            [{"workspace_id": self.workspace.pk, "role": "admin"}],
+        )
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.user = make_user(role="owner")
+        workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.user
+        )
+        UserWorkspace.objects.create(user=self.user, workspace=workspace, role="admin")
+        document = Document.objects.create(
+            object_type=ContentType.objects.get_for_model(User),
+            object_id=self.user.pk,
+            s3_key="profiles/avatar.png",
+            uploaded_by=self.user,
+            is_profile_image=True,
+        )
+        User.objects.filter(pk=self.user.pk).update(profile_image=document)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, query=""):
+        with mock.patch.object(
+            S3Helper, "get_presigned_url", return_value="https://example.com/a"
+        ) as presign, record_queries() as queries:
+            response = self.client.get(f"/api/v1/users/{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries), presign.call_count
+
+    def test_fields(self):
+        [user], _, presigned = self.get("?fields=id,email")
+        self.assertEqual(set(user), {"id", "email"})
+        self.assertEqual(presigned, 0)
+
+    def test_omit(self):
+        [full], full_queries, presigned = self.get()
+        self.assertEqual(presigned, 1)
+        self.assertIn("workspace", full)
+
+        [user], queries, presigned = self.get("?omit=workspace,profile_image_url")
+        self.assertEqual(set(user), set(full) - {"workspace", "profile_image_url"})
+        self.assertEqual(presigned, 0)
+        # No user_workspaces prefetch in UserViewSet.get_queryset.
+        self.assertEqual(queries, full_queries - 1)
 
-# Create your tests here.
+    def test_fields_and_omit_combine(self):
+        [user], _, _ = self.get("?fields=id,email,role&fields=phone&omit=role")
+        self.assertEqual(set(user), {"id", "email", "phone"})
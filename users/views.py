@@ -10,11 +10,14 @@ from decouple import config
 from django.core.exceptions import ValidationError
 from .authentication import CustomJWTAuthentication
 from django.contrib.auth.hashers import make_password
+from django.db.models import Prefetch, prefetch_related_objects
 
 import boto3
 from botocore.exceptions import NoCredentialsError
 
 from media.helpers import S3Helper  # Import the helper function
+from workspaces.models import UserWorkspace
+from backend.streaming import StreamingListMixin, wants_streaming
 
 # views.py
 
@@ -22,15 +25,41 @@ from django.shortcuts import render, redirect
 from django.core.files.storage import default_storage
 from django.conf import settings
 
-class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+def memberships_prefetch():
+    """Memberships of many users in one query, for UserSerializer.get_workspace."""
+    return Prefetch(
+        "user_workspaces",
+        queryset=UserWorkspace.objects.only("user", "workspace", "role").order_by(
+            "workspace_id"
+        ),
+    )
+
+
+class UserViewSet(StreamingListMixin, viewsets.ModelViewSet):
+    queryset = User.objects.select_related("profile_image")
     serializer_class = UserSerializer
     authentication_classes = [CustomJWTAuthentication]  # Enforce JWT authentication
     permission_classes = [IsAuthenticated]  # Restrict access to authenticated users
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.get_serializer().wants_field("workspace"):
+            queryset = queryset.prefetch_related(memberships_prefetch())
+        return queryset
+
     @action(detail=False, methods=['get'])
     def list(self, request):
-        serializer = UserSerializer(self.queryset, many=True)
+        queryset = self.get_queryset()
+        if wants_streaming(request):
+            return self.streaming_list_response(
+                queryset,
+                lambda chunk: UserSerializer(
+                    chunk, many=True, context=self.get_serializer_context()
+                ).data,
+            )
+        serializer = UserSerializer(
+            queryset, many=True, context=self.get_serializer_context()
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['post'])
@@ -77,7 +106,7 @@ class UserViewSet(viewsets.ModelViewSet):
         except User.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        serializer = UserSerializer(user)
+        serializer = UserSerializer(user, context=self.get_serializer_context())
         return Response(serializer.data)
 
     @action(detail=False, methods=['put'])
@@ -117,7 +146,8 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def current_user(self, request):
         user = request.user
-        serializer = UserSerializer(user)
+        prefetch_related_objects([user], memberships_prefetch())
+        serializer = UserSerializer(user, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -0,0 +1,97 @@
+# workspaces/leases.py
+"""
+Lease expiry queries and the batch job behind ``process_lease_expirations``.
+
+"Today" is evaluated in each workspace's own timezone, so a lease ending on
+the 31st expires at local midnight rather than at midnight UTC. Both queries
+are served by the partial lease_end_date indexes on ApartmentUnit and
+UserApartment.
+"""
+
+import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.utils import timezone
+
+EXPIRY_CHUNK_SIZE = 500
+MAX_LOOKAHEAD_DAYS = 365
+
+
+def workspace_today(tz_name, now=None):
+    """Local date for a workspace timezone; unknown zones fall back to UTC."""
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = datetime.timezone.utc
+    return (now or timezone.now()).astimezone(tz).date()
+
+
+def upcoming_expirations(workspace, days, now=None):
+    """Unit and resident leases of ``workspace`` ending in the next ``days`` days."""
+    from .models import ApartmentUnit, UserApartment
+
+    today = workspace_today(workspace.timezone, now)
+    window = (today, today + datetime.timedelta(days=days))
+
+    units = (
+        ApartmentUnit.objects.filter(workspace=workspace, lease_end_date__range=window)
+        .order_by("lease_end_date", "unit_number")
+        .values("id", "unit_number", "lease_start_date", "lease_end_date")
+    )
+    residents = (
+        UserApartment.objects.filter(
+            unit__workspace=workspace,
+            lease_expired=False,
+            lease_end_date__range=window,
+        )
+        .order_by("lease_end_date", "unit__unit_number")
+        .values(
+            "id",
+            "role",
+            "lease_start_date",
+            "lease_end_date",
+            "unit_id",
+            "unit__unit_number",
+            "user__custom_id",
+            "user__email",
+        )
+    )
+    return {
+        "today": today,
+        "until": window[1],
+        "units": list(units),
+        "residents": list(residents),
+    }
+
+
+def process_expired_leases(chunk_size=EXPIRY_CHUNK_SIZE, now=None, dry_run=False):
+    """
+    Flag resident leases whose end date has passed in their workspace's
+    timezone. Workspaces are grouped by timezone and rows are updated
+    ``chunk_size`` at a time, so the job never holds long locks. Already
+    flagged rows are skipped via the partial index, which makes the job
+    cheap to run from cron as often as needed. Returns the number of leases
+    flagged (or that would be, with ``dry_run``).
+    """
+    from .models import UserApartment, Workspace
+
+    processed = 0
+    for tz_name in (
+        Workspace.objects.order_by().values_list("timezone", flat=True).distinct()
+    ):
+        pending = UserApartment.objects.filter(
+            unit__workspace__timezone=tz_name,
+            lease_expired=False,
+            lease_end_date__lt=workspace_today(tz_name, now),
+        )
+        if dry_run:
+            processed += pending.count()
+            continue
+        while True:
+            ids = list(pending.values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                break
+            processed += UserApartment.objects.filter(pk__in=ids).update(
+                lease_expired=True
+            )
+    return processed
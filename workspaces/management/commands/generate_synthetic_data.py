@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend.synthetic import DEFAULT_BATCH_SIZE, SyntheticConfig, generate
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic workspaces, residents, complaints "
+        "and chat history for scale testing. Never run this against production."
+    )
+
+    def add_arguments(self, parser):
+        defaults = SyntheticConfig()
+        for option, kind, help_text in (
+            ("users", int, "Users, including one owner per workspace."),
+            ("workspaces", int, "Workspaces; member counts follow --skew."),
+            ("units-per-member", float, "Apartment units per workspace member."),
+            ("occupancy", float, "Share of units given a resident."),
+            ("complaints", int, "Complaints, spread over workspaces by --skew."),
+            ("messages-per-complaint", float, "Mean complaint thread length."),
+            ("conversations", int, "Chat conversations between workspace members."),
+            (
+                "chat-messages",
+                int,
+                "Chat messages; per-conversation counts follow --skew.",
+            ),
+            ("skew", float, "Zipf exponent for workspace sizes and chat traffic."),
+            ("seed", int, "Random seed; the same seed yields the same data."),
+            ("prefix", str, "Username/email prefix, so several runs can coexist."),
+        ):
+            default = getattr(defaults, option.replace("-", "_"))
+            parser.add_argument(
+                f"--{option}",
+                type=kind,
+                default=default,
+                help=f"{help_text} (default: {default})",
+            )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows per bulk_create (default: {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes used to insert messages (default: 1).",
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] > 1 and connection.vendor == "sqlite":
+            raise CommandError("SQLite allows one writer at a time; use --workers 1.")
+        if options["users"] < options["workspaces"]:
+            raise CommandError("--users must be at least --workspaces.")
+
+        config = SyntheticConfig(
+            users=options["users"],
+            workspaces=options["workspaces"],
+            units_per_member=options["units_per_member"],
+            occupancy=options["occupancy"],
+            complaints=options["complaints"],
+            messages_per_complaint=options["messages_per_complaint"],
+            conversations=options["conversations"],
+            chat_messages=options["chat_messages"],
+            skew=options["skew"],
+            seed=options["seed"],
+            prefix=options["prefix"],
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+        )
+        counts = generate(config, log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"Created {sum(counts.values())} row(s)."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from workspaces.leases import EXPIRY_CHUNK_SIZE, process_expired_leases
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag resident leases that ended before today in their workspace's "
+        "timezone. Safe to run from cron as often as needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPIRY_CHUNK_SIZE,
+            help=f"Leases updated per statement (default: {EXPIRY_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the leases that would be flagged.",
+        )
+
+    def handle(self, *args, **options):
+        count = process_expired_leases(
+            chunk_size=options["chunk_size"], dry_run=options["dry_run"]
+        )
+        verb = "Would flag" if options["dry_run"] else "Flagged"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} expired lease(s)."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from workspaces.occupancy import RECONCILE_BATCH_SIZE, reconcile_occupancy
+
+
+class Command(BaseCommand):
+    help = "Fix ApartmentUnit.is_occupied flags that disagree with UserApartment rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workspace",
+            type=int,
+            action="append",
+            dest="workspace_ids",
+            help="Only reconcile units of this workspace (can be repeated).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help=f"Unit id range checked per batch (default: {RECONCILE_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_occupancy(
+            workspace_ids=options["workspace_ids"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Corrected {fixed} unit(s)."))
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:10
+
+from django.db import migrations, models
+from django.db.models import Exists, Max, Min, OuterRef
+
+# A frozen copy of workspaces.occupancy.reconcile_occupancy at the time of
+# this migration; the live module may change, this backfill must not.
+BATCH_SIZE = 1000
+
+
+def reconcile_is_occupied(apps, schema_editor):
+    ApartmentUnit = apps.get_model("workspaces", "ApartmentUnit")
+    UserApartment = apps.get_model("workspaces", "UserApartment")
+    db_alias = schema_editor.connection.alias
+
+    units = ApartmentUnit.objects.using(db_alias).order_by()
+    has_residents = Exists(
+        UserApartment.objects.using(db_alias).filter(unit_id=OuterRef("pk"))
+    )
+    bounds = units.aggregate(first_id=Min("pk"), last_id=Max("pk"))
+    if bounds["first_id"] is None:
+        return
+    for start in range(bounds["first_id"], bounds["last_id"] + 1, BATCH_SIZE):
+        batch = units.filter(pk__gte=start, pk__lt=start + BATCH_SIZE)
+        batch.filter(is_occupied=False).filter(has_residents).update(is_occupied=True)
+        batch.filter(is_occupied=True).exclude(has_residents).update(is_occupied=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0003_userapartment_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apartmentunit',
+            index=models.Index(condition=models.Q(('is_occupied', False)), fields=['workspace', 'unit_number'], name='apartmentunit_vacant_idx'),
+        ),
+        migrations.RunPython(reconcile_is_occupied, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0004_apartmentunit_vacant_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userapartment',
+            name='lease_expired',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='apartmentunit',
+            index=models.Index(condition=models.Q(('lease_end_date__isnull', False)), fields=['workspace', 'lease_end_date'], name='apartmentunit_lease_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userapartment',
+            index=models.Index(condition=models.Q(('lease_end_date__isnull', False), ('lease_expired', False)), fields=['lease_end_date'], name='userapartment_lease_end_idx'),
+        ),
+    ]
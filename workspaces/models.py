@@ -1,8 +1,12 @@
 # workspaces/models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
+from .occupancy import refresh_occupancy, refresh_occupancy_on_commit
+
 User = get_user_model()  # Get the custom User model
 
 
@@ -60,11 +64,48 @@ class ApartmentUnit(models.Model):
 
     class Meta:
         unique_together = ("unit_number", "workspace")
+        indexes = [
+            # Vacancy lookups per workspace only touch the (small) vacant set.
+            models.Index(
+                fields=["workspace", "unit_number"],
+                condition=models.Q(is_occupied=False),
+                name="apartmentunit_vacant_idx",
+            ),
+            models.Index(
+                fields=["workspace", "lease_end_date"],
+                condition=models.Q(lease_end_date__isnull=False),
+                name="apartmentunit_lease_end_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.workspace.name} - Unit {self.unit_number}"
 
 
+class UserApartmentQuerySet(models.QuerySet):
+    """
+    Bulk writes that keep ApartmentUnit.is_occupied current. Deletes, cascaded
+    ones included, are handled by user_apartment_deleted.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            refresh_occupancy(obj.unit_id for obj in created)
+        return created
+
+    def update(self, **kwargs):
+        if "unit" not in kwargs and "unit_id" not in kwargs:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            unit_ids = set(self.values_list("unit_id", flat=True))
+            rows = super().update(**kwargs)
+            unit = kwargs.get("unit", kwargs.get("unit_id"))
+            unit_ids.add(getattr(unit, "pk", unit))
+            refresh_occupancy(unit_ids)
+        return rows
+
+
 class UserApartment(models.Model):  # Renamed class
     ROLE_CHOICES = (
         ("owner", "Owner"),
@@ -81,10 +122,47 @@ class UserApartment(models.Model):  # Renamed class
     is_primary_resident = models.BooleanField(default=True)
     lease_start_date = models.DateField(null=True, blank=True)
     lease_end_date = models.DateField(null=True, blank=True)
+    # Set by process_lease_expirations once lease_end_date has passed locally.
+    lease_expired = models.BooleanField(default=False)
+
+    objects = UserApartmentQuerySet.as_manager()
 
     class Meta:
         unique_together = ("user", "unit")
         db_table = "UserApartmentUnit"  # Keep this as the desired table name
+        indexes = [
+            # Pending expirations only; flagged leases drop out of the index.
+            models.Index(
+                fields=["lease_end_date"],
+                condition=models.Q(lease_expired=False, lease_end_date__isnull=False),
+                name="userapartment_lease_end_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        unit_ids = {self.unit_id}
+        original = None
+        if self.pk:
+            original = (
+                UserApartment.objects.filter(pk=self.pk)
+                .values("unit_id", "lease_end_date")
+                .first()
+            )
+        if original:
+            unit_ids.add(original["unit_id"])
+            if original["lease_end_date"] != self.lease_end_date:
+                # A renewed lease is pending again; the job re-flags it if needed.
+                self.lease_expired = False
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            refresh_occupancy(unit_ids)
 
     def __str__(self):
         return f"{self.user.custom_id} - {self.unit.workspace.name} - {self.unit.unit_number}"
+
+
+@receiver(post_delete, sender=UserApartment)
+def user_apartment_deleted(sender, instance, using, **kwargs):
+    # A receiver rather than UserApartment.delete so that deleting a user,
+    # which cascades to their apartments, frees the units too.
+    refresh_occupancy_on_commit(instance.unit_id, using)
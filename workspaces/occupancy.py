@@ -0,0 +1,84 @@
+# workspaces/occupancy.py
+"""
+Keeps ApartmentUnit.is_occupied in step with the UserApartment rows.
+
+A unit is occupied while at least one UserApartment points at it. The flag is
+recomputed with a single UPDATE ... SET is_occupied = EXISTS(...) whenever
+residents are added or removed, so it is safe under concurrent writes and
+vacancy queries can use the partial index on vacant units instead of
+anti-joining UserApartmentUnit.
+"""
+
+import threading
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Exists, Max, Min, OuterRef
+
+RECONCILE_BATCH_SIZE = 1000
+
+# Units queued by refresh_occupancy_on_commit, per database alias.
+_pending = threading.local()
+
+
+def _has_residents():
+    from .models import UserApartment
+
+    return Exists(UserApartment.objects.filter(unit_id=OuterRef("pk")))
+
+
+def refresh_occupancy(unit_ids):
+    """Recompute is_occupied for the given units. Returns the rows changed."""
+    from .models import ApartmentUnit
+
+    unit_ids = {unit_id for unit_id in unit_ids if unit_id is not None}
+    if not unit_ids:
+        return 0
+    return reconcile_units(ApartmentUnit.objects.filter(pk__in=unit_ids))
+
+
+def refresh_occupancy_on_commit(unit_id, using):
+    """
+    Refresh ``unit_id`` once the current transaction on ``using`` commits.
+    Every unit queued by the transaction is refreshed in one go, so deleting
+    many residents costs one refresh rather than one per row.
+    """
+    _pending.__dict__.setdefault(using, set()).add(unit_id)
+    # The first callback to run takes the whole set and the rest find it
+    # empty. Units left behind by a rollback are refreshed with the next
+    # commit, which is harmless.
+    transaction.on_commit(partial(_refresh_pending, using), using=using)
+
+
+def _refresh_pending(using):
+    refresh_occupancy(_pending.__dict__.pop(using, ()))
+
+
+def reconcile_units(units):
+    """Fix drifted rows of the ``units`` queryset; only those rows are written."""
+    has_residents = _has_residents()
+    return units.filter(is_occupied=False).filter(has_residents).update(
+        is_occupied=True
+    ) + units.filter(is_occupied=True).exclude(has_residents).update(is_occupied=False)
+
+
+def reconcile_occupancy(workspace_ids=None, batch_size=RECONCILE_BATCH_SIZE):
+    """
+    Repair is_occupied drift (e.g. after raw SQL or a restore) in unit id
+    ranges of ``batch_size``. Returns the number of units corrected.
+    """
+    from .models import ApartmentUnit
+
+    units = ApartmentUnit.objects.order_by()
+    if workspace_ids is not None:
+        units = units.filter(workspace_id__in=workspace_ids)
+
+    bounds = units.aggregate(first_id=Min("pk"), last_id=Max("pk"))
+    first_id, last_id = bounds["first_id"], bounds["last_id"]
+    if first_id is None:
+        return 0
+
+    fixed = 0
+    for start in range(first_id, last_id + 1, batch_size):
+        fixed += reconcile_units(units.filter(pk__gte=start, pk__lt=start + batch_size))
+    return fixed
@@ -2,11 +2,12 @@
 from rest_framework import serializers
 from .models import Workspace, UserWorkspace, ApartmentUnit, UserApartment
 from django.contrib.auth import get_user_model
+from backend.serializers import SparseFieldsetMixin, TracedListSerializer
 
 User = get_user_model()
 
 
-class WorkspaceSerializer(serializers.ModelSerializer):
+class WorkspaceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     owner_email = serializers.EmailField(
         source="owner.email", read_only=True
     )  # Keep displaying owner email
@@ -16,14 +17,19 @@ class WorkspaceSerializer(serializers.ModelSerializer):
     owner_custom_id = serializers.CharField(
         source="owner.custom_id", read_only=True
     )  # add this
+    # Annotated by workspaces_for_user (views.py), left out elsewhere
+    role = serializers.CharField(read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+    unit_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Workspace
         fields = "__all__"
         read_only_fields = ("created_at",)
+        list_serializer_class = TracedListSerializer
 
 
-class UserWorkspaceSerializer(serializers.ModelSerializer):
+class UserWorkspaceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_email = serializers.EmailField(source="user.email", read_only=True)
     username = serializers.CharField(source="user.username", read_only=True)
     workspace_name = serializers.CharField(source="workspace.name", read_only=True)
@@ -33,6 +39,7 @@ class UserWorkspaceSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserWorkspace
         fields = "__all__"
+        list_serializer_class = TracedListSerializer
 
     def validate(self, data):
         """
@@ -48,7 +55,7 @@ class UserWorkspaceSerializer(serializers.ModelSerializer):
         return data
 
 
-class ApartmentUnitSerializer(serializers.ModelSerializer):
+class ApartmentUnitSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     workspace_name = serializers.CharField(source="workspace.name", read_only=True)
     workspace = serializers.PrimaryKeyRelatedField(
         queryset=Workspace.objects.all()
@@ -57,9 +64,14 @@ class ApartmentUnitSerializer(serializers.ModelSerializer):
     class Meta:
         model = ApartmentUnit
         fields = "__all__"
+        # Derived from the unit's UserApartment rows, see workspaces/occupancy.py.
+        read_only_fields = ("is_occupied",)
+        list_serializer_class = TracedListSerializer
 
 
-class UserApartmentSerializer(serializers.ModelSerializer):  # Renamed serializer
+class UserApartmentSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):  # Renamed serializer
     user_custom_id = serializers.CharField(source="user.custom_id", read_only=True)
     unit_number = serializers.CharField(source="unit.unit_number", read_only=True)
     workspace_name = serializers.CharField(source="unit.workspace.name", read_only=True)
@@ -69,6 +81,9 @@ class UserApartmentSerializer(serializers.ModelSerializer):  # Renamed serialize
     class Meta:
         model = UserApartment
         fields = "__all__"
+        # Set by process_lease_expirations, see workspaces/leases.py.
+        read_only_fields = ("lease_expired",)
+        list_serializer_class = TracedListSerializer
 
     def validate(self, data):
         user = data.get("user")
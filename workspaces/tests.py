@@ -1,3 +1,334 @@
+import datetime
+import json
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.testing import QueryCountMixin, make_user, unique_name
+from complaints.models import Complaint
+
+from .leases import process_expired_leases
+from .models import ApartmentUnit, UserApartment, UserWorkspace, Workspace
+from .occupancy import reconcile_occupancy
+
+
+class WorkspaceListQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.owner = make_user(role="owner")
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.owner
+        )
+        UserWorkspace.objects.create(
+            user=self.owner, workspace=self.workspace, role="admin"
+        )
+        self.unit = ApartmentUnit.objects.create(
+            workspace=self.workspace, unit_number="100", rent_amount=1000
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.base = f"/api/v1/workspaces/{self.workspace.pk}"
+
+    def add_members(self, n):
+        for _ in range(n):
+            UserWorkspace.objects.create(
+                user=make_user(), workspace=self.workspace, role="resident"
+            )
+
+    def add_units(self, n):
+        today = timezone.localdate()
+        for _ in range(n):
+            unit = ApartmentUnit.objects.create(
+                workspace=self.workspace,
+                unit_number=unique_name("U"),
+                rent_amount=1200,
+                lease_end_date=today + datetime.timedelta(days=10),
+            )
+            resident = make_user()
+            UserWorkspace.objects.create(
+                user=resident, workspace=self.workspace, role="resident"
+            )
+            UserApartment.objects.create(
+                user=resident, unit=unit, lease_end_date=unit.lease_end_date
+            )
+
+    def test_list_workspaces(self):
+        def grow(n):
+            # Workspaces the caller belongs to, each with a different owner.
+            for _ in range(n):
+                workspace = Workspace.objects.create(
+                    name=unique_name("Tower"), address="2 Main St", owner=make_user()
+                )
+                UserWorkspace.objects.create(
+                    user=self.owner, workspace=workspace, role="resident"
+                )
+                UserWorkspace.objects.create(
+                    user=make_user(), workspace=workspace, role="resident"
+                )
+
+        self.assertQueryCountStable(
+            lambda: self.client.get("/api/v1/workspaces/list/"), grow
+        )
+
+    def test_list_user_workspaces(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/users/"), self.add_members
+        )
+
+    def test_list_apartment_units(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/units/"), self.add_units
+        )
+
+    def test_list_user_apartments(self):
+        def grow(n):
+            for _ in range(n):
+                resident = make_user()
+                UserWorkspace.objects.create(
+                    user=resident, workspace=self.workspace, role="resident"
+                )
+                UserApartment.objects.create(
+                    user=resident, unit=self.unit, is_primary_resident=False
+                )
+
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/units/{self.unit.pk}/users/"),
+            grow,
+        )
+
+    def test_lease_expirations(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/leases/expiring/?days=30"),
+            self.add_units,
+            rows=lambda content: len(json.loads(content)["residents"]),
+        )
+
+    def test_export_rent_roll(self):
+        self.assertQueryCountStable(
+            lambda: self.client.get(f"{self.base}/units/export/"),
+            self.add_units,
+            rows=lambda content: content.count(b"\n"),
+        )
+
+
+class OccupancyTests(TestCase):
+    def setUp(self):
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=make_user(role="owner")
+        )
+        self.unit = self.make_unit()
+        self.other_unit = self.make_unit()
+
+    def make_unit(self):
+        return ApartmentUnit.objects.create(
+            workspace=self.workspace, unit_number=unique_name("U"), rent_amount=1000
+        )
+
+    def assertOccupied(self, unit, expected):
+        unit.refresh_from_db(fields=["is_occupied"])
+        self.assertIs(unit.is_occupied, expected)
+
+    def test_create_and_delete(self):
+        first = UserApartment.objects.create(user=make_user(), unit=self.unit)
+        self.assertOccupied(self.unit, True)
+        second = UserApartment.objects.create(user=make_user(), unit=self.unit)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertOccupied(self.unit, True)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertOccupied(self.unit, False)
+
+    def test_move_to_another_unit(self):
+        resident = UserApartment.objects.create(user=make_user(), unit=self.unit)
+        resident.unit = self.other_unit
+        resident.save()
+
+        self.assertOccupied(self.unit, False)
+        self.assertOccupied(self.other_unit, True)
+
+    def test_lease_expiry(self):
+        # An expired lease is flagged, not removed: the unit stays occupied
+        # until the resident row goes.
+        resident = UserApartment.objects.create(
+            user=make_user(),
+            unit=self.unit,
+            lease_end_date=timezone.localdate() - datetime.timedelta(days=3),
+        )
+        self.assertEqual(process_expired_leases(), 1)
+        self.assertOccupied(self.unit, True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resident.delete()
+        self.assertOccupied(self.unit, False)
+
+    def test_bulk_create(self):
+        UserApartment.objects.bulk_create(
+            [
+                UserApartment(user=make_user(), unit=self.unit),
+                UserApartment(user=make_user(), unit=self.unit),
+            ]
+        )
+        self.assertOccupied(self.unit, True)
+        self.assertOccupied(self.other_unit, False)
+
+    def test_queryset_update(self):
+        UserApartment.objects.create(user=make_user(), unit=self.unit)
+
+        UserApartment.objects.filter(unit=self.unit).update(unit=self.other_unit)
+        self.assertOccupied(self.unit, False)
+        self.assertOccupied(self.other_unit, True)
+
+        UserApartment.objects.update(unit_id=self.unit.pk)
+        self.assertOccupied(self.unit, True)
+        self.assertOccupied(self.other_unit, False)
+
+    def test_queryset_delete(self):
+        UserApartment.objects.create(user=make_user(), unit=self.unit)
+        UserApartment.objects.create(user=make_user(), unit=self.other_unit)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserApartment.objects.filter(unit=self.unit).delete()
+        self.assertOccupied(self.unit, False)
+        self.assertOccupied(self.other_unit, True)
+
+    def test_deleting_the_resident_user(self):
+        resident = make_user()
+        UserApartment.objects.create(user=resident, unit=self.unit)
+        UserApartment.objects.create(user=resident, unit=self.other_unit)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resident.delete()
+        self.assertOccupied(self.unit, False)
+        self.assertOccupied(self.other_unit, False)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.workspace.owner)
+        units = self.client.get(
+            f"/api/v1/workspaces/{self.workspace.pk}/dashboard/"
+        ).json()["units"]
+        self.assertEqual((units["occupied"], units["vacant"]), (0, 2))
+
+    def test_reconcile_after_raw_update(self):
+        ApartmentUnit.objects.filter(pk=self.unit.pk).update(is_occupied=True)
+        self.assertOccupied(self.unit, True)
+
+        self.assertEqual(reconcile_occupancy(batch_size=1), 1)
+        self.assertOccupied(self.unit, False)
+        self.assertEqual(reconcile_occupancy(), 0)
+
+
+class UserApartmentApiTests(TestCase):
+    def test_lease_expired_is_read_only(self):
+        owner = make_user(role="owner")
+        workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=owner
+        )
+        unit = ApartmentUnit.objects.create(
+            workspace=workspace, unit_number="101", rent_amount=1000
+        )
+        resident = make_user()
+        UserWorkspace.objects.create(
+            user=resident, workspace=workspace, role="resident"
+        )
+        client = APIClient()
+        client.force_authenticate(owner)
+
+        response = client.post(
+            f"/api/v1/workspaces/{workspace.pk}/units/{unit.pk}/users/",
+            {"user": resident.pk, "unit": unit.pk, "lease_expired": True},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIs(response.json()["lease_expired"], False)
+        self.assertIs(UserApartment.objects.get(user=resident).lease_expired, False)
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        self.owner = make_user(role="owner")
+        self.workspace = Workspace.objects.create(
+            name="Tower", address="1 Main St", owner=self.owner
+        )
+        UserWorkspace.objects.create(
+            user=make_user(), workspace=self.workspace, role="admin"
+        )
+        self.residents = [make_user(), make_user()]
+        for resident, rent in zip(self.residents, ("1000.00", "1500.50")):
+            UserWorkspace.objects.create(
+                user=resident, workspace=self.workspace, role="resident"
+            )
+            unit = ApartmentUnit.objects.create(
+                workspace=self.workspace, unit_number=unique_name("U"), rent_amount=rent
+            )
+            UserApartment.objects.create(user=resident, unit=unit)
+        ApartmentUnit.objects.create(
+            workspace=self.workspace, unit_number="Vacant", rent_amount=800
+        )
+        first, second = self.residents
+        for user, complaint_status in (
+            (first, "open"),
+            (first, "resolved"),
+            (second, "in_progress"),
+        ):
+            Complaint.objects.create(
+                workspace=self.workspace,
+                user=user,
+                title="Noise",
+                description="Upstairs",
+                category="noise",
+                status=complaint_status,
+            )
+        self.url = f"/api/v1/workspaces/{self.workspace.pk}/dashboard/"
+
+    def get(self, user, url=None):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(url or self.url)
+
+    def test_non_member_gets_404(self):
+        self.assertEqual(self.get(make_user()).status_code, 404)
+        missing = f"/api/v1/workspaces/{self.workspace.pk + 1000}/dashboard/"
+        self.assertEqual(self.get(self.owner, missing).status_code, 404)
+
+    def test_owner_sees_workspace_aggregates(self):
+        data = self.get(self.owner).json()
+
+        self.assertEqual(data["role"], "owner")
+        self.assertEqual(
+            data["members"], {"total": 3, "by_role": {"admin": 1, "resident": 2}}
+        )
+        self.assertEqual(
+            data["units"],
+            {
+                "total": 3,
+                "occupied": 2,
+                "vacant": 1,
+                "monthly_rent": 3300.5,
+                "occupied_rent": 2500.5,
+                "occupancy_rate": 0.6667,
+            },
+        )
+        complaints = data["complaints"]
+        self.assertEqual(complaints["total"], 3)
+        self.assertEqual(complaints["open"], 2)
+        self.assertEqual(
+            complaints["by_status"], {"open": 1, "resolved": 1, "in_progress": 1}
+        )
+        self.assertEqual(len(data["recent_activity"]), 3)
+
+    def test_resident_sees_only_their_complaints(self):
+        first = self.residents[0]
+        data = self.get(first).json()
 
-# Create your tests here.
+        self.assertEqual(data["role"], "resident")
+        self.assertEqual(
+            data["complaints"], {"by_status": {"open": 1, "resolved": 1}, "open": 1}
+        )
+        self.assertEqual(
+            {activity["user__custom_id"] for activity in data["recent_activity"]},
+            {str(first.custom_id)},
+        )
+        self.assertEqual(data["units"]["occupied"], 2)
@@ -20,6 +20,10 @@ urlpatterns = [
             }
         ),
     ),
+    path(
+        "<int:pk>/dashboard/",
+        views.WorkspaceViewSet.as_view({"get": "dashboard"}),
+    ),
     # UserWorkspace URLs
     path(
         "<int:workspace_id>/users/",
@@ -60,6 +64,14 @@ urlpatterns = [
             }
         ),
     ),
+    path(
+        "<int:workspace_id>/units/export/",
+        views.ApartmentUnitViewSet.as_view({"get": "export_rent_roll"}),
+    ),
+    path(
+        "<int:workspace_id>/leases/expiring/",
+        views.ApartmentUnitViewSet.as_view({"get": "lease_expirations"}),
+    ),
     # UserApartment URLs
     path(
         "<int:workspace_id>/units/<int:unit_id>/users/",
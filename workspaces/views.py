@@ -14,11 +14,64 @@ from .serializers import (
 )
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from complaints.models import Complaint
+from complaints.stats import OPEN_STATUSES, summarize
+from backend.fast_read import ValuesListMixin
+from backend.streaming import StreamingListMixin, wants_streaming
+from .exports import rent_roll_rows
+from .leases import MAX_LOOKAHEAD_DAYS, upcoming_expirations
 from workspaces.permissions import IsWorkspaceOwner
 from workspaces.permissions import IsWorkspaceMember
 from workspaces.permissions import IsOwnerOrAdmin
 
 
+def _count_per_workspace(model):
+    """Correlated ``COUNT(*)`` of ``model`` rows in the outer workspace."""
+    counts = (
+        model.objects.filter(workspace=OuterRef("pk"))
+        .order_by()
+        .values("workspace")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def workspaces_for_user(user):
+    """
+    Workspaces ``user`` owns or belongs to, each once, with the user's role
+    and the member and unit counts, in a single query.
+    """
+    membership = UserWorkspace.objects.filter(workspace=OuterRef("pk"), user=user)
+    return (
+        Workspace.objects.filter(Q(owner=user) | Exists(membership))
+        .select_related("owner")
+        .annotate(
+            role=Case(
+                When(owner=user, then=Value("owner")),
+                default=Subquery(membership.values("role")[:1]),
+            ),
+            member_count=_count_per_workspace(UserWorkspace),
+            unit_count=_count_per_workspace(ApartmentUnit),
+        )
+        .order_by("pk")
+    )
+
+
 class WorkspaceViewSet(
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -33,7 +86,6 @@ class WorkspaceViewSet(
     permission_classes = [IsAuthenticated]
 
     def get_permissions(self):
-        print("action", self.action)
         if self.action == "create_workspace":
             permission_classes = [IsAdminUser]  # Only admins create workspaces
         elif self.action in [
@@ -56,10 +108,7 @@ class WorkspaceViewSet(
         return [permission() for permission in permission_classes]
 
     def list_workspaces(self, request, *args, **kwargs):
-        queryset = Workspace.objects.filter(
-            workspace_users__user=request.user
-        ) | Workspace.objects.filter(owner=request.user)
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(workspaces_for_user(request.user), many=True)
         return Response(serializer.data)
 
     def create_workspace(self, request, *args, **kwargs):
@@ -117,8 +166,100 @@ class WorkspaceViewSet(
         self.perform_destroy(workspace)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def dashboard(self, request, pk=None, *args, **kwargs):
+        """
+        Everything the workspace home page needs, from a handful of aggregate
+        queries instead of the full list endpoints.
+        """
+        caller_role = UserWorkspace.objects.filter(
+            workspace=OuterRef("pk"), user=request.user
+        ).values("role")[:1]
+        workspace = (
+            Workspace.objects.filter(pk=pk)
+            .annotate(caller_role=Subquery(caller_role))
+            .values("id", "name", "owner_id", "caller_role")
+            .first()
+        )
+        if workspace is None:
+            return Response(
+                {"detail": "No workspaces assigned to you"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        is_owner = workspace["owner_id"] == request.user.id
+        role = "owner" if is_owner else workspace["caller_role"]
+        if role is None and not request.user.is_superuser:
+            return Response(
+                {"detail": "No workspaces assigned to you"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        can_manage = is_owner or role == "admin" or request.user.is_superuser
+
+        members_by_role = dict(
+            UserWorkspace.objects.filter(workspace_id=pk)
+            .values_list("role")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+
+        units = ApartmentUnit.objects.filter(workspace_id=pk).aggregate(
+            total=Count("id"),
+            occupied=Count("id", filter=Q(is_occupied=True)),
+            monthly_rent=Sum("rent_amount"),
+            occupied_rent=Sum("rent_amount", filter=Q(is_occupied=True)),
+        )
+        units["vacant"] = units["total"] - units["occupied"]
+        units["occupancy_rate"] = (
+            round(units["occupied"] / units["total"], 4) if units["total"] else None
+        )
+
+        complaints = Complaint.objects.filter(workspace_id=pk)
+        if can_manage:
+            complaint_summary = summarize(pk, timezone.localdate())
+        else:
+            # Residents only see their own complaints, as in ComplaintViewSet.
+            complaints = complaints.filter(user=request.user)
+            complaint_summary = {
+                "by_status": dict(
+                    complaints.values_list("status")
+                    .annotate(count=Count("id"))
+                    .order_by()
+                )
+            }
+        complaint_summary["open"] = sum(
+            complaint_summary["by_status"].get(s, 0) for s in OPEN_STATUSES
+        )
+
+        recent_activity = list(
+            complaints.order_by("-updated_at").values(
+                "id",
+                "title",
+                "category",
+                "status",
+                "created_at",
+                "updated_at",
+                "user__custom_id",
+            )[:10]
+        )
+
+        return Response(
+            {
+                "workspace": {"id": workspace["id"], "name": workspace["name"]},
+                "role": role,
+                "members": {
+                    "total": sum(members_by_role.values()),
+                    "by_role": members_by_role,
+                },
+                "units": units,
+                "complaints": complaint_summary,
+                "recent_activity": recent_activity,
+            }
+        )
+
 
 class UserWorkspaceViewSet(
+    StreamingListMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -172,8 +313,9 @@ class UserWorkspaceViewSet(
 
     def list_user_workspaces(self, request, workspace_id=None, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        if wants_streaming(request):
+            return self.streaming_list_response(queryset)
+        return Response(self.list_data(queryset))
 
     def create_user_workspace(self, request, workspace_id=None, *args, **kwargs):
 
@@ -252,6 +394,7 @@ class UserWorkspaceViewSet(
 
 
 class ApartmentUnitViewSet(
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -286,6 +429,8 @@ class ApartmentUnitViewSet(
     def get_permissions(self):
         if self.action in ["list_apartment_units", "retrieve_apartment_unit"]:
             permission_classes = [IsAuthenticated]
+        elif self.action in ["lease_expirations", "export_rent_roll"]:
+            permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
         elif self.action in [
             "create_apartment_unit",
             "update_apartment_unit",
@@ -296,10 +441,35 @@ class ApartmentUnitViewSet(
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    def export_rent_roll(self, request, workspace_id=None, *args, **kwargs):
+        workspace = get_object_or_404(Workspace, pk=workspace_id)
+        response = StreamingHttpResponse(
+            rent_roll_rows(workspace.pk), content_type="text/csv"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="rent-roll-{workspace.pk}.csv"'
+        )
+        return response
+
+    def lease_expirations(self, request, workspace_id=None, *args, **kwargs):
+        try:
+            days = int(request.query_params.get("days", 30))
+        except ValueError:
+            return Response(
+                {"error": "days must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 0 <= days <= MAX_LOOKAHEAD_DAYS:
+            return Response(
+                {"error": f"days must be between 0 and {MAX_LOOKAHEAD_DAYS}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        workspace = get_object_or_404(Workspace, pk=workspace_id)
+        return Response(upcoming_expirations(workspace, days))
+
     def list_apartment_units(self, request, workspace_id=None, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(self.list_data(queryset))
 
     def create_apartment_unit(self, request, workspace_id=None, *args, **kwargs):
         # Get workspace from URL param, and put it inside validated_data
@@ -422,7 +592,9 @@ class UserApartmentViewSet(
             return UserApartment.objects.none()  # User not in workspace
 
         # Filter by workspace
-        queryset = queryset.filter(unit__workspace_id=workspace_id)
+        queryset = queryset.filter(unit__workspace_id=workspace_id).select_related(
+            "user", "unit__workspace"
+        )
 
         # Further filter by unit_id if provided
         if unit_id: